@@ -0,0 +1,382 @@
+"""
+Mã hóa -> giải mã -> kiểm tra một văn bản cho giao diện, không phụ thuộc tkinter.
+
+analyze() là phần tính toán thuần. AnalysisJob chạy analyze() trong một tiến trình riêng
+(không bị GIL chặn vòng lặp sự kiện của Tk) và gửi tiến độ/kết quả về qua Queue;
+giao diện chỉ cần gọi poll() định kỳ bằng root.after và có thể hủy job bất cứ lúc nào.
+"""
+import multiprocessing
+import queue
+import time
+import tracemalloc
+
+from Encoding.arithmeticEncoding import ArithmeticEncoding
+from Encoding.huffmanEncoding import HuffmanEncoding
+from Encoding.lzpEncoding import LZWEncoding
+from Encoding.lzssEncoding import LZSSEncoding
+from Encoding.profiling import Profiler
+from Encoding.symbolStatistics import SymbolStatistics
+
+ALGORITHMS = ("huffman", "lzw", "arithmetic", "lzss")
+# Giới hạn mặc định cho một lần chạy từ giao diện
+DEFAULT_TIME_BUDGET = 120.0
+DEFAULT_MAX_CHARS = 20_000_000
+
+# Các bước và tỉ lệ tiến độ khi bắt đầu bước đó
+PHASE_STATS = ("Thống kê ký tự", 0.0)
+PHASE_ENCODE = ("Mã hóa", 0.1)
+PHASE_DECODE = ("Giải mã", 0.6)
+PHASE_VERIFY = ("Kiểm tra", 0.95)
+PHASE_DONE = ("Hoàn tất", 1.0)
+
+
+def analyze(text: str, algo: str, stats: SymbolStatistics = None, progress=None, keep_decoded: bool = True,
+            tokens: bool = False, profile: bool = False, measure_memory: bool = False) -> dict:
+    """
+    Mã hóa text bằng thuật toán algo, giải mã lại và so sánh với bản gốc.
+
+    Args:
+        stats: thống kê ký tự đã tính sẵn (nếu None thì đếm text).
+        progress: hàm progress(tên bước, tỉ lệ 0..1) được gọi khi chuyển bước.
+        keep_decoded: False thì không trả về văn bản giải mã (chỉ giữ kết quả kiểm tra).
+        tokens: Huffman/Arithmetic mã hóa theo token (từ/âm tiết) thay vì ký tự; LZW/LZSS không đổi.
+            Entropy và độ dài mã trung bình vẫn tính trên mỗi ký tự để so sánh được với nhau.
+        profile: đo chi tiết (thời gian từng bước và hàm con, bộ đếm, tracemalloc, cProfile);
+            chạy chậm hơn đáng kể nên thời gian mã hóa/giải mã khi đó chỉ để tham khảo.
+        measure_memory: đo bộ nhớ đỉnh bằng tracemalloc trong một lượt mã hóa + giải mã riêng,
+            không tính giờ (tracemalloc làm chậm chương trình nhiều lần), như bộ benchmark.
+
+    Returns:
+        dict gồm length_orig, entropy, avg_len, total_bits, overhead_bits, encode_seconds, decode_seconds,
+        peak_memory_bytes (bộ nhớ đỉnh theo tracemalloc, None nếu không đo), decoded_text, verified, tokens
+        và profile (báo cáo Profiler.report() khi profile=True, ngược lại None).
+        total_bits là mọi bit cần lưu để giải mã (dữ liệu mã + header/bảng mã/mô hình) với mọi thuật toán,
+        overhead_bits là phần header/bảng mã/mô hình trong đó; avg_len = total_bits / số ký tự.
+    """
+    if algo not in ALGORITHMS:
+        raise ValueError(f"Thuật toán không được hỗ trợ: {algo}")
+    if not profile:
+        result = _analyze(text, algo, stats, progress, keep_decoded, tokens, measure_memory)
+        result["profile"] = None
+        return result
+
+    profiler = Profiler(trace_memory=True, cprofile=True)
+    profiler.instrument_codecs()
+    phase = [None, 0.0]
+
+    def timed_progress(name, fraction):
+        # Mỗi lần chuyển bước thì cộng thời gian của bước trước
+        now = time.perf_counter()
+        if phase[0] is not None:
+            profiler.add_time(phase[0], now - phase[1])
+        phase[:] = name, now
+        if progress is not None:
+            progress(name, fraction)
+
+    with profiler:
+        result = _analyze(text, algo, stats, timed_progress, keep_decoded, tokens, measure_memory=False)
+    result["profile"] = profiler.report()
+    # Profiler đã theo dõi toàn bộ lần chạy bằng tracemalloc
+    if measure_memory:
+        result["peak_memory_bytes"] = result["profile"]["peak_memory_bytes"]
+    return result
+
+
+def _codec(text: str, algo: str, stats: SymbolStatistics, tokens: bool):
+    """
+    Hàm encode() -> (total_bits, overhead_bits, decode) của thuật toán algo trên text;
+    decode() trả về văn bản giải mã. Gọi lại encode() cho một lượt chạy độc lập (đo bộ nhớ).
+    """
+    if algo == "huffman":
+        def encode():
+            huff = HuffmanEncoding(tokenize=tokens)
+            # stats là thống kê ký tự, chỉ dùng lại được khi ký hiệu là ký tự
+            encoded = huff.encode(text, None if tokens else stats)
+            total_bits = len(encoded) * 8
+            return total_bits, total_bits - huff.payload_bits(), lambda: huff.decode(encoded)
+
+    elif algo == "lzw":
+        def encode():
+            lzw = LZWEncoding()
+            encoded, total_bits = lzw.encode(text)
+            # Luồng LZW không có header: từ điển được dựng lại khi giải mã
+            return total_bits, 0, lambda: lzw.decode(encoded)
+
+    elif algo == "lzss":
+        def encode():
+            lzss = LZSSEncoding()
+            encoded = lzss.encode(text)
+            total_bits = len(encoded) * 8
+            return total_bits, total_bits - lzss.payload_bits, lambda: lzss.decode(encoded)
+
+    else:
+        def encode():
+            arith = ArithmeticEncoding(text, tokenize=True) if tokens else ArithmeticEncoding(text, stats.counts)
+            encoded = arith.encode()
+            # Bảng tần suất phải gửi kèm để giải mã được (như trong container)
+            overhead_bits = len(arith.serialize_model()) * 8
+            total_bits = arith.calculate_total_length_formula(encoded) + overhead_bits
+            return total_bits, overhead_bits, lambda: arith.decode(encoded, arith.length)
+
+    return encode
+
+
+def _peak_memory(encode) -> int:
+    """Bộ nhớ đỉnh (byte) của một lượt mã hóa + giải mã theo tracemalloc, đo riêng để không làm sai thời gian."""
+    tracemalloc.start()
+    try:
+        _, _, decode = encode()
+        decode()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def _analyze(text: str, algo: str, stats, progress, keep_decoded: bool, tokens: bool,
+             measure_memory: bool = False) -> dict:
+    def report(phase):
+        if progress is not None:
+            progress(*phase)
+
+    report(PHASE_STATS)
+    if stats is None:
+        stats = SymbolStatistics.from_text(text)
+
+    report(PHASE_ENCODE)
+    tokens = tokens and algo not in ("lzw", "lzss")
+    encode = _codec(text, algo, stats, tokens)
+    started = time.perf_counter()
+    total_bits, overhead_bits, decode = encode()
+    encode_seconds = time.perf_counter() - started
+
+    # Cùng một cách tính cho mọi thuật toán: mọi bit cần lưu để giải mã được, chia cho số ký tự gốc
+    avg_len = total_bits / len(text) if text else 0.0
+
+    report(PHASE_DECODE)
+    started = time.perf_counter()
+    decoded_text = decode()
+    decode_seconds = time.perf_counter() - started
+    peak_memory = _peak_memory(encode) if measure_memory else None
+
+    report(PHASE_VERIFY)
+    result = {
+        "algo": algo,
+        "length_orig": len(text),
+        "entropy": stats.entropy,
+        "avg_len": avg_len,
+        "total_bits": total_bits,
+        "overhead_bits": overhead_bits,
+        "encode_seconds": encode_seconds,
+        "decode_seconds": decode_seconds,
+        "peak_memory_bytes": peak_memory,
+        "decoded_text": decoded_text if keep_decoded else None,
+        "verified": decoded_text == text,
+        "tokens": tokens,
+    }
+    report(PHASE_DONE)
+    return result
+
+
+def _run_job(text: str, algo: str, stats, keep_decoded: bool, tokens: bool, profile: bool, measure_memory: bool,
+             messages):
+    """Hàm chạy trong tiến trình con: mọi kết quả/lỗi đều gửi về qua messages."""
+    try:
+        result = analyze(text, algo, stats, lambda phase, fraction: messages.put(("progress", phase, fraction)),
+                         keep_decoded, tokens, profile, measure_memory)
+    except Exception as e:
+        messages.put(("error", str(e)))
+    else:
+        messages.put(("done", result))
+
+
+def _run_statistics(text: str, messages):
+    try:
+        stats = SymbolStatistics.from_text(text)
+    except Exception as e:
+        messages.put(("error", str(e)))
+    else:
+        messages.put(("done", stats))
+
+
+class AnalysisJob:
+    """
+    Một lần chạy analyze() trong tiến trình con.
+
+    poll() không bao giờ chặn và trả về danh sách thông điệp mới:
+        ("progress", tên bước, tỉ lệ), ("done", kết quả) hoặc ("error", thông báo).
+    Quá time_budget giây thì job tự hủy và trả về thông điệp lỗi.
+    """
+
+    def __init__(self, text: str, algo: str, time_budget: float = DEFAULT_TIME_BUDGET,
+                 stats: SymbolStatistics = None, keep_decoded: bool = True, tokens: bool = False,
+                 profile: bool = False, measure_memory: bool = False):
+        self.text = text
+        self.algo = algo
+        self.time_budget = time_budget
+        self.stats = stats
+        self.keep_decoded = keep_decoded
+        self.tokens = tokens
+        self.profile = profile
+        self.measure_memory = measure_memory
+        self.status = "pending"  # pending / running / done / error / cancelled
+        self._messages = None
+        self._process = None
+        self._started = None
+
+    def start(self):
+        context = multiprocessing.get_context()
+        self._messages = context.Queue()
+        target, args = self._target()
+        self._process = context.Process(target=target, daemon=True, args=(*args, self._messages))
+        self._started = time.monotonic()
+        self._process.start()
+        self.status = "running"
+        return self
+
+    def _target(self):
+        """Hàm chạy trong tiến trình con và tham số của nó (Queue thông điệp được thêm vào cuối)."""
+        return _run_job, (self.text, self.algo, self.stats, self.keep_decoded, self.tokens, self.profile,
+                          self.measure_memory)
+
+    @property
+    def elapsed(self) -> float:
+        return 0.0 if self._started is None else time.monotonic() - self._started
+
+    @property
+    def running(self) -> bool:
+        return self.status == "running"
+
+    def poll(self) -> list:
+        if not self.running:
+            return []
+        # Kiểm tra trước khi đọc: nếu tiến trình đã thoát thì mọi thông điệp đã nằm trong Queue
+        alive = self._process.is_alive()
+        messages = []
+        while True:
+            try:
+                message = self._messages.get_nowait()
+            except queue.Empty:
+                break
+            messages.append(message)
+            if message[0] in ("done", "error"):
+                self.status = message[0]
+                self._process.join()
+                return messages
+
+        if not alive:
+            self.status = "error"
+            messages.append(("error", f"Tiến trình xử lý kết thúc bất thường (mã {self._process.exitcode})"))
+        elif self.time_budget and self.elapsed > self.time_budget:
+            self.cancel()
+            self.status = "error"
+            messages.append(("error", f"Vượt quá giới hạn thời gian {self.time_budget:g} giây"))
+        return messages
+
+    def cancel(self):
+        """Dừng ngay tiến trình con (bỏ kết quả dở dang)."""
+        if self._process is not None and self._process.is_alive():
+            self._process.terminate()
+            self._process.join()
+        if self.running:
+            self.status = "cancelled"
+
+
+class StatisticsJob(AnalysisJob):
+    """Đếm ký tự của văn bản trong tiến trình con; kết quả của ("done", ...) là SymbolStatistics."""
+
+    def __init__(self, text: str, time_budget: float = DEFAULT_TIME_BUDGET):
+        super().__init__(text, None, time_budget)
+
+    def _target(self):
+        return _run_statistics, (self.text,)
+
+
+class CompareJob:
+    """
+    Chạy đồng thời mọi thuật toán trên cùng một văn bản, mỗi thuật toán một tiến trình con.
+
+    Văn bản chỉ được đếm một lần (stats dùng chung cho mọi tiến trình) nên tổng thời gian
+    xấp xỉ thời gian của thuật toán chậm nhất khi máy có đủ lõi CPU. Nếu không truyền stats thì
+    việc đếm cũng chạy trong tiến trình con (StatisticsJob) trước khi khởi động các thuật toán,
+    để giao diện không bị đứng với văn bản lớn; sau khi xong, thống kê nằm ở thuộc tính stats.
+    poll() trả về cùng dạng thông điệp với AnalysisJob; kết quả của ("done", ...) là
+    dict tên thuật toán -> kết quả analyze() (không kèm văn bản giải mã, có đo bộ nhớ đỉnh).
+    """
+
+    def __init__(self, text: str, algorithms=ALGORITHMS, time_budget: float = DEFAULT_TIME_BUDGET,
+                 stats: SymbolStatistics = None, tokens: bool = False):
+        self.text = text
+        self.algorithms = tuple(algorithms)
+        self.time_budget = time_budget
+        self.tokens = tokens
+        self.stats = stats
+        self.status = "pending"
+        self._stats_job = None
+        self._jobs = {}
+        self._fractions = {}
+        self._results = {}
+        self._started = None
+
+    def start(self):
+        self._started = time.monotonic()
+        if self.stats is None:
+            self._stats_job = StatisticsJob(self.text, self.time_budget).start()
+        else:
+            self._start_algorithms()
+        self.status = "running"
+        return self
+
+    def _start_algorithms(self):
+        self._jobs = {algo: AnalysisJob(self.text, algo, self.time_budget, self.stats, keep_decoded=False,
+                                        tokens=self.tokens, measure_memory=True).start()
+                      for algo in self.algorithms}
+        self._fractions = dict.fromkeys(self._jobs, 0.0)
+
+    @property
+    def elapsed(self) -> float:
+        return 0.0 if self._started is None else time.monotonic() - self._started
+
+    @property
+    def running(self) -> bool:
+        return self.status == "running"
+
+    def poll(self) -> list:
+        if not self.running:
+            return []
+        if not self._jobs:
+            for message in self._stats_job.poll():
+                if message[0] == "done":
+                    self.stats = message[1]
+                    self._start_algorithms()
+                elif message[0] == "error":
+                    self.status = "error"
+                    return [("error", f"Thống kê ký tự: {message[1]}")]
+            if not self._jobs:
+                return [("progress", "Thống kê ký tự", 0.0)]
+
+        for algo, job in self._jobs.items():
+            for message in job.poll():
+                if message[0] == "progress":
+                    self._fractions[algo] = message[2]
+                elif message[0] == "done":
+                    self._fractions[algo] = 1.0
+                    self._results[algo] = message[1]
+                else:
+                    self.cancel()
+                    self.status = "error"
+                    return [("error", f"{algo}: {message[1]}")]
+
+        if len(self._results) == len(self._jobs):
+            self.status = "done"
+            return [("done", {algo: self._results[algo] for algo in self._jobs})]
+        fraction = sum(self._fractions.values()) / len(self._fractions)
+        return [("progress", f"Đang so sánh ({len(self._results)}/{len(self._jobs)} xong)", fraction)]
+
+    def cancel(self):
+        if self._stats_job is not None:
+            self._stats_job.cancel()
+        for job in self._jobs.values():
+            job.cancel()
+        if self.running:
+            self.status = "cancelled"
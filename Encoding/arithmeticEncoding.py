@@ -1,127 +1,337 @@
-import math
+import struct
+import sys
+from bisect import bisect_right
 from collections import Counter
-from decimal import Decimal, getcontext
 
-# Thiết lập độ chính xác cao cho thư viện Decimal
-# Arithmetic coding tạo ra các khoảng số cực nhỏ, float thông thường sẽ bị underflow (về 0)
-getcontext().prec = 100  # Tăng lên nếu chuỗi văn bản rất dài
+from Encoding.buffers import byte_view
+from Encoding.symbolStatistics import SymbolStatistics, entropy_from_counts
+from Encoding.tokenizer import tokenize as split_tokens
+
+# Bộ mã hóa khoảng (range coder) số nguyên thay cho Decimal:
+# low/range là số nguyên 64-bit, mỗi khi range nhỏ hơn RANGE_TOP thì đẩy 1 byte ra
+# luồng (chuẩn hóa - renormalization), nên chi phí mỗi ký tự là hằng số
+# và không bị underflow dù chuỗi dài bao nhiêu.
+RANGE_BITS = 64
+RANGE_MASK = (1 << RANGE_BITS) - 1
+RANGE_TOP = 1 << (RANGE_BITS - 8)
+# Tổng tần suất tối đa: range >= 2^56 nên range // total luôn còn >= 2^24 mức
+MAX_TOTAL_FREQ = 1 << 32
+
+# Model tĩnh khi lưu kèm dữ liệu nén: loại ký hiệu (u8), số ký hiệu khác nhau, rồi từng cặp
+# (khoảng cách mã Unicode tới ký hiệu trước - 1, tần suất) theo thứ tự mã tăng dần;
+# với token thì mỗi mục là (số byte UTF-8, tần suất) theo sau là chuỗi UTF-8 của token.
+# Mọi số sau loại ký hiệu là varint (7 bit mỗi byte, bit cao = còn byte tiếp theo), nên bảng
+# chữ cái tiếng Việt tốn khoảng 2-4 byte mỗi ký hiệu thay vì 12 byte cố định.
+MODEL_SYMBOLS = 0
+MODEL_TOKENS = 1
+_MODEL_HEADER = struct.Struct(">B")
+
+# Mô hình thích nghi: tần suất ký hiệu tăng ADAPT_INCREMENT sau mỗi lần gặp,
+# khi tổng vượt ADAPT_LIMIT thì chia đôi tất cả để ưu tiên thống kê gần đây.
+ADAPT_INCREMENT = 24
+ADAPT_LIMIT = 1 << 16
+# Header luồng thích nghi: magic "AA", bậc ngữ cảnh, số byte gốc
+ADAPTIVE_MAGIC = b"AA"
+_ADAPTIVE_HEADER = struct.Struct(">2sBQ")
+# Bậc 2 có tới 65536 ngữ cảnh, mỗi ngữ cảnh một cây Fenwick 256 ký hiệu (khoảng 4 KB). Để bộ nhớ
+# có giới hạn, chỉ MAX_ADAPTIVE_CONTEXTS ngữ cảnh gặp đầu tiên có bảng riêng; ngữ cảnh mới sau đó
+# dùng chung bảng bậc 1 theo byte ngay trước. Giới hạn này là một phần của định dạng luồng.
+MAX_ADAPTIVE_CONTEXTS = 4096
+
+
+def _append_varint(output: bytearray, value: int):
+    while value >= 0x80:
+        output.append((value & 0x7F) | 0x80)
+        value >>= 7
+    output.append(value)
+
+
+def _read_varint(data, offset: int) -> tuple[int, int]:
+    """Đọc một varint tại offset, trả về (giá trị, vị trí ngay sau nó)."""
+    value = 0
+    shift = 0
+    while True:
+        if offset >= len(data):
+            raise ValueError("Model mã hóa số học bị cắt cụt")
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+class RangeEncoder:
+    """
+    Bộ mã hóa khoảng số nguyên (kiểu LZMA).
+    Phần nhớ (carry) khi low vượt quá 64 bit được xử lý bằng một byte cache
+    cùng số byte 0xFF đang chờ, nên không cần quay lại sửa byte đã ghi.
+    """
+
+    def __init__(self):
+        self.low = 0
+        self.range = RANGE_MASK
+        self.output = bytearray()
+        self.renormalizations = 0
+        self._cache = 0
+        self._cache_size = 1
+
+    def encode(self, cum_freq: int, freq: int, total_freq: int):
+        """Thu hẹp khoảng về [cum_freq, cum_freq + freq) / total_freq."""
+        r = self.range // total_freq
+        self.low += r * cum_freq
+        self.range = r * freq
+        while self.range < RANGE_TOP:
+            self.range <<= 8
+            self._shift_low()
+
+    def _shift_low(self):
+        self.renormalizations += 1
+        low = self.low
+        if low < (0xFF << (RANGE_BITS - 8)) or low > RANGE_MASK:
+            carry = low >> RANGE_BITS
+            self.output.append((self._cache + carry) & 0xFF)
+            if self._cache_size > 1:
+                self.output.extend(bytes([(0xFF + carry) & 0xFF]) * (self._cache_size - 1))
+            self._cache_size = 0
+            self._cache = (low >> (RANGE_BITS - 8)) & 0xFF
+        self._cache_size += 1
+        self.low = (low << 8) & RANGE_MASK
+
+    def finish(self) -> bytes:
+        """
+        Kết thúc luồng: chọn trong [low, low + range) giá trị có nhiều byte 0
+        ở cuối nhất rồi đẩy hết ra. Các byte 0 ở cuối được bỏ đi vì bộ giải mã
+        tự bù 0 khi đọc quá cuối dữ liệu.
+        """
+        high = self.low + self.range
+        for nbytes in range(RANGE_BITS // 8 + 1):
+            shift = RANGE_BITS - 8 * nbytes
+            value = ((self.low + (1 << shift) - 1) >> shift) << shift
+            if value < high:
+                break
+        self.low = value
+        for _ in range(RANGE_BITS // 8 + 1):
+            self._shift_low()
+        # Byte đầu tiên luôn bằng 0 vì khoảng ban đầu [0, 2^64) không bao giờ bị nhớ ra ngoài
+        return bytes(self.output[1:]).rstrip(b"\x00")
+
+
+class RangeDecoder:
+    """Bộ giải mã tương ứng với RangeEncoder."""
+
+    def __init__(self, data: bytes):
+        self.data = data
+        self.pos = 0
+        self.range = RANGE_MASK
+        self.code = 0
+        self._r = 1
+        for _ in range(RANGE_BITS // 8):
+            self.code = (self.code << 8) | self._next_byte()
+
+    def _next_byte(self) -> int:
+        pos = self.pos
+        self.pos = pos + 1
+        if pos < len(self.data):
+            return self.data[pos]
+        return 0
+
+    def get_freq(self, total_freq: int) -> int:
+        """Trả về tần suất tích lũy mà giá trị mã hiện tại rơi vào."""
+        self._r = self.range // total_freq
+        return min(self.code // self._r, total_freq - 1)
+
+    def decode(self, cum_freq: int, freq: int):
+        """Loại bỏ ký tự vừa giải mã (khoảng [cum_freq, cum_freq + freq)) khỏi mã."""
+        self.code -= self._r * cum_freq
+        self.range = self._r * freq
+        while self.range < RANGE_TOP:
+            self.code = (self.code << 8) | self._next_byte()
+            self.range <<= 8
+
 
 class ArithmeticEncoding:
-    def __init__(self, text):
+    def __init__(self, text, frequencies=None, tokenize: bool = False):
+        """
+        Args:
+            text (str): Văn bản cần mã hóa, hoặc dữ liệu nhị phân bất kỳ dạng buffer
+                (bytes, memoryview, mmap...) khi đó mỗi byte là một ký hiệu và dữ liệu không bị sao chép.
+            frequencies (dict, optional): Bảng tần suất có sẵn (ví dụ đọc từ model đã lưu
+                hoặc SymbolStatistics.counts), dùng lại thay vì đếm lại văn bản.
+            tokenize (bool): True thì ký hiệu là token (từ/âm tiết, khoảng trắng, dấu câu) thay vì ký tự;
+                khi đó self.length là số token.
+        """
+        self.tokenize = tokenize
+        if tokenize:
+            text = split_tokens(text)
+        elif not isinstance(text, str):
+            text = byte_view(text)
         self.text = text
-        self.length = len(text)
-        self.frequencies = Counter(text)
+        if frequencies is None:
+            if tokenize:
+                frequencies = SymbolStatistics.from_tokens(text).counts
+            elif isinstance(text, str):
+                frequencies = SymbolStatistics.from_text(text).counts
+            else:
+                frequencies = SymbolStatistics.from_bytes(text).counts
+        self.frequencies = Counter(frequencies)
+        self.length = sum(self.frequencies.values())
         self.probabilities = self._calculate_probabilities()
+        self.total_freq = 0
+        # Bảng tích lũy cho giải mã: ký tự thứ i chiếm [cum_lows[i], cum_lows[i + 1])
+        self.symbols = []
+        self.cum_lows = []
         self.ranges = self._calculate_ranges()
+        # Số lần chuẩn hóa (đẩy byte ra) của range coder trong lần encode() gần nhất
+        self.renormalizations = 0
 
     def _calculate_probabilities(self):
         """Tính xác suất xuất hiện của từng ký tự"""
         probs = {}
         for char, count in self.frequencies.items():
-            probs[char] = Decimal(count) / Decimal(self.length)
+            probs[char] = count / self.length
         return probs
 
     def _calculate_ranges(self):
         """
-        Xác định khoảng [low, high) cho từng ký tự.
-        Ví dụ: a: [0, 0.5), b: [0.5, 0.8), ...
+        Xác định khoảng tần suất tích lũy số nguyên [low, high) cho từng ký tự.
+        Ví dụ: a: [0, 5), b: [5, 8), ... trên tổng self.total_freq.
+        Nếu chuỗi dài hơn MAX_TOTAL_FREQ thì tần suất được co lại (mỗi ký tự >= 1).
         """
+        scale = 1
+        if self.length > MAX_TOTAL_FREQ:
+            scale = MAX_TOTAL_FREQ / self.length
+
         ranges = {}
-        current_low = Decimal(0)
+        current_low = 0
         # Sắp xếp keys để đảm bảo thứ tự khoảng nhất quán
-        for char in sorted(self.probabilities.keys()):
-            prob = self.probabilities[char]
-            ranges[char] = (current_low, current_low + prob)
-            current_low += prob
+        for char in sorted(self.frequencies.keys()):
+            freq = self.frequencies[char]
+            if scale != 1:
+                freq = max(1, int(freq * scale))
+            ranges[char] = (current_low, current_low + freq)
+            current_low += freq
+        self.total_freq = current_low
+        self.symbols = list(ranges)
+        self.cum_lows = [low for low, _ in ranges.values()] + [current_low]
         return ranges
 
+    def serialize_model(self) -> bytes:
+        """Ghi bảng tần suất (đủ để dựng lại self.ranges khi giải mã) thành bytes."""
+        kind = MODEL_TOKENS if self.tokenize else MODEL_SYMBOLS
+        output = bytearray(_MODEL_HEADER.pack(kind))
+        _append_varint(output, len(self.frequencies))
+        previous = -1
+        for char in sorted(self.frequencies):
+            if kind == MODEL_TOKENS:
+                raw = char.encode("utf-8", "surrogatepass")
+                _append_varint(output, len(raw))
+                _append_varint(output, self.frequencies[char])
+                output += raw
+                continue
+            symbol = char if isinstance(char, int) else ord(char)
+            _append_varint(output, symbol - previous - 1)
+            _append_varint(output, self.frequencies[char])
+            previous = symbol
+        return bytes(output)
+
+    @classmethod
+    def from_model(cls, data: bytes, offset: int = 0):
+        """
+        Dựng lại bộ mã từ dữ liệu của serialize_model().
+        Trả về: (đối tượng ArithmeticEncoding, vị trí ngay sau phần model)
+        """
+        (kind,) = _MODEL_HEADER.unpack_from(data, offset)
+        if kind not in (MODEL_SYMBOLS, MODEL_TOKENS):
+            raise ValueError("Model mã hóa số học không hợp lệ")
+        alphabet_size, offset = _read_varint(data, offset + _MODEL_HEADER.size)
+        frequencies = {}
+        symbol = -1
+        for _ in range(alphabet_size):
+            value, offset = _read_varint(data, offset)
+            count, offset = _read_varint(data, offset)
+            if kind == MODEL_TOKENS:
+                if offset + value > len(data):
+                    raise ValueError("Model mã hóa số học bị cắt cụt")
+                frequencies[str(data[offset:offset + value], "utf-8", "surrogatepass")] = count
+                offset += value
+            else:
+                symbol += value + 1
+                if symbol > sys.maxunicode:
+                    raise ValueError("Model mã hóa số học không hợp lệ")
+                frequencies[chr(symbol)] = count
+        return cls("", frequencies, tokenize=kind == MODEL_TOKENS), offset
+
     def calculate_entropy(self):
         """
         Tính Entropy (H) của nguồn tin theo công thức Shannon:
         H = - sum(p(x) * log2(p(x)))
         """
-        entropy = Decimal(0)
-        for prob in self.probabilities.values():
-            if prob > 0:
-                # Sử dụng logarit cơ số 2
-                entropy -= prob * (prob.ln() / Decimal(2).ln())
-        return float(entropy)
+        return entropy_from_counts(self.frequencies.values())
 
-    def encode(self):
+    def encode(self) -> bytes:
         """
-        Thực hiện mã hóa để tìm khoảng cuối cùng.
-        Trả về: (low, high, interval_width)
+        Mã hóa toàn bộ chuỗi bằng range coder số nguyên.
+        Trả về: luồng byte đã nén.
         """
-        low = Decimal(0)
-        high = Decimal(1)
-        
+        encoder = RangeEncoder()
+        total_freq = self.total_freq
+        ranges = self.ranges
+
         for char in self.text:
-            # Độ rộng khoảng hiện tại
-            current_range = high - low
-            
-            # Lấy khoảng con của ký tự hiện tại
-            char_low, char_high = self.ranges[char]
-            
-            # Cập nhật high trước (dựa trên low cũ)
-            high = low + current_range * char_high
-            # Cập nhật low sau
-            low = low + current_range * char_low
-            
-        interval_width = high - low
-        return low, high, interval_width
-     
-    def decode(self, encoded_value, length):
-        """
-        Giải mã từ một giá trị số thực về chuỗi văn bản.
-        
+            # Lấy khoảng con của ký tự hiện tại rồi thu hẹp khoảng mã
+            char_low, char_high = ranges[char]
+            encoder.encode(char_low, char_high - char_low, total_freq)
+
+        encoded = encoder.finish()
+        self.renormalizations = encoder.renormalizations
+        return encoded
+
+    def decode(self, encoded_data: bytes, length: int) -> str:
+        """
+        Giải mã luồng byte về chuỗi văn bản.
+
         Args:
-            encoded_value (Decimal): Một giá trị nằm trong khoảng [low, high) cuối cùng.
-            length (int): Số lượng ký tự cần giải mã.
+            encoded_data (bytes): Kết quả của encode().
+            length (int): Số lượng ký hiệu cần giải mã (số token ở chế độ tokenize).
         """
+        return "".join(self._decode_symbols(encoded_data, length, self.symbols))
+
+    def decode_bytes(self, encoded_data: bytes, length: int) -> bytes:
+        """
+        Giải mã về dữ liệu nhị phân khi các ký hiệu là byte
+        (mô hình dựng từ dữ liệu bytes, hoặc đọc từ model với ký tự có mã < 256).
+        """
+        symbols = [symbol if isinstance(symbol, int) else ord(symbol) for symbol in self.symbols]
+        return bytes(self._decode_symbols(encoded_data, length, symbols))
+
+    def _decode_symbols(self, encoded_data: bytes, length: int, symbols: list) -> list:
         decoded_text = []
-        # Thêm một lượng cực nhỏ epsilon để bù trừ sai số làm tròn (precision drift)
-        # khi encoded_value nằm sát biên dưới (low).
-        # Với prec=100, 1e-50 đủ nhỏ để không ảnh hưởng dữ liệu ngắn/trung bình
-        # nhưng đủ lớn để tránh lỗi "hụt" biên.
-        current_value = encoded_value + Decimal('1e-80')
+        decoder = RangeDecoder(encoded_data)
+        total_freq = self.total_freq
+        cum_lows = self.cum_lows
 
         for _ in range(length):
-            # Tìm ký tự mà current_value rơi vào khoảng của nó
-            for char, (low_range, high_range) in self.ranges.items():
-                if low_range <= current_value < high_range:
-                    decoded_text.append(char)
-                    
-                    # Cập nhật giá trị để giải mã ký tự tiếp theo
-                    # Công thức: v_new = (v_old - low_i) / (high_i - low_i)
-                    range_width = high_range - low_range
-                    current_value = (current_value - low_range) / range_width
-                    break
-                    
-        return "".join(decoded_text)
-
-    def calculate_total_length_formula(self, p_s):
-        """
-        Tính tổng độ dài bit (L_total) dựa trên công thức bạn cung cấp:
-        L_total = ceil( -log2(P(S)) ) + 1
-        
+            target = decoder.get_freq(total_freq)
+            # Tìm nhị phân ký tự mà target rơi vào khoảng của nó: O(log kích thước bảng chữ cái)
+            index = bisect_right(cum_lows, target) - 1
+            decoded_text.append(symbols[index])
+            low_range = cum_lows[index]
+            decoder.decode(low_range, cum_lows[index + 1] - low_range)
+
+        return decoded_text
+
+    def calculate_total_length_formula(self, encoded_data: bytes):
+        """
+        Tính tổng độ dài bit (L_total) thực tế của luồng đã mã hóa.
+        Trước đây dùng công thức lý thuyết L_total = ceil(-log2(P(S))) + 1,
+        nay range coder ghi ra byte thật nên L_total = số byte * 8
+        (luôn chỉ lớn hơn -log2(P(S)) vài bit).
+
         Args:
-            p_s (Decimal): Độ rộng của khoảng số thực cuối cùng (Interval Width)
-        """
-        if p_s <= 0:
-            return 0
-            
-        # Tính -log2(P(S))
-        # Vì Decimal không có log2 trực tiếp, ta dùng ln(x)/ln(2)
-        log2_val = p_s.ln() / Decimal(2).ln()
-        neg_log2 = -log2_val
-        
-        # Hàm trần (Ceiling)
-        ceil_val = math.ceil(neg_log2)
-        
-        # Cộng thêm hằng số an toàn +1 như trong công thức
-        l_total = ceil_val + 1
-        
-        return l_total
+            encoded_data (bytes): Kết quả của encode()
+        """
+        return len(encoded_data) * 8
 
     def calculate_average_length(self, l_total):
         """
@@ -133,20 +343,194 @@ class ArithmeticEncoding:
 
     def display(self):
         print(f"Độ dài chuỗi: {len(self.text)} ký tự")
-        
+
         entropy = self.calculate_entropy()
         print(f"Entropy: {entropy:.6f} bits/kh")
 
-        low, high, p_s = self.encode()
-        print(f"Low  : {low}")
-        print(f"High : {high}")
-        print(f"P(S) (Độ rộng): {p_s}")
-        
-        l_total = self.calculate_total_length_formula(p_s)
+        encoded = self.encode()
+        print(f"Mã hóa ({len(encoded)} bytes): {encoded.hex()}")
+
+        l_total = self.calculate_total_length_formula(encoded)
         print(f"L_total = {l_total} bits (Tổng số bit cần để lưu cả chuỗi)")
 
         l_avg = self.calculate_average_length(l_total)
         print(f"Độ dài trung bình của từ mã: L_avg = {l_total} / {len(self.text)} = {l_avg:.6f} bits/kh")
 
-        decoder = self.decode(low, len(self.text))
-        print(f"Giải mã: {decoder}")
\ No newline at end of file
+        decoder = self.decode(encoded, len(self.text))
+        print(f"Giải mã: {decoder}")
+
+
+class FenwickTree:
+    """
+    Cây Fenwick (Binary Indexed Tree) lưu tần suất của các ký hiệu 0..size-1.
+    Tổng tích lũy, cập nhật và tìm ký hiệu theo tần suất tích lũy đều O(log size).
+    """
+
+    def __init__(self, size: int, initial: int = 1):
+        self.size = size
+        self.freqs = [initial] * size
+        self._top = 1 << (size.bit_length() - 1)
+        self._rebuild()
+
+    def copy(self) -> "FenwickTree":
+        """Bản sao độc lập (sao chép hai danh sách, không dựng lại cây)."""
+        clone = object.__new__(FenwickTree)
+        clone.size = self.size
+        clone.freqs = list(self.freqs)
+        clone.tree = list(self.tree)
+        clone.total = self.total
+        clone._top = self._top
+        return clone
+
+    def _rebuild(self):
+        """Dựng lại cây từ self.freqs trong O(size)."""
+        tree = [0] + self.freqs
+        for i in range(1, self.size + 1):
+            parent = i + (i & -i)
+            if parent <= self.size:
+                tree[parent] += tree[i]
+        self.tree = tree
+        self.total = sum(self.freqs)
+
+    def prefix_sum(self, symbol: int) -> int:
+        """Tổng tần suất của các ký hiệu nhỏ hơn symbol."""
+        tree = self.tree
+        total = 0
+        while symbol:
+            total += tree[symbol]
+            symbol &= symbol - 1
+        return total
+
+    def add(self, symbol: int, delta: int):
+        self.freqs[symbol] += delta
+        self.total += delta
+        tree = self.tree
+        index = symbol + 1
+        while index <= self.size:
+            tree[index] += delta
+            index += index & -index
+
+    def find(self, target: int) -> tuple[int, int]:
+        """
+        Tìm ký hiệu có khoảng tích lũy chứa target.
+        Trả về: (ký hiệu, tần suất tích lũy của các ký hiệu đứng trước nó)
+        """
+        tree = self.tree
+        position = 0
+        remaining = target
+        step = self._top
+        while step:
+            candidate = position + step
+            if candidate <= self.size and tree[candidate] <= remaining:
+                position = candidate
+                remaining -= tree[candidate]
+            step >>= 1
+        return position, target - remaining
+
+    def update(self, symbol: int):
+        """Tăng tần suất ký hiệu vừa gặp, chia đôi toàn bộ bảng khi tổng quá lớn."""
+        self.add(symbol, ADAPT_INCREMENT)
+        if self.total > ADAPT_LIMIT:
+            self.freqs = [(freq + 1) // 2 for freq in self.freqs]
+            self._rebuild()
+
+
+class _ContextModels(dict):
+    """
+    Bảng tần suất theo ngữ cảnh, tạo khi ngữ cảnh xuất hiện lần đầu. Khi đã có MAX_ADAPTIVE_CONTEXTS
+    bảng, ngữ cảnh mới dùng chung bảng dự phòng theo byte ngay trước (bộ giải mã làm y hệt).
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._uniform = FenwickTree(256)
+        self.fallbacks = {}
+
+    def __missing__(self, context: int) -> FenwickTree:
+        if len(self) < MAX_ADAPTIVE_CONTEXTS:
+            model = self[context] = self._uniform.copy()
+            return model
+        model = self.fallbacks.get(context & 0xFF)
+        if model is None:
+            model = self.fallbacks[context & 0xFF] = self._uniform.copy()
+        return model
+
+
+class AdaptiveArithmeticEncoding:
+    """
+    Mã hóa số học thích nghi trên các byte UTF-8.
+    Không cần biết trước toàn bộ văn bản: tần suất được cập nhật sau mỗi byte (cây Fenwick),
+    bộ giải mã cập nhật y hệt nên không phải lưu bảng tần suất vào dữ liệu nén.
+    Với order = 1 hoặc 2, mỗi ngữ cảnh (1 hoặc 2 byte đứng trước) có bảng tần suất riêng, được tạo
+    khi ngữ cảnh xuất hiện lần đầu; tối đa MAX_ADAPTIVE_CONTEXTS bảng (xem _ContextModels).
+    """
+
+    def __init__(self, order: int = 0):
+        if order not in (0, 1, 2):
+            raise ValueError("Bậc ngữ cảnh (order) chỉ hỗ trợ 0, 1 hoặc 2")
+        self.order = order
+        # Thống kê của lần encode_bytes() gần nhất
+        self.length = 0
+        self.contexts = 0
+        self.renormalizations = 0
+
+    def encode(self, text: str) -> bytes:
+        return self.encode_bytes(text.encode("utf-8", "surrogatepass"))
+
+    def decode(self, encoded_data: bytes) -> str:
+        return self.decode_bytes(encoded_data).decode("utf-8", "surrogatepass")
+
+    def encode_bytes(self, data) -> bytes:
+        """
+        Mã hóa một lượt (one-pass); kết quả tự chứa bậc ngữ cảnh và độ dài gốc.
+        data là bất kỳ buffer nào (bytes, bytearray, memoryview, mmap), được duyệt không sao chép.
+        """
+        data = byte_view(data)
+        encoder = RangeEncoder()
+        context_mask = (1 << (8 * self.order)) - 1
+        models = _ContextModels()
+        context = 0
+
+        for byte in data:
+            model = models[context]
+            encoder.encode(model.prefix_sum(byte), model.freqs[byte], model.total)
+            model.update(byte)
+            context = ((context << 8) | byte) & context_mask
+
+        header = _ADAPTIVE_HEADER.pack(ADAPTIVE_MAGIC, self.order, len(data))
+        encoded = header + encoder.finish()
+        self.length = len(data)
+        self.contexts = len(models)
+        self.renormalizations = encoder.renormalizations
+        return encoded
+
+    def decode_bytes(self, encoded_data: bytes) -> bytes:
+        magic, order, length = _ADAPTIVE_HEADER.unpack_from(encoded_data)
+        if magic != ADAPTIVE_MAGIC or order not in (0, 1, 2):
+            raise ValueError("Dữ liệu không phải luồng mã hóa số học thích nghi hợp lệ")
+
+        decoder = RangeDecoder(memoryview(encoded_data)[_ADAPTIVE_HEADER.size:])
+        context_mask = (1 << (8 * order)) - 1
+        models = _ContextModels()
+        context = 0
+        result = bytearray()
+
+        for _ in range(length):
+            model = models[context]
+            symbol, cum_freq = model.find(decoder.get_freq(model.total))
+            decoder.decode(cum_freq, model.freqs[symbol])
+            model.update(symbol)
+            result.append(symbol)
+            context = ((context << 8) | symbol) & context_mask
+
+        return bytes(result)
+
+    def calculate_entropy(self, text: str) -> float:
+        """Entropy bậc 0 theo ký tự (để so sánh với các thuật toán khác)."""
+        return SymbolStatistics.from_text(text).entropy
+
+    def calculate_average_length(self, text: str, total_bits: int) -> float:
+        """L_avg = Tổng số bit sau nén / Tổng số ký tự"""
+        if not text:
+            return 0.0
+        return total_bits / len(text)
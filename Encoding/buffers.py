@@ -0,0 +1,84 @@
+"""
+Dữ liệu vào dạng buffer (bytes, bytearray, memoryview, mmap...) cho các bộ mã hóa.
+
+byte_view() trả về memoryview từng byte trỏ thẳng vào buffer gốc (không sao chép),
+duyệt memoryview cho ra số nguyên 0..255 giống như duyệt bytes.
+map_file() ánh xạ file vào bộ nhớ (mmap) để nén file lớn mà không phải đọc hết vào RAM.
+ChunkReader/as_reader/read_exact: đọc tuần tự từ file nhị phân hoặc iterator các khối bytes.
+"""
+import mmap
+import os
+from contextlib import contextmanager
+
+
+def byte_view(data) -> memoryview:
+    """memoryview định dạng 'B' (mỗi phần tử 1 byte) của một đối tượng hỗ trợ buffer protocol."""
+    if isinstance(data, str):
+        raise TypeError("Cần dữ liệu dạng bytes, hãy mã hóa chuỗi (ví dụ text.encode('utf-8')) trước")
+    view = data if isinstance(data, memoryview) else memoryview(data)
+    if view.format != "B" or view.ndim != 1:
+        view = view.cast("B")
+    return view
+
+
+@contextmanager
+def map_file(path):
+    """
+    Mở file chỉ đọc và trả về byte_view của vùng mmap (file rỗng trả về memoryview rỗng).
+    Vùng nhớ được giải phóng khi ra khỏi khối with, không được giữ lại view sau đó.
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield memoryview(b"")
+            return
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(mapped)
+        try:
+            yield view
+        finally:
+            try:
+                view.release()
+                mapped.close()
+            except BufferError:
+                # Còn lát cắt memoryview đang được giữ (ví dụ trong traceback): để GC đóng sau
+                pass
+
+
+class ChunkReader:
+    """Bọc một iterator các khối bytes thành đối tượng có read(n) giống file."""
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._buffer = bytearray()
+
+    def read(self, size: int = -1) -> bytes:
+        while size < 0 or len(self._buffer) < size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self._buffer += chunk
+        if size < 0:
+            size = len(self._buffer)
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
+
+
+def as_reader(source):
+    """Chấp nhận file nhị phân (có read) hoặc iterator các khối bytes."""
+    if hasattr(source, "read"):
+        return source
+    return ChunkReader(source)
+
+
+def read_exact(reader, size: int) -> bytes:
+    """Đọc đủ size byte (ít hơn nếu gặp cuối luồng)."""
+    parts = []
+    remaining = size
+    while remaining > 0:
+        data = reader.read(remaining)
+        if not data:
+            break
+        parts.append(data)
+        remaining -= len(data)
+    return b"".join(parts)
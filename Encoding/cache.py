@@ -0,0 +1,172 @@
+"""
+Bộ nhớ đệm kết quả theo nội dung cho các lần chạy lặp lại (giao diện và dòng lệnh).
+
+Khóa = (SHA-256 của dữ liệu, tên thuật toán, tham số). Giá trị (bảng tần suất, kết quả phân tích,
+dữ liệu đã nén...) được lưu ở dạng pickle nên kích thước đo chính xác theo byte; bộ nhớ trong
+bị giới hạn theo tổng số byte và loại bỏ mục ít dùng nhất (LRU). Nếu có thư mục cache thì
+mỗi mục còn được ghi ra đĩa để các lần chạy sau (tiến trình khác) dùng lại; trên đĩa cũng giới hạn
+theo tổng số byte và số file, xóa file có thời gian dùng gần nhất (mtime) cũ nhất trước.
+
+File cache được nạp lại bằng pickle nên không được để người khác ghi vào: trên Unix mỗi người dùng
+có thư mục con riêng (user-<uid>) quyền 0700, thư mục thuộc người khác hoặc cho người khác ghi bị từ chối.
+"""
+import hashlib
+import os
+import pickle
+import stat
+import tempfile
+from collections import OrderedDict
+
+DEFAULT_MAX_BYTES = 64 << 20
+DEFAULT_MAX_DISK_BYTES = 256 << 20
+DEFAULT_MAX_DISK_ENTRIES = 10_000
+_CACHE_SUFFIX = ".pkl"
+
+
+def _private_directory(base: str) -> str:
+    """Thư mục cache riêng của người dùng hiện tại bên trong base (tạo với quyền 0700 nếu chưa có)."""
+    if not hasattr(os, "getuid"):  # Windows: thư mục người dùng vốn đã riêng
+        os.makedirs(base, exist_ok=True)
+        return base
+    directory = os.path.join(base, f"user-{os.getuid()}")
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    info = os.lstat(directory)
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid() or info.st_mode & 0o077:
+        raise ValueError(f"Thư mục cache không an toàn (phải thuộc người dùng hiện tại, quyền 0700): {directory}")
+    return directory
+
+
+def content_hash(data) -> str:
+    """SHA-256 (hex) của văn bản (mã hóa UTF-8) hoặc dữ liệu bytes-like."""
+    if isinstance(data, str):
+        data = data.encode("utf-8", "surrogatepass")
+    return hashlib.sha256(data).hexdigest()
+
+
+class ResultCache:
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, directory: str = None,
+                 max_disk_bytes: int = DEFAULT_MAX_DISK_BYTES, max_disk_entries: int = DEFAULT_MAX_DISK_ENTRIES):
+        """
+        Args:
+            max_bytes: tổng kích thước tối đa (byte, dạng pickle) của các mục giữ trong bộ nhớ.
+            directory: thư mục lưu cache trên đĩa (None = chỉ dùng bộ nhớ); file nằm trong thư mục
+                con riêng của người dùng (xem _private_directory).
+            max_disk_bytes, max_disk_entries: giới hạn tổng kích thước và số file trên đĩa.
+        """
+        self.max_bytes = max_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.max_disk_entries = max_disk_entries
+        self.directory = None if directory is None else _private_directory(directory)
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    @staticmethod
+    def make_key(digest: str, algo: str, **params) -> tuple:
+        """Khóa cache: (hash nội dung, thuật toán, các tham số đã sắp xếp)."""
+        return digest, algo, tuple(sorted(params.items()))
+
+    def _path(self, key: tuple) -> str:
+        name = hashlib.sha256(repr(key).encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, name + _CACHE_SUFFIX)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: tuple) -> bool:
+        return key in self._entries or (self.directory is not None and os.path.exists(self._path(key)))
+
+    def get(self, key: tuple, default=None):
+        blob = self._entries.get(key)
+        if blob is not None:
+            self._entries.move_to_end(key)
+        elif self.directory is not None:
+            blob = self._load(key)
+            if blob is not None:
+                self._remember(key, blob)
+        if blob is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        return pickle.loads(blob)
+
+    def put(self, key: tuple, value):
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        self._remember(key, blob)
+        if self.directory is not None:
+            self._store(key, blob)
+
+    def get_or_compute(self, key: tuple, compute):
+        """Trả về giá trị đã lưu, hoặc gọi compute() rồi lưu kết quả."""
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        """Xóa các mục trong bộ nhớ (file trên đĩa được giữ nguyên)."""
+        self._entries.clear()
+        self.current_bytes = 0
+
+    def _remember(self, key: tuple, blob: bytes):
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.current_bytes -= len(old)
+        if len(blob) > self.max_bytes:
+            return
+        self._entries[key] = blob
+        self.current_bytes += len(blob)
+        while self.current_bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.current_bytes -= len(evicted)
+
+    def _load(self, key: tuple):
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                blob = f.read()
+            # Cập nhật mtime: file vừa dùng bị xóa sau cùng khi thư mục đầy
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return blob
+
+    def _store(self, key: tuple, blob: bytes):
+        # Ghi ra file tạm rồi đổi tên để tiến trình khác không đọc phải file ghi dở
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(blob)
+            os.replace(tmp_path, self._path(key))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        self._evict_disk()
+
+    def _evict_disk(self):
+        """Xóa các file cũ nhất (theo mtime) tới khi thư mục nằm trong giới hạn số file và số byte."""
+        files = []
+        total = 0
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if not entry.name.endswith(_CACHE_SUFFIX):
+                    continue
+                try:
+                    info = entry.stat()
+                except FileNotFoundError:  # tiến trình khác vừa xóa
+                    continue
+                files.append((info.st_mtime, info.st_size, entry.path))
+                total += info.st_size
+        files.sort()
+        count = len(files)
+        for _, size, path in files:
+            if count <= self.max_disk_entries and total <= self.max_disk_bytes:
+                break
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            count -= 1
+            total -= size
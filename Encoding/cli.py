@@ -0,0 +1,264 @@
+"""
+Giao diện dòng lệnh (không dùng tkinter/matplotlib) cho các thuật toán nén.
+
+Ví dụ:
+    python -m Encoding compress --algo lzw input.txt -o input.enc
+    cat input.txt | python -m Encoding compress --algo huffman --workers 4 > input.enc
+    python -m Encoding decompress input.enc -o input.txt
+    python -m Encoding stats input.txt
+    python -m Encoding verify input.enc
+    python -m Encoding compress --profile --profile-out nen.prof input.txt -o input.enc
+    python -m Encoding serve --port 8765 --workers 4
+"""
+import argparse
+import math
+import os
+import sys
+from contextlib import contextmanager
+
+from Encoding.buffers import ChunkReader, map_file, read_exact
+from Encoding.container import CONTAINER_MAGIC, CONTAINER_VERSION, MAX_BLOCK_SIZE
+from Encoding.parallel import (
+    DEFAULT_BLOCK_SIZE, BlockArchive, compress_file, compress_parallel, compress_parallel_stream,
+    decompress_parallel_stream,
+)
+from Encoding.streaming import BLOCK_CODECS
+from Encoding.symbolStatistics import SymbolStatistics
+
+
+def _open_input(path: str):
+    if path == "-":
+        return sys.stdin.buffer
+    return open(path, "rb")
+
+
+@contextmanager
+def _input_buffer(path: str):
+    """Toàn bộ dữ liệu vào dạng buffer: file được mmap (không đọc vào RAM), stdin thì đọc hết."""
+    if path == "-":
+        yield sys.stdin.buffer.read()
+    else:
+        with map_file(path) as view:
+            yield view
+
+
+def _open_output(path: str):
+    if path == "-":
+        return sys.stdout.buffer
+    return open(path, "wb")
+
+
+def parse_size(value: str) -> int:
+    """Đổi '1K', '64K', '1M', '4G' hoặc số byte thành số nguyên (dùng chung với benchmarks)."""
+    value = value.strip().upper()
+    units = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30}
+    if value and value[-1] in units:
+        return int(float(value[:-1]) * units[value[-1]])
+    return int(value)
+
+
+# Encoding.cache (hashlib, pickle, tempfile) và Encoding.profiling (cProfile, pstats, tracemalloc)
+# chỉ được nạp khi dùng --cache-dir / --profile, để các lệnh thông thường khởi động nhanh
+def _open_cache(args):
+    if args.cache_dir is None:
+        return None
+    from Encoding.cache import ResultCache
+
+    return ResultCache(directory=args.cache_dir)
+
+
+def cmd_compress(args) -> int:
+    cache = _open_cache(args)
+    with _open_output(args.output) as writer:
+        if cache is None:
+            if args.input == "-":
+                compress_parallel_stream(sys.stdin.buffer, writer, args.algo, args.block_size, args.workers)
+            else:
+                compress_file(args.input, writer, args.algo, args.block_size, args.workers)
+            return 0
+        # Có cache: cần toàn bộ dữ liệu để tính hash; cùng nội dung + tham số thì ghi lại kết quả cũ
+        from Encoding.cache import content_hash
+
+        with _input_buffer(args.input) as data:
+            key = cache.make_key(content_hash(data), args.algo, block_size=args.block_size, version=CONTAINER_VERSION)
+            writer.write(cache.get_or_compute(
+                key, lambda: compress_parallel(data, args.algo, args.block_size, args.workers)))
+    return 0
+
+
+def cmd_decompress(args) -> int:
+    with _open_input(args.input) as reader, _open_output(args.output) as writer:
+        magic = read_exact(reader, len(CONTAINER_MAGIC))
+        if magic != CONTAINER_MAGIC:
+            print("Lỗi: dữ liệu vào không phải định dạng nén được hỗ trợ", file=sys.stderr)
+            return 1
+        # Trả lại các byte magic đã đọc rồi nối tiếp phần còn lại của luồng
+        decompress_parallel_stream(ChunkReader(_iter_with_prefix(magic, reader)), writer, args.workers)
+    return 0
+
+
+def _iter_with_prefix(prefix: bytes, reader, chunk_size: int = 1 << 16):
+    yield prefix
+    while True:
+        chunk = reader.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def cmd_stats(args) -> int:
+    with _input_buffer(args.input) as data:
+        return _print_stats(data, args)
+
+
+def cmd_verify(args) -> int:
+    """Kiểm tra CRC32 của mọi khối trong file nén mà không giải mã."""
+    with _input_buffer(args.input) as data:
+        archive = BlockArchive(data)
+        damaged = archive.verify()
+    if damaged:
+        print(f"Hỏng {len(damaged)}/{len(archive)} khối: {', '.join(map(str, damaged))}")
+        return 1
+    print(f"OK: {len(archive)} khối, {archive.original_size} byte gốc")
+    return 0
+
+
+def cmd_serve(args) -> int:
+    """Chạy dịch vụ nén cục bộ (Encoding.service) tới khi nhấn Ctrl+C."""
+    # Nạp asyncio/ProcessPoolExecutor chỉ khi cần, để các lệnh khác khởi động nhanh
+    import asyncio
+
+    from Encoding.service import serve
+
+    # Tùy chọn không nhập thì dùng giá trị mặc định của Encoding.service
+    endpoint = {name: value for name, value in (("host", args.host), ("port", args.port)) if value is not None}
+    options = {"max_pending": args.max_pending} if args.max_pending is not None else {}
+    try:
+        asyncio.run(serve(args.socket, **endpoint, workers=args.workers, block_size=args.block_size, **options))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def _print_stats(data, args) -> int:
+    if data[:len(CONTAINER_MAGIC)] == CONTAINER_MAGIC:
+        archive = BlockArchive(data)
+        original = archive.original_size
+        print(f"Định dạng     : container, thuật toán {archive.algo}")
+        print(f"Số khối       : {len(archive)} (kích thước khối {archive.block_size} byte)")
+        print(f"Kích thước    : {len(data)} byte nén / {original} byte gốc")
+        if original:
+            print(f"Bit/byte gốc  : {len(data) * 8 / original:.4f}")
+        return 0
+
+    total = len(data)
+    print(f"Số byte       : {total}")
+    if total == 0:
+        return 0
+    cache = _open_cache(args)
+    if cache is not None:
+        from Encoding.cache import content_hash
+
+        digest = content_hash(data)
+
+    def statistics(kind, compute):
+        if cache is None:
+            return compute()
+        return cache.get_or_compute(cache.make_key(digest, kind), compute)
+
+    byte_stats = statistics("byte-stats", lambda: SymbolStatistics.from_bytes(data))
+    print(f"Số byte khác nhau: {byte_stats.alphabet_size}")
+    print(f"Entropy (byte): {byte_stats.entropy:.4f} bits/byte")
+    try:
+        text = str(data, "utf-8")
+    except UnicodeDecodeError:
+        return 0
+    char_stats = statistics("stats", lambda: SymbolStatistics.from_text(text))
+    print(f"Số ký tự      : {len(text)} ({char_stats.alphabet_size} ký tự khác nhau)")
+    print(f"Entropy (ký tự): {char_stats.entropy:.4f} bits/kh")
+    print(f"Giới hạn nén bậc 0: {math.ceil(char_stats.entropy_bound_bits() / 8)} byte")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m Encoding", description="Nén/giải nén dữ liệu không cần giao diện")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    # Tùy chọn đo hiệu năng dùng chung cho mọi lệnh; báo cáo in ra stderr để không lẫn vào dữ liệu ở stdout
+    profiling = argparse.ArgumentParser(add_help=False)
+    profiling.add_argument("--profile", action="store_true",
+                           help="in thời gian từng bước, bộ đếm và bộ nhớ đỉnh ra stderr (chỉ đo tiến trình chính)")
+    profiling.add_argument("--profile-out", help="ghi kết quả cProfile ra file .prof (xem bằng snakeviz/flameprof)")
+
+    compress = subparsers.add_parser("compress", help="nén dữ liệu", parents=[profiling])
+    compress.add_argument("input", nargs="?", default="-", help="file vào ('-' = stdin)")
+    compress.add_argument("-o", "--output", default="-", help="file ra ('-' = stdout)")
+    compress.add_argument("--algo", choices=sorted(BLOCK_CODECS), default="huffman")
+    compress.add_argument("--workers", type=int, default=1, help="số tiến trình nén song song")
+    compress.add_argument("--cache-dir", help="thư mục cache: nén lại cùng nội dung thì dùng kết quả đã lưu")
+    compress.add_argument("--block-size", type=parse_size, default=DEFAULT_BLOCK_SIZE,
+                          help="kích thước khối, ví dụ 256K, 1M")
+    compress.set_defaults(handler=cmd_compress)
+
+    decompress = subparsers.add_parser("decompress", help="giải nén dữ liệu", parents=[profiling])
+    decompress.add_argument("input", nargs="?", default="-", help="file vào ('-' = stdin)")
+    decompress.add_argument("-o", "--output", default="-", help="file ra ('-' = stdout)")
+    decompress.add_argument("--workers", type=int, default=1, help="số tiến trình giải nén song song")
+    decompress.set_defaults(handler=cmd_decompress)
+
+    stats = subparsers.add_parser("stats", help="thống kê entropy của dữ liệu hoặc thông tin file đã nén",
+                                  parents=[profiling])
+    stats.add_argument("input", nargs="?", default="-", help="file vào ('-' = stdin)")
+    stats.add_argument("--cache-dir", help="thư mục cache cho bảng tần suất")
+    stats.set_defaults(handler=cmd_stats)
+
+    verify = subparsers.add_parser("verify", help="kiểm tra CRC32 các khối của file nén (không giải nén)",
+                                   parents=[profiling])
+    verify.add_argument("input", nargs="?", default="-", help="file nén ('-' = stdin)")
+    verify.set_defaults(handler=cmd_verify)
+
+    service = subparsers.add_parser("serve", help="chạy dịch vụ nén cục bộ cho các tiến trình khác",
+                                    parents=[profiling])
+    service.add_argument("--socket", help="lắng nghe trên Unix socket này thay vì TCP")
+    service.add_argument("--host", help="địa chỉ TCP (mặc định 127.0.0.1, chỉ máy cục bộ)")
+    service.add_argument("--port", type=int, help="cổng TCP (mặc định 8765)")
+    service.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="số tiến trình tính toán")
+    service.add_argument("--max-pending", type=int,
+                         help="số yêu cầu đang xử lý tối đa (mặc định 256), vượt quá thì ngừng đọc dữ liệu từ client")
+    service.add_argument("--block-size", type=parse_size, default=DEFAULT_BLOCK_SIZE,
+                         help="kích thước khối của container trả về")
+    service.set_defaults(handler=cmd_serve)
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    if getattr(args, "block_size", 1) <= 0 or getattr(args, "workers", 1) <= 0:
+        print("Lỗi: --block-size và --workers phải lớn hơn 0", file=sys.stderr)
+        return 2
+    if getattr(args, "block_size", 1) > MAX_BLOCK_SIZE:
+        print(f"Lỗi: --block-size phải nhỏ hơn 4G (tối đa {MAX_BLOCK_SIZE} byte)", file=sys.stderr)
+        return 2
+    try:
+        if args.profile or args.profile_out:
+            return _run_profiled(args)
+        return args.handler(args)
+    except (OSError, ValueError) as error:
+        print(f"Lỗi: {error}", file=sys.stderr)
+        return 1
+
+
+def _run_profiled(args) -> int:
+    from Encoding.profiling import Profiler, format_report, write_cprofile
+
+    profiler = Profiler(trace_memory=args.profile, cprofile=args.profile_out is not None)
+    profiler.instrument_codecs()
+    with profiler, profiler.phase(args.command):
+        status = args.handler(args)
+    report = profiler.report()
+    if args.profile:
+        # Bảng cProfile rất dài nên chỉ ghi ra file (--profile-out), không in
+        print(format_report(dict(report, cprofile=None)), file=sys.stderr)
+    if args.profile_out:
+        write_cprofile(report, args.profile_out)
+    return status
@@ -0,0 +1,193 @@
+"""
+Định dạng container tự mô tả dùng chung cho nén luồng và nén song song.
+
+Mỗi khối được nén độc lập và dữ liệu nén của khối đã chứa đủ mô hình để tự giải mã
+(bảng độ dài mã Huffman, bảng tần suất số học, header của mã hóa thích nghi; luồng LZW tự kết thúc),
+nên container chỉ cần ghi thêm vị trí và checksum:
+
+    header : magic "ENCF", phiên bản (1 byte), mã thuật toán (1 byte), kích thước khối (u32),
+             CRC32 của các trường trên (u32)
+    khung  : độ dài gốc (u32), độ dài dữ liệu nén (u32), CRC32 dữ liệu nén (u32), CRC32 dữ liệu gốc (u32),
+             dữ liệu nén  -- mỗi khối một khung
+    kết thúc khung: một khung rỗng (toàn 0) để đọc tuần tự không cần chỉ mục
+    chỉ mục: mỗi khối (vị trí khung u64, độ dài gốc u32, độ dài nén u32, CRC32 nén u32, CRC32 gốc u32)
+    footer : vị trí chỉ mục (u64), số khối (u32), tổng độ dài gốc (u64), CRC32 của chỉ mục (u32), magic "ENCF"
+
+Tất cả số nguyên ở dạng big-endian. CRC32 của dữ liệu nén cho phép phát hiện khối hỏng
+mà không phải giải mã; CRC32 của dữ liệu gốc kiểm tra lại kết quả sau khi giải mã.
+"""
+import io
+import struct
+import zlib
+from collections import namedtuple
+
+from Encoding.buffers import read_exact
+
+CONTAINER_MAGIC = b"ENCF"
+# 2: bảng tần suất của khối mã hóa số học ghi dạng varint
+CONTAINER_VERSION = 2
+_HEADER_FIELDS = struct.Struct(">4sBBI")
+_HEADER_CRC = struct.Struct(">I")
+HEADER_SIZE = _HEADER_FIELDS.size + _HEADER_CRC.size
+_FRAME_HEADER = struct.Struct(">IIII")
+_INDEX_ENTRY = struct.Struct(">QIIII")
+_FOOTER = struct.Struct(">QIQI4s")
+# Kích thước khối và độ dài từng khối được ghi bằng u32
+MAX_BLOCK_SIZE = (1 << 32) - 1
+
+# Một khối đọc từ container: payload đã được kiểm tra CRC32, raw_crc dùng để kiểm tra sau khi giải mã
+Frame = namedtuple("Frame", "raw_length raw_crc payload")
+IndexEntry = namedtuple("IndexEntry", "offset raw_length payload_length payload_crc raw_crc")
+
+
+def pack_header(algo_id: int, block_size: int) -> bytes:
+    if not 0 < block_size <= MAX_BLOCK_SIZE:
+        raise ValueError(f"Kích thước khối phải nằm trong khoảng [1, {MAX_BLOCK_SIZE}]")
+    fields = _HEADER_FIELDS.pack(CONTAINER_MAGIC, CONTAINER_VERSION, algo_id, block_size)
+    return fields + _HEADER_CRC.pack(zlib.crc32(fields))
+
+
+def unpack_header(data: bytes) -> tuple:
+    """Kiểm tra header, trả về (mã thuật toán, kích thước khối)."""
+    if len(data) < HEADER_SIZE:
+        raise ValueError("Container quá ngắn")
+    fields = data[:_HEADER_FIELDS.size]
+    magic, version, algo_id, block_size = _HEADER_FIELDS.unpack(fields)
+    if magic != CONTAINER_MAGIC:
+        raise ValueError("Không phải container nén hợp lệ")
+    if version != CONTAINER_VERSION:
+        raise ValueError(f"Phiên bản container không được hỗ trợ: {version}")
+    (header_crc,) = _HEADER_CRC.unpack_from(data, _HEADER_FIELDS.size)
+    if zlib.crc32(fields) != header_crc:
+        raise ValueError("Header container bị hỏng (sai CRC32)")
+    return algo_id, block_size
+
+
+def iter_container(algo_id: int, block_size: int, encoded_blocks):
+    """
+    Sinh các mảnh bytes của container.
+    encoded_blocks: iterator các cặp (khối gốc, dữ liệu nén của khối) theo đúng thứ tự.
+    """
+    header = pack_header(algo_id, block_size)
+    yield header
+    offset = len(header)
+    index = []
+    original_length = 0
+    for block, payload in encoded_blocks:
+        entry = IndexEntry(offset, len(block), len(payload), zlib.crc32(payload), zlib.crc32(block))
+        index.append(entry)
+        yield _FRAME_HEADER.pack(*entry[1:])
+        yield payload
+        offset += _FRAME_HEADER.size + len(payload)
+        original_length += len(block)
+
+    yield _FRAME_HEADER.pack(0, 0, 0, 0)
+    raw_index = b"".join(_INDEX_ENTRY.pack(*entry) for entry in index)
+    yield raw_index
+    yield _FOOTER.pack(offset + _FRAME_HEADER.size, len(index), original_length, zlib.crc32(raw_index),
+                       CONTAINER_MAGIC)
+
+
+def _check_payload(block_index: int, payload: bytes, payload_crc: int):
+    if zlib.crc32(payload) != payload_crc:
+        raise ValueError(f"Khối {block_index} bị hỏng (sai CRC32 dữ liệu nén)")
+
+
+def check_block(block_index: int, block: bytes, raw_length: int, raw_crc: int):
+    """Kiểm tra khối sau khi giải mã với độ dài và CRC32 ghi trong container."""
+    if len(block) != raw_length:
+        raise ValueError(f"Khối {block_index} giải nén sai độ dài")
+    if zlib.crc32(block) != raw_crc:
+        raise ValueError(f"Khối {block_index} giải nén sai dữ liệu (sai CRC32)")
+
+
+def iter_frames(reader):
+    """
+    Đọc tuần tự các khung sau header (reader không cần seek được), dừng ở khung rỗng.
+    CRC32 của dữ liệu nén được kiểm tra trước khi trả về; cuối cùng chỉ mục và footer
+    được đối chiếu với các khung đã đọc.
+    """
+    count = 0
+    original_length = 0
+    while True:
+        frame = read_exact(reader, _FRAME_HEADER.size)
+        if len(frame) < _FRAME_HEADER.size:
+            raise ValueError("Container bị cắt cụt")
+        raw_length, payload_length, payload_crc, raw_crc = _FRAME_HEADER.unpack(frame)
+        if raw_length == 0 and payload_length == 0:
+            break
+        payload = read_exact(reader, payload_length)
+        if len(payload) < payload_length:
+            raise ValueError("Container bị cắt cụt")
+        _check_payload(count, payload, payload_crc)
+        yield Frame(raw_length, raw_crc, payload)
+        count += 1
+        original_length += raw_length
+
+    raw_index = read_exact(reader, count * _INDEX_ENTRY.size)
+    footer = read_exact(reader, _FOOTER.size)
+    if len(footer) < _FOOTER.size:
+        raise ValueError("Container thiếu footer/chỉ mục")
+    _, block_count, total_length, index_crc, magic = _FOOTER.unpack(footer)
+    if magic != CONTAINER_MAGIC or zlib.crc32(raw_index) != index_crc:
+        raise ValueError("Chỉ mục/footer của container bị hỏng")
+    if block_count != count or total_length != original_length:
+        raise ValueError("Chỉ mục không khớp với các khối trong container")
+
+
+class ContainerReader:
+    """
+    Truy cập ngẫu nhiên vào container: đọc header, footer và chỉ mục, sau đó đọc riêng từng khối.
+    source là bytes/bytearray/memoryview/mmap hoặc file nhị phân seek được.
+    """
+
+    def __init__(self, source):
+        self._source = source
+        self._buffer = None if hasattr(source, "read") else memoryview(source)
+
+        self.algo_id, self.block_size = unpack_header(self._read_at(0, HEADER_SIZE))
+        size = self._size()
+        if size < HEADER_SIZE + _FRAME_HEADER.size + _FOOTER.size:
+            raise ValueError("Container bị cắt cụt")
+        footer = self._read_at(size - _FOOTER.size, _FOOTER.size)
+        index_offset, block_count, self.original_size, index_crc, magic = _FOOTER.unpack(footer)
+        if magic != CONTAINER_MAGIC:
+            raise ValueError("Container thiếu footer/chỉ mục")
+        raw_index = self._read_at(index_offset, block_count * _INDEX_ENTRY.size)
+        if len(raw_index) != block_count * _INDEX_ENTRY.size or zlib.crc32(raw_index) != index_crc:
+            raise ValueError("Chỉ mục của container bị hỏng")
+        self.index = [IndexEntry(*entry) for entry in _INDEX_ENTRY.iter_unpack(raw_index)]
+
+    def _size(self) -> int:
+        if self._buffer is not None:
+            return len(self._buffer)
+        return self._source.seek(0, io.SEEK_END)
+
+    def _read_at(self, offset: int, size: int) -> bytes:
+        if self._buffer is not None:
+            return bytes(self._buffer[offset:offset + size])
+        self._source.seek(offset)
+        return read_exact(self._source, size)
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def read_frame(self, block_index: int) -> Frame:
+        """Đọc khung của một khối (chỉ một lần seek) và kiểm tra CRC32 với chỉ mục."""
+        entry = self.index[block_index]
+        data = self._read_at(entry.offset, _FRAME_HEADER.size + entry.payload_length)
+        if len(data) < _FRAME_HEADER.size or _FRAME_HEADER.unpack_from(data) != tuple(entry[1:]):
+            raise ValueError(f"Khối {block_index} bị hỏng (header khung không khớp chỉ mục)")
+        payload = data[_FRAME_HEADER.size:]
+        _check_payload(block_index, payload, entry.payload_crc)
+        return Frame(entry.raw_length, entry.raw_crc, payload)
+
+    def verify(self) -> list:
+        """Kiểm tra CRC32 của mọi khối mà không giải mã; trả về danh sách chỉ số các khối hỏng."""
+        damaged = []
+        for block_index in range(len(self.index)):
+            try:
+                self.read_frame(block_index)
+            except ValueError:
+                damaged.append(block_index)
+        return damaged
@@ -1,6 +1,70 @@
 import heapq
-from collections import Counter
-import math
+import struct
+from operator import itemgetter
+
+from Encoding.buffers import byte_view
+from Encoding.symbolStatistics import SymbolStatistics, optional_numpy
+from Encoding.tokenizer import tokenize
+
+# Định dạng gói dữ liệu Huffman (big-endian):
+#   header : magic "HF", chế độ ký hiệu, số ký tự (byte) gốc, kích thước bảng chữ cái, số bit đệm
+#   bảng   : mỗi ký hiệu 1 số u32 = (mã Unicode hoặc giá trị byte << 8) | độ dài mã, theo thứ tự chuẩn tắc;
+#            chế độ token: mỗi token là (độ dài mã u8, số byte UTF-8 u32) rồi chuỗi UTF-8 của token
+#   payload: các bit mã đã đóng gói, byte cuối được đệm thêm bit 0
+HUFFMAN_MAGIC = b"HF"
+# Chế độ ký hiệu: ký tự Unicode (encode), byte 0..255 (encode_bytes) hoặc token (encode khi tokenize=True)
+MODE_TEXT = 0
+MODE_BYTES = 1
+MODE_TOKENS = 2
+_HEADER = struct.Struct(">2sBQIB")
+_TOKEN_ENTRY = struct.Struct(">BI")
+# Số ký tự được ghép bit mỗi lần khi đóng gói
+PACK_CHUNK = 1 << 16
+# Độ dài mã được ghi bằng 1 byte trong bảng của gói dữ liệu
+MAX_CODE_LENGTH_LIMIT = 255
+# Đóng gói bằng NumPy: văn bản từ ngưỡng này trở lên, xử lý từng khối NUMPY_PACK_CHUNK ký tự,
+# mỗi mã (cộng độ lệch bit trong byte) phải vừa một từ 64 bit
+NUMPY_PACK_MIN_LENGTH = 4096
+NUMPY_PACK_CHUNK = 1 << 15
+NUMPY_MAX_CODE_LENGTH = 57
+
+
+def _symbol_value(symbol) -> int:
+    """Giá trị số của ký hiệu: mã Unicode của ký tự, hoặc chính giá trị byte."""
+    return symbol if isinstance(symbol, int) else ord(symbol)
+
+
+def package_merge_lengths(freq_table: dict, max_length: int) -> dict:
+    """
+    Độ dài mã tiền tố tối ưu với ràng buộc độ dài <= max_length (thuật toán package-merge).
+
+    Mỗi mục là (trọng số, nội dung): lá có nội dung là chỉ số ký tự, gói có nội dung là cặp
+    hai mục của mức trước. Lặp max_length - 1 lần: ghép từng cặp mục liên tiếp thành gói rồi
+    trộn với danh sách lá. Độ dài mã của một ký tự = số lần lá của nó xuất hiện trong
+    2n - 2 mục nhỏ nhất của danh sách cuối cùng.
+    """
+    symbols = sorted(freq_table, key=lambda symbol: (freq_table[symbol], symbol))
+    n = len(symbols)
+    if n <= 1:
+        return {symbol: 1 for symbol in symbols}
+    if n > 1 << max_length:
+        raise ValueError(f"Không thể mã hóa {n} ký hiệu với độ dài mã tối đa {max_length} bit")
+
+    leaves = [(freq_table[symbol], index) for index, symbol in enumerate(symbols)]
+    items = leaves
+    for _ in range(max_length - 1):
+        packages = [(items[k][0] + items[k + 1][0], (items[k], items[k + 1])) for k in range(0, len(items) - 1, 2)]
+        items = list(heapq.merge(leaves, packages, key=itemgetter(0)))
+
+    lengths = [0] * n
+    stack = items[:2 * n - 2]
+    while stack:
+        _, content = stack.pop()
+        if isinstance(content, int):
+            lengths[content] += 1
+        else:
+            stack.extend(content)
+    return dict(zip(symbols, lengths))
 
 class HuffmanNode:
     def __init__(self, freq, char=None, left=None, right=None):
@@ -13,13 +77,31 @@ class HuffmanNode:
         return self.freq < other.freq
 
 class HuffmanEncoding:
-    def __init__(self):
+    def __init__(self, max_code_length: int = None, tokenize: bool = False):
+        """
+        max_code_length: giới hạn độ dài mã (bit), ví dụ 15; None = mã Huffman không giới hạn.
+        tokenize: True thì encode() mã hóa từng token (từ/âm tiết, khoảng trắng, dấu câu) thay vì từng ký tự.
+        """
+        if max_code_length is not None and not 1 <= max_code_length <= MAX_CODE_LENGTH_LIMIT:
+            raise ValueError(f"max_code_length phải nằm trong khoảng [1, {MAX_CODE_LENGTH_LIMIT}]")
+        self.max_code_length = max_code_length
+        self.tokenize = tokenize
         self.codes = {}
         self.reverse_codes = {}
         self.freq_table = {}
+        self.code_lengths = {}
+        # Dạng chuẩn tắc (canonical): ký tự theo thứ tự (độ dài mã, ký tự) và giá trị mã số nguyên
+        self.canonical_symbols = []
+        self.code_values = {}
+        # Cây giải mã dạng mảng + bảng chuyển trạng thái theo từng byte (xây dần khi giải mã)
+        self._children = ([0], [0])
+        self._byte_table = []
 
-    def build_frequency_table(self, text: str) -> dict[str, int]:
-        self.freq_table = Counter(text)
+    def build_frequency_table(self, text: str, statistics: SymbolStatistics = None) -> dict[str, int]:
+        """Lấy bảng tần suất từ thống kê dùng chung (đếm văn bản nếu chưa có)."""
+        if statistics is None:
+            statistics = SymbolStatistics.from_text(text)
+        self.freq_table = statistics.counts
         return self.freq_table
 
     def build_huffman_tree(self, freq_table: dict[str, int]) -> HuffmanNode:
@@ -34,37 +116,309 @@ class HuffmanEncoding:
 
         return priority_queue[0] if priority_queue else None
 
-    def build_codes_helper(self, node: HuffmanNode, current_code: str):
-        if node is None:
-            return
-        if node.char is not None:
-            self.codes[node.char] = current_code
-            self.reverse_codes[current_code] = node.char
-            return
-        self.build_codes_helper(node.left, current_code + "0")
-        self.build_codes_helper(node.right, current_code + "1")
+    def build_codes_helper(self, node: HuffmanNode, depth: int):
+        """
+        Ghi lại độ dài mã (độ sâu của lá) cho từng ký tự trong cây.
+        Duyệt bằng ngăn xếp thay vì đệ quy nên cây rất sâu không chạm giới hạn đệ quy.
+        """
+        stack = [(node, depth)]
+        while stack:
+            node, depth = stack.pop()
+            if node is None:
+                continue
+            if node.char is not None:
+                self.code_lengths[node.char] = depth
+            else:
+                stack.append((node.right, depth + 1))
+                stack.append((node.left, depth + 1))
 
     def build_codes(self, tree_root: HuffmanNode):
+        """
+        Sinh mã Huffman chuẩn tắc (canonical) từ độ dài mã của cây:
+        ký tự được sắp theo (độ dài, ký tự), mã sau = (mã trước + 1) << (chênh lệch độ dài).
+        Chỉ cần độ dài mã là dựng lại được toàn bộ bảng mã.
+        """
+        self.code_lengths = {}
+        if self.max_code_length is not None:
+            # Giới hạn độ dài mã: tính thẳng từ bảng tần suất bằng package-merge, không cần cây
+            self.assign_canonical_codes(package_merge_lengths(self.freq_table, self.max_code_length))
+            return
+        if tree_root is not None and tree_root.char is not None:
+            # Chỉ có một ký tự: vẫn cần 1 bit cho mỗi ký tự
+            self.code_lengths[tree_root.char] = 1
+        else:
+            self.build_codes_helper(tree_root, 0)
+            if self.code_lengths and max(self.code_lengths.values()) > MAX_CODE_LENGTH_LIMIT:
+                # Cây quá sâu so với 1 byte độ dài trong bảng mã: giới hạn lại bằng package-merge
+                self.code_lengths = package_merge_lengths(self.freq_table, MAX_CODE_LENGTH_LIMIT)
+        self.assign_canonical_codes(self.code_lengths)
+
+    def assign_canonical_codes(self, code_lengths: dict):
+        self.code_lengths = code_lengths
         self.codes = {}
         self.reverse_codes = {}
-        self.build_codes_helper(tree_root, "")
+        self.code_values = {}
+        self.canonical_symbols = sorted(code_lengths, key=lambda ch: (code_lengths[ch], ch))
+
+        code = 0
+        prev_length = 0
+        for ch in self.canonical_symbols:
+            length = code_lengths[ch]
+            code <<= length - prev_length
+            self.code_values[ch] = code
+            self.codes[ch] = format(code, f"0{length}b")
+            self.reverse_codes[self.codes[ch]] = ch
+            code += 1
+            prev_length = length
+
+        self._build_decode_tree()
+
+    def _build_decode_tree(self):
+        """
+        Dựng cây giải mã dạng hai mảng con trái/phải.
+        Nút trong đánh số >= 0 (0 là gốc), lá lưu ~chỉ_số_ký_tự (số âm), 0 ở vị trí con nghĩa là rỗng.
+        """
+        left, right = [0], [0]
+        for index, ch in enumerate(self.canonical_symbols):
+            code = self.code_values[ch]
+            node = 0
+            for shift in range(self.code_lengths[ch] - 1, 0, -1):
+                children = right if (code >> shift) & 1 else left
+                if children[node] == 0:
+                    children[node] = len(left)
+                    left.append(0)
+                    right.append(0)
+                node = children[node]
+            children = right if code & 1 else left
+            children[node] = ~index
+        self._children = (left, right)
+        self._byte_table = [None] * (len(left) << 8)
+
+    def _walk_bits(self, node: int, value: int, nbits: int, output: list) -> int:
+        """Đi trên cây giải mã theo nbits bit cao->thấp của value, trả về nút dừng."""
+        left, right = self._children
+        symbols = self.canonical_symbols
+        for shift in range(nbits - 1, -1, -1):
+            node = (right if (value >> shift) & 1 else left)[node]
+            if node < 0:
+                output.append(symbols[~node])
+                node = 0
+        return node
 
-    def encode(self, text: str) -> str:
-        self.build_frequency_table(text)
-        tree_root = self.build_huffman_tree(self.freq_table)
+    def _byte_transition(self, key: int):
+        """
+        Tính (chuỗi ký tự giải mã được, trạng thái kế tiếp) khi đọc trọn 1 byte
+        từ trạng thái key >> 8. Kết quả được lưu lại trong bảng để tra cứu lần sau.
+        """
+        output = []
+        node = self._walk_bits(key >> 8, key & 0xFF, 8, output)
+        entry = ("".join(output), node << 8)
+        self._byte_table[key] = entry
+        return entry
+
+    def _decode_packed(self, data: bytes, total_bits: int) -> str:
+        """
+        Giải mã luồng bit đã đóng gói: mỗi lần tra bảng tiêu thụ trọn 8 bit,
+        mã dài hơn 8 bit được nối tiếp qua trạng thái (nút cây) giữa các byte.
+        """
+        full_bytes = total_bits // 8
+        table = self._byte_table
+        transition = self._byte_transition
+        decoded_chunks = []
+        append = decoded_chunks.append
+        state = 0
+        for byte in memoryview(data)[:full_bytes]:
+            chunk, state = table[state | byte] or transition(state | byte)
+            append(chunk)
+
+        tail_bits = total_bits - full_bytes * 8
+        if tail_bits:
+            tail = []
+            self._walk_bits(state >> 8, data[full_bytes] >> (8 - tail_bits), tail_bits, tail)
+            append("".join(tail))
+        return "".join(decoded_chunks)
+
+    def _pack_bits(self, text) -> tuple[bytearray, int]:
+        """
+        Ghi mã của từng ký tự thành các bit liền nhau trong bytearray, trả về (bytes, số bit đệm).
+        Văn bản được xử lý theo từng khối PACK_CHUNK ký tự nên chuỗi bit tạm thời luôn nhỏ.
+        text là str hoặc memoryview byte (lát cắt memoryview không sao chép dữ liệu).
+        """
+        get_code = self.codes.__getitem__
+        output = bytearray()
+        carry = ""
+        for start in range(0, len(text), PACK_CHUNK):
+            bits = carry + "".join(map(get_code, text[start:start + PACK_CHUNK]))
+            full = len(bits) - len(bits) % 8
+            if full:
+                output += int(bits[:full], 2).to_bytes(full // 8, "big")
+            carry = bits[full:]
+        padding = -len(carry) % 8
+        if carry:
+            output.append(int(carry, 2) << padding)
+        return output, padding
+
+    def _pack_bits_numpy(self, np, text) -> tuple[bytearray, int]:
+        """
+        Bản vector hóa của _pack_bits (cùng kết quả), không có vòng lặp Python theo từng ký tự.
+
+        Văn bản -> mảng mã Unicode (uint32) -> tra mảng giá trị mã / độ dài mã -> vị trí bit bắt đầu
+        của từng mã bằng cumsum. Mã có độ lệch bit b trong byte đầu tiên được dịch vào cửa sổ
+        window_bytes byte; byte thứ k của cửa sổ được cộng dồn vào byte đích bằng np.bincount
+        (các mã không chồng bit lên nhau nên phép cộng chính là phép OR).
+        Khối nhỏ (NUMPY_PACK_CHUNK) giữ các mảng tạm trong cache CPU.
+        """
+        max_length = max(self.code_lengths.values())
+        window_bytes = (max_length + 7 + 7) // 8
+        window_bits = 8 * window_bytes
+        word = np.uint32 if window_bits <= 32 else np.uint64
+
+        symbol_points = np.array([_symbol_value(ch) for ch in self.canonical_symbols], dtype=np.int64)
+        symbol_codes = np.array([self.code_values[ch] for ch in self.canonical_symbols], dtype=word)
+        symbol_lengths = np.array([self.code_lengths[ch] for ch in self.canonical_symbols], dtype=np.uint32)
+        dense = int(symbol_points.max()) < 1 << 16
+        if dense:
+            # Bảng tra trực tiếp theo mã Unicode
+            code_table = np.zeros(1 << 16, dtype=word)
+            length_table = np.zeros(1 << 16, dtype=np.uint32)
+            code_table[symbol_points] = symbol_codes
+            length_table[symbol_points] = symbol_lengths
+        else:
+            order = np.argsort(symbol_points)
+            symbol_points = symbol_points[order]
+            code_table = symbol_codes[order]
+            length_table = symbol_lengths[order]
+        byte_shifts = [word(window_bits - 8 - 8 * k) for k in range(window_bytes)]
+        byte_mask = word(0xFF)
+
+        total_bits = sum(self.freq_table[ch] * self.code_lengths[ch] for ch in self.canonical_symbols)
+        output = np.zeros((total_bits + 7) // 8 + window_bytes, dtype=np.uint8)
+        # Dữ liệu byte được đọc thẳng từ buffer gốc, văn bản thì đổi từng khối sang mã Unicode
+        byte_points = None if isinstance(text, str) else np.frombuffer(text, dtype=np.uint8)
+        bit_base = 0
+        for start in range(0, len(text), NUMPY_PACK_CHUNK):
+            if byte_points is not None:
+                points = byte_points[start:start + NUMPY_PACK_CHUNK]
+            else:
+                chunk = text[start:start + NUMPY_PACK_CHUNK].encode("utf-32-le", "surrogatepass")
+                points = np.frombuffer(chunk, dtype="<u4")
+            index = points if dense else np.searchsorted(symbol_points, points)
+            codes = code_table[index]
+            lengths = length_table[index]
+
+            bit_ends = np.cumsum(lengths, dtype=np.int64)
+            bit_starts = bit_ends - lengths
+            bit_starts += bit_base
+            bit_base += int(bit_ends[-1])
+            # Căn mã về phía bit cao của cửa sổ, ngay sau độ lệch bit trong byte đầu
+            shifts = window_bits - (bit_starts & 7).astype(np.uint32) - lengths
+            windows = codes << shifts.astype(word, copy=False)
+
+            first_bytes = bit_starts >> 3
+            base = int(first_bytes[0])
+            local = first_bytes - base
+            span = int(local[-1]) + window_bytes
+            merged = np.zeros(span, dtype=np.float64)
+            for k, shift in enumerate(byte_shifts):
+                merged[k:] += np.bincount(local, weights=(windows >> shift) & byte_mask, minlength=span)[:span - k]
+            output[base:base + span] |= merged.astype(np.uint8)
+
+        return bytearray(output[:(total_bits + 7) // 8]), -total_bits % 8
+
+    def _encode_symbols(self, symbols, mode: int, statistics: SymbolStatistics, length: int = None) -> bytes:
+        """
+        Dựng mã từ bảng tần suất trong statistics rồi đóng gói symbols
+        (str, memoryview byte hoặc danh sách token). length: số ký tự gốc (mặc định len(symbols)).
+        """
+        self.freq_table = statistics.counts
+        tree_root = self.build_huffman_tree(self.freq_table) if self.max_code_length is None else None
         self.build_codes(tree_root)
-        encoded_text = "".join(self.codes[ch] for ch in text)
-        return encoded_text
-
-    def decode(self, encoded_text: str) -> str:
-        current_code = ""
-        decoded_text = []
-        for bit in encoded_text:
-            current_code += bit
-            if current_code in self.reverse_codes:
-                decoded_text.append(self.reverse_codes[current_code])
-                current_code = ""
-        return "".join(decoded_text)
+        np = optional_numpy() if mode != MODE_TOKENS and len(symbols) >= NUMPY_PACK_MIN_LENGTH else None
+        if np is not None and max(self.code_lengths.values()) <= NUMPY_MAX_CODE_LENGTH:
+            payload, padding = self._pack_bits_numpy(np, symbols)
+        else:
+            payload, padding = self._pack_bits(symbols)
+
+        header = _HEADER.pack(HUFFMAN_MAGIC, mode, len(symbols) if length is None else length,
+                              len(self.canonical_symbols), padding)
+        return header + self._pack_table(mode) + payload
+
+    def _pack_table(self, mode: int) -> bytes:
+        """Bảng độ dài mã theo thứ tự chuẩn tắc (đủ để dựng lại toàn bộ bảng mã)."""
+        if mode == MODE_TOKENS:
+            parts = []
+            for token in self.canonical_symbols:
+                raw = token.encode("utf-8", "surrogatepass")
+                parts.append(_TOKEN_ENTRY.pack(self.code_lengths[token], len(raw)))
+                parts.append(raw)
+            return b"".join(parts)
+        table = [(_symbol_value(ch) << 8) | self.code_lengths[ch] for ch in self.canonical_symbols]
+        return struct.pack(f">{len(table)}I", *table)
+
+    @staticmethod
+    def _unpack_table(mode: int, data, offset: int, alphabet_size: int) -> tuple[dict, int]:
+        """Đọc bảng do _pack_table() ghi, trả về (ký hiệu -> độ dài mã, vị trí ngay sau bảng)."""
+        if mode == MODE_TOKENS:
+            code_lengths = {}
+            for _ in range(alphabet_size):
+                length, size = _TOKEN_ENTRY.unpack_from(data, offset)
+                offset += _TOKEN_ENTRY.size
+                code_lengths[str(data[offset:offset + size], "utf-8", "surrogatepass")] = length
+                offset += size
+            return code_lengths, offset
+        table = struct.unpack_from(f">{alphabet_size}I", data, offset)
+        # Ký hiệu byte được giải mã thành ký tự latin-1 cùng giá trị rồi đổi lại thành bytes
+        return {chr(entry >> 8): entry & 0xFF for entry in table}, offset + 4 * alphabet_size
+
+    def encode(self, text: str, statistics: SymbolStatistics = None) -> bytes:
+        """
+        Mã hóa văn bản thành gói dữ liệu tự mô tả: header + bảng độ dài mã chuẩn tắc + bit đã đóng gói.
+        Gói này có thể lưu lại và giải mã bằng một đối tượng HuffmanEncoding bất kỳ.
+        statistics: thống kê đã tính sẵn của các ký hiệu được mã hóa (ký tự, hoặc token khi tokenize=True).
+        """
+        if self.tokenize:
+            tokens = tokenize(text)
+            if statistics is None:
+                statistics = SymbolStatistics.from_tokens(tokens)
+            return self._encode_symbols(tokens, MODE_TOKENS, statistics, len(text))
+        if statistics is None:
+            statistics = SymbolStatistics.from_text(text)
+        return self._encode_symbols(text, MODE_TEXT, statistics)
+
+    def encode_bytes(self, data, statistics: SymbolStatistics = None) -> bytes:
+        """
+        Mã hóa dữ liệu nhị phân (bytes, bytearray, memoryview, mmap...) với ký hiệu là từng byte.
+        Dữ liệu được đọc qua memoryview nên không bị sao chép.
+        """
+        view = byte_view(data)
+        if statistics is None:
+            statistics = SymbolStatistics.from_bytes(view)
+        return self._encode_symbols(view, MODE_BYTES, statistics)
+
+    def _decode_container(self, encoded_data, expected_mode: int) -> str:
+        magic, mode, count, alphabet_size, padding = _HEADER.unpack_from(encoded_data)
+        if magic != HUFFMAN_MAGIC or mode not in (MODE_TEXT, MODE_BYTES, MODE_TOKENS):
+            raise ValueError("Dữ liệu không phải gói mã Huffman hợp lệ")
+        if (mode == MODE_BYTES) != (expected_mode == MODE_BYTES):
+            raise ValueError("Gói Huffman chứa dữ liệu byte, hãy dùng decode_bytes()" if mode == MODE_BYTES
+                             else "Gói Huffman chứa văn bản, hãy dùng decode()")
+
+        code_lengths, offset = self._unpack_table(mode, encoded_data, _HEADER.size, alphabet_size)
+        self.assign_canonical_codes(code_lengths)
+
+        payload = memoryview(encoded_data)[offset:]
+        decoded_text = self._decode_packed(payload, len(payload) * 8 - padding)
+        if len(decoded_text) != count:
+            raise ValueError("Dữ liệu Huffman bị hỏng: số ký tự giải mã không khớp")
+        return decoded_text
+
+    def decode(self, encoded_data: bytes) -> str:
+        """Giải mã gói dữ liệu do encode() tạo ra (bảng mã được dựng lại từ header, theo ký tự hoặc token)."""
+        return self._decode_container(encoded_data, MODE_TEXT)
+
+    def decode_bytes(self, encoded_data: bytes) -> bytes:
+        """Giải mã gói dữ liệu do encode_bytes() tạo ra."""
+        return self._decode_container(encoded_data, MODE_BYTES).encode("latin-1")
 
     def get_codes(self) -> dict[str, str]:
         return self.codes
@@ -84,23 +438,25 @@ class HuffmanEncoding:
             l_i = len(self.codes.get(ch, ""))
             avg_length += p_i * l_i
         return avg_length
+
+    def bits_per_character(self, length: int) -> float:
+        """
+        Số bit mã trung bình trên mỗi ký tự gốc (length = số ký tự của văn bản).
+        Bằng average_code_length() khi mã hóa theo ký tự; ở chế độ token mỗi ký hiệu gồm nhiều ký tự.
+        """
+        if length == 0:
+            return 0.0
+        return self.payload_bits() / length
+
+    def payload_bits(self) -> int:
+        """Số bit mã của dữ liệu ở lần mã hóa gần nhất (không tính header, bảng độ dài mã và bit đệm)."""
+        return sum(freq * self.code_lengths[symbol] for symbol, freq in self.freq_table.items())
     
-    def calculate_entropy(self, text):
+    def calculate_entropy(self, text, statistics: SymbolStatistics = None):
         """Tính Entropy Shannon (H) của văn bản."""
-        total_len = len(text)
-        frequency = Counter(text)
-        entropy = 0
-        
-        for char, count in frequency.most_common(5):
-            prob = count / total_len
-            entropy -= prob * math.log2(prob)
-            
-        # Tính tiếp entropy cho các ký tự còn lại (không in ra để gọn)
-        for char, count in frequency.most_common()[5:]:
-            prob = count / total_len
-            entropy -= prob * math.log2(prob)
-            
-        return entropy
+        if statistics is None:
+            statistics = SymbolStatistics.from_text(text)
+        return statistics.entropy
     
     def display(self, text: str): 
         print(f"Độ dài chuỗi: {len(text)} kí tự")
@@ -109,7 +465,7 @@ class HuffmanEncoding:
         print(f"Entropy: {entropy} bits/kh")
 
         encoder = self.encode(text)
-        print(f"Mã hóa: {encoder}")
+        print(f"Mã hóa ({len(encoder)} bytes): {encoder.hex()}")
 
         average_length = self.average_code_length()
         print(f"Độ dài mã trung bình: {average_length}")
@@ -1,112 +1,427 @@
-import math
-from collections import Counter
+import struct
+import zlib
+
+from Encoding.buffers import byte_view
+from Encoding.symbolStatistics import SymbolStatistics
+
+# Mã đặc biệt của luồng LZW (kiểu Unix compress / GIF):
+# CLEAR_CODE xóa từ điển về trạng thái ban đầu, EOI_CODE đánh dấu kết thúc luồng.
+CLEAR_CODE = 256
+EOI_CODE = 257
+FIRST_CODE = 258
+MIN_CODE_BITS = 9
+# Khi từ điển đã đầy, cứ sau ngần này byte đầu vào thì kiểm tra lại tỉ lệ nén
+RATIO_CHECK_INTERVAL = 10000
+
+# Luồng nén bằng từ điển huấn luyện bắt đầu bằng CLEAR_CODE (9 bit) rồi id của từ điển (32 bit).
+# Luồng thường không bao giờ mở đầu bằng CLEAR_CODE nên bộ giải mã phân biệt được hai loại.
+DICTIONARY_ID_BITS = 32
+_DICTIONARY_PREFIX_BYTES = (MIN_CODE_BITS + DICTIONARY_ID_BITS + 7) // 8
+
+# Từ điển huấn luyện sẵn (xem LZWDictionary): magic "LZWD", max_bits, số mục, rồi mỗi mục một u32
+# = (mã tiền tố << 8) | byte kế tiếp, theo thứ tự mã tăng dần bắt đầu từ FIRST_CODE
+DICTIONARY_MAGIC = b"LZWD"
+_DICTIONARY_HEADER = struct.Struct(">4sBI")
+# Mặc định từ điển huấn luyện lấp đầy mã 12 bit
+DEFAULT_TRAINED_ENTRIES = (1 << 12) - FIRST_CODE
+# Số mục tối đa sinh ra khi duyệt corpus huấn luyện (giới hạn bộ nhớ)
+MAX_TRAINING_ENTRIES = 1 << 20
+
+
+class BitWriter:
+    """Ghi các mã có độ rộng thay đổi vào bytearray (bit thấp trước, như compress/GIF)."""
 
-class LZWEncoding:
     def __init__(self):
+        self.output = bytearray()
+        self._acc = 0
+        self._nbits = 0
+
+    def write(self, code: int, nbits: int):
+        self._acc |= code << self._nbits
+        self._nbits += nbits
+        while self._nbits >= 8:
+            self.output.append(self._acc & 0xFF)
+            self._acc >>= 8
+            self._nbits -= 8
+
+    def flush(self) -> bytes:
+        if self._nbits:
+            self.output.append(self._acc & 0xFF)
+            self._acc = 0
+            self._nbits = 0
+        return bytes(self.output)
+
+
+def _as_bytes(sample):
+    return sample.encode("utf-8") if isinstance(sample, str) else sample
+
+
+class LZWDictionary:
+    """
+    Từ điển LZW huấn luyện sẵn từ một corpus mẫu (tương tự từ điển của zstd) để nén các thông điệp ngắn:
+    bộ mã hóa và giải mã bắt đầu từ các mục đã học thay vì chỉ có 256 byte đơn.
+
+    Mọi cấu trúc dùng khi mã hóa/giải mã (bảng tra khóa -> mã, chuỗi của từng mục) được dựng một lần
+    trong __init__ và chỉ được sao chép nông ở mỗi lần gọi. id (CRC32 của to_bytes()) được ghi vào đầu
+    luồng nén; giải mã báo lỗi nếu không truyền từ điển hoặc truyền từ điển khác với lúc mã hóa.
+    """
+
+    def __init__(self, entries: list, max_bits: int = 16):
+        """
+        Args:
+            entries: các khóa (mã tiền tố << 8) | byte theo thứ tự mã, mục thứ i có mã FIRST_CODE + i;
+                mã tiền tố luôn nhỏ hơn mã của chính mục đó.
+            max_bits: độ rộng mã tối đa của bộ mã LZW dùng từ điển này.
+        """
+        if FIRST_CODE + len(entries) > 1 << max_bits:
+            raise ValueError(f"Từ điển có {len(entries)} mục, vượt quá giới hạn của mã {max_bits} bit")
+        self.entries = list(entries)
+        self.max_bits = max_bits
+        self.codes = {}
+        # Chuỗi của mọi mục nối liền nhau; mục i nằm ở preamble[offsets[i]:offsets[i] + lengths[i]]
+        self.offsets = []
+        self.lengths = []
+        preamble = bytearray()
+        for index, key in enumerate(self.entries):
+            prefix = key >> 8
+            code = FIRST_CODE + index
+            if prefix >= code or CLEAR_CODE <= prefix < FIRST_CODE:
+                raise ValueError("Từ điển LZW không hợp lệ")
+            self.codes[key] = code
+            self.offsets.append(len(preamble))
+            if prefix < CLEAR_CODE:
+                preamble.append(prefix)
+            else:
+                start = self.offsets[prefix - FIRST_CODE]
+                preamble += preamble[start:start + self.lengths[prefix - FIRST_CODE]]
+            preamble.append(key & 0xFF)
+            self.lengths.append(len(preamble) - self.offsets[-1])
+        self.preamble = bytes(preamble)
+        self.id = zlib.crc32(self.to_bytes())
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    @property
+    def first_free_code(self) -> int:
+        return FIRST_CODE + len(self.entries)
+
+    @classmethod
+    def train(cls, samples, max_entries: int = DEFAULT_TRAINED_ENTRIES, max_bits: int = 16) -> "LZWDictionary":
+        """
+        Học từ điển từ các mẫu (str hoặc bytes-like), ví dụ các tin nhắn tiêu biểu.
+
+        Chạy LZW trên toàn bộ mẫu với một từ điển không bị xóa, đếm số lần mỗi mục được phát ra,
+        rồi giữ max_entries mục tiết kiệm nhiều byte nhất (số lần dùng * độ dài) cùng mọi tiền tố của chúng.
+        """
+        max_entries = min(max_entries, (1 << max_bits) - FIRST_CODE - 1)
+        codes = {}
+        keys = []
+        lengths = []
+        uses = []
+        for sample in samples:
+            w = -1
+            for byte_val in byte_view(_as_bytes(sample)):
+                if w < 0:
+                    w = byte_val
+                    continue
+                key = (w << 8) | byte_val
+                code = codes.get(key)
+                if code is not None:
+                    w = code
+                    continue
+                if w >= FIRST_CODE:
+                    uses[w - FIRST_CODE] += 1
+                if len(keys) < MAX_TRAINING_ENTRIES:
+                    codes[key] = FIRST_CODE + len(keys)
+                    keys.append(key)
+                    lengths.append(2 if w < CLEAR_CODE else lengths[w - FIRST_CODE] + 1)
+                    uses.append(0)
+                w = byte_val
+            if w >= FIRST_CODE:
+                uses[w - FIRST_CODE] += 1
+
+        selected = set()
+        for index in sorted(range(len(keys)), key=lambda i: -uses[i] * lengths[i]):
+            if not uses[index] or len(selected) >= max_entries:
+                break
+            # Mục được chọn kéo theo mọi tiền tố chưa có của nó
+            chain = []
+            while index >= 0 and index not in selected:
+                chain.append(index)
+                index = (keys[index] >> 8) - FIRST_CODE
+            if len(selected) + len(chain) <= max_entries:
+                selected.update(chain)
+
+        # Đánh số lại theo thứ tự cũ (tiền tố luôn đứng trước) để mã tiền tố vẫn nhỏ hơn mã của mục
+        new_codes = {}
+        entries = []
+        for index in sorted(selected):
+            prefix = keys[index] >> 8
+            if prefix >= FIRST_CODE:
+                prefix = new_codes[prefix - FIRST_CODE]
+            new_codes[index] = FIRST_CODE + len(entries)
+            entries.append((prefix << 8) | (keys[index] & 0xFF))
+        return cls(entries, max_bits)
+
+    def to_bytes(self) -> bytes:
+        header = _DICTIONARY_HEADER.pack(DICTIONARY_MAGIC, self.max_bits, len(self.entries))
+        return header + struct.pack(f">{len(self.entries)}I", *self.entries)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "LZWDictionary":
+        magic, max_bits, count = _DICTIONARY_HEADER.unpack_from(data)
+        if magic != DICTIONARY_MAGIC:
+            raise ValueError("Dữ liệu không phải từ điển LZW hợp lệ")
+        return cls(list(struct.unpack_from(f">{count}I", data, _DICTIONARY_HEADER.size)), max_bits)
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path) -> "LZWDictionary":
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+
+class LZWEncoding:
+    def __init__(self, max_bits: int = 16, dictionary: LZWDictionary = None):
         """
         Khởi tạo class LZWEncoding.
         Kích thước từ điển gốc là 256 (cho bảng mã ASCII/Bytes 8-bit).
+        Mã có độ rộng từ 9 bit tăng dần tới max_bits, từ điển tối đa 2^max_bits mục.
+        dictionary: từ điển huấn luyện sẵn (LZWDictionary.train); khi đó mỗi lần mã hóa/giải mã
+            (và sau mỗi mã CLEAR) bắt đầu từ các mục đã học. Giải mã phải dùng cùng từ điển.
         """
+        if not MIN_CODE_BITS <= max_bits <= 24:
+            raise ValueError(f"max_bits phải nằm trong khoảng [{MIN_CODE_BITS}, 24]")
+        if dictionary is not None and dictionary.first_free_code >= 1 << max_bits:
+            raise ValueError("Từ điển huấn luyện quá lớn so với max_bits")
         self.dictionary_size = 256
+        self.max_bits = max_bits
+        self.max_dictionary_size = 1 << max_bits
+        self.dictionary = dictionary
+        # Mã tự do đầu tiên và độ rộng mã ban đầu (sau các mục của từ điển huấn luyện nếu có)
+        self.first_code = FIRST_CODE if dictionary is None else dictionary.first_free_code
+        self.first_code_bits = max(MIN_CODE_BITS, self.first_code.bit_length())
+        self.code_count = 0
+        # Số mục từ điển lúc kết thúc và số lần xóa từ điển (CLEAR) của lần mã hóa gần nhất
+        self.dictionary_entries = 0
+        self.dictionary_resets = 0
 
-    def calculate_entropy(self, text: str) -> float:
+    def calculate_entropy(self, text: str, statistics: SymbolStatistics = None) -> float:
         """
         Tính Entropy H(X) của nguồn tin (chuỗi văn bản).
         Công thức: H(X) = - sum(p(x) * log2(p(x)))
+        statistics: thống kê đã tính sẵn cho text (tránh đếm lại văn bản).
         """
-        if not text:
-            return 0.0
-        
-        # Đếm tần suất xuất hiện của từng ký tự
-        frequencies = Counter(text)
-        total_chars = len(text)
-        
-        entropy = 0.0
-        for count in frequencies.values():
-            p_x = count / total_chars
-            entropy += -p_x * math.log2(p_x)
-            
-        return entropy
+        if statistics is None:
+            statistics = SymbolStatistics.from_text(text)
+        return statistics.entropy
+
+    def _next_code_bits(self, next_code: int, code_bits: int) -> tuple[int, int]:
+        """
+        Tăng bộ đếm mã sau mỗi mã được ghi/đọc (nếu từ điển chưa đầy) và mở rộng
+        độ rộng mã khi mã kế tiếp không còn vừa. Bộ mã hóa và giải mã gọi cùng một hàm
+        nên luôn thống nhất độ rộng mã.
+        """
+        if next_code < self.max_dictionary_size:
+            next_code += 1
+            if next_code == 1 << code_bits and code_bits < self.max_bits:
+                code_bits += 1
+        return next_code, code_bits
 
     def encode(self, text: str):
         """
         Mã hóa chuỗi văn bản sử dụng thuật toán LZW.
         Input: Chuỗi tiếng Việt (Unicode).
-        Output: Danh sách các mã số (integers) và tổng số bit đã sử dụng.
+        Output: Luồng byte chứa các mã độ rộng thay đổi (9 -> max_bits bit) và tổng số bit của luồng.
         """
         # Chuyển đổi chuỗi sang bytes (UTF-8) để xử lý tiếng Việt chính xác
         # LZW thường hoạt động trên luồng byte.
-        uncompressed = text.encode('utf-8')
-        
-        # Khởi tạo từ điển với 256 ký tự ASCII đầu tiên
-        dictionary = {bytes([i]): i for i in range(self.dictionary_size)}
-        dict_size = self.dictionary_size
-        
-        w = bytes()
-        compressed_result = []
-        
-        # Biến để tính toán tổng số bit thực tế
-        total_bits_used = 0
-        
+        return self.encode_bytes(text.encode('utf-8', 'surrogatepass'))
+
+    def encode_bytes(self, uncompressed):
+        """
+        Mã hóa trực tiếp một dãy byte, trả về (luồng byte đã nén, tổng số bit).
+        uncompressed là bất kỳ buffer nào (bytes, bytearray, memoryview, mmap), được duyệt không sao chép.
+        """
+        uncompressed = byte_view(uncompressed)
+        # Từ điển ánh xạ khóa số nguyên (mã tiền tố << 8) | byte kế tiếp -> mã.
+        # 256 mã gốc chính là giá trị byte nên không cần lưu trong từ điển.
+        trained = {} if self.dictionary is None else self.dictionary.codes
+        dictionary = dict(trained)
+        lookup = dictionary.get
+        next_code = self.first_code
+        code_bits = self.first_code_bits
+        writer = BitWriter()
+        if self.dictionary is not None:
+            writer.write(CLEAR_CODE, MIN_CODE_BITS)
+            writer.write(self.dictionary.id, DICTIONARY_ID_BITS)
+        self.code_count = 0
+        self.dictionary_resets = 0
+
+        # Theo dõi tỉ lệ nén để quyết định xóa từ điển khi đã đầy
+        bytes_since_reset = 0
+        next_check = RATIO_CHECK_INTERVAL
+        best_ratio = 0.0
+        bits_at_reset = 0
+
+        # w là mã của chuỗi tiền tố hiện tại (-1 khi chưa có)
+        w = -1
         for byte_val in uncompressed:
-            c = bytes([byte_val])
-            wc = w + c
-            if wc in dictionary:
-                w = wc
-            else:
-                code = dictionary[w]
-                compressed_result.append(code)
-                
-                # Tính số bit cần thiết để biểu diễn mã này tại thời điểm hiện tại
-                # Số bit = ceil(log2(dict_size)) vì từ điển đang lớn dần
-                bits_for_this_code = math.ceil(math.log2(dict_size)) if dict_size > 1 else 8
-                total_bits_used += max(8, bits_for_this_code) 
-                
-                # Thêm chuỗi mới vào từ điển
-                dictionary[wc] = dict_size
-                dict_size += 1
-                w = c
-        
-        if w:
-            code = dictionary[w]
-            compressed_result.append(code)
-            bits_for_this_code = math.ceil(math.log2(dict_size)) if dict_size > 1 else 8
-            total_bits_used += max(8, bits_for_this_code)
-
-        return compressed_result, total_bits_used
-
-    def decode(self, compressed_codes: list) -> str:
-        """
-        Giải mã danh sách code trở lại thành chuỗi ban đầu.
-        """
-        if not compressed_codes:
-            return ""
-
-        # Khởi tạo lại từ điển giải mã
-        dictionary = {i: bytes([i]) for i in range(self.dictionary_size)}
-        dict_size = self.dictionary_size
-        
-        # Xử lý mã đầu tiên
-        w = dictionary[compressed_codes[0]]
-        result = bytearray(w)
-        
-        for k in compressed_codes[1:]:
-            if k in dictionary:
-                entry = dictionary[k]
-            elif k == dict_size:
-                entry = w + w[:1] # Trường hợp đặc biệt: cScSc
+            bytes_since_reset += 1
+            if w < 0:
+                w = byte_val
+                continue
+            key = (w << 8) | byte_val
+            code = lookup(key)
+            if code is not None:
+                w = code
+                continue
+
+            writer.write(w, code_bits)
+            self.code_count += 1
+            if next_code < self.max_dictionary_size:
+                # Thêm chuỗi mới (w + byte) vào từ điển
+                dictionary[key] = next_code
+            next_code, code_bits = self._next_code_bits(next_code, code_bits)
+
+            if next_code == self.max_dictionary_size and bytes_since_reset >= next_check:
+                # Từ điển đầy: nếu tỉ lệ nén giảm so với lần kiểm tra trước thì phát CLEAR
+                bits_out = len(writer.output) * 8 - bits_at_reset
+                ratio = bytes_since_reset * 8 / max(bits_out, 1)
+                next_check = bytes_since_reset + RATIO_CHECK_INTERVAL
+                if ratio < best_ratio:
+                    writer.write(CLEAR_CODE, code_bits)
+                    self.dictionary_resets += 1
+                    dictionary.clear()
+                    dictionary.update(trained)
+                    next_code = self.first_code
+                    code_bits = self.first_code_bits
+                    bytes_since_reset = 1
+                    next_check = RATIO_CHECK_INTERVAL
+                    best_ratio = 0.0
+                    bits_at_reset = len(writer.output) * 8
+                else:
+                    best_ratio = ratio
+            w = byte_val
+
+        if w >= 0:
+            writer.write(w, code_bits)
+            self.code_count += 1
+            next_code, code_bits = self._next_code_bits(next_code, code_bits)
+        writer.write(EOI_CODE, code_bits)
+        self.dictionary_entries = 256 + len(dictionary)
+
+        encoded = writer.flush()
+        # Tổng số bit thực tế của luồng đã đóng gói
+        total_bits_used = len(encoded) * 8
+        return encoded, total_bits_used
+
+    def decode(self, encoded_data: bytes) -> str:
+        """Giải mã luồng byte do encode() tạo ra trở lại thành chuỗi ban đầu."""
+        return self.decode_bytes(encoded_data).decode('utf-8', 'surrogatepass')
+
+    def _check_dictionary_id(self, data) -> tuple[int, int, int]:
+        """
+        Kiểm tra luồng có dùng đúng từ điển huấn luyện của bộ giải mã không.
+        Trả về (vị trí byte, bộ đệm bit, số bit trong bộ đệm) để bắt đầu đọc mã.
+        """
+        head = int.from_bytes(data[:_DICTIONARY_PREFIX_BYTES], "little")
+        if len(data) < 2 or head & ((1 << MIN_CODE_BITS) - 1) != CLEAR_CODE:
+            if self.dictionary is not None:
+                raise ValueError("Luồng LZW không được nén bằng từ điển huấn luyện, hãy giải mã không kèm dictionary")
+            return 0, 0, 0
+        if len(data) < _DICTIONARY_PREFIX_BYTES:
+            raise ValueError("Luồng LZW kết thúc mà không có mã EOI")
+        stream_id = (head >> MIN_CODE_BITS) & ((1 << DICTIONARY_ID_BITS) - 1)
+        if self.dictionary is None:
+            raise ValueError(f"Luồng LZW được nén bằng từ điển huấn luyện (id {stream_id:08x}), "
+                             "cần truyền dictionary khi giải mã")
+        if stream_id != self.dictionary.id:
+            raise ValueError(f"Sai từ điển LZW: luồng dùng từ điển id {stream_id:08x}, "
+                             f"bộ giải mã có id {self.dictionary.id:08x}")
+        used_bits = MIN_CODE_BITS + DICTIONARY_ID_BITS
+        return _DICTIONARY_PREFIX_BYTES, head >> used_bits, _DICTIONARY_PREFIX_BYTES * 8 - used_bits
+
+    def decode_bytes(self, encoded_data: bytes) -> bytes:
+        """
+        Giải mã luồng byte do encode_bytes() tạo ra thành dãy byte gốc.
+        Các mã được đọc tuần tự cho tới EOI_CODE.
+
+        Mỗi mục từ điển chỉ lưu (vị trí, độ dài) của lần xuất hiện đầu tiên trong kết quả:
+        mục mới = chuỗi trước + byte đầu của chuỗi hiện tại, mà hai chuỗi này nằm liền nhau
+        trong kết quả, nên mỗi mã chỉ cần một lần sao chép lát cắt từ bộ đệm kết quả.
+        Với từ điển huấn luyện, chuỗi của các mục đã học được đặt sẵn ở đầu bộ đệm (preamble).
+        """
+        data = memoryview(encoded_data)
+        data_len = len(data)
+        trained = self.dictionary
+        pos_in, acc, acc_bits = self._check_dictionary_id(data)
+
+        # Vị trí/độ dài của các mục từ mã FIRST_CODE trở đi
+        preamble = b"" if trained is None else trained.preamble
+        trained_entries = 0 if trained is None else len(trained)
+        offsets = [] if trained is None else list(trained.offsets)
+        lengths = [] if trained is None else list(trained.lengths)
+        entry_limit = self.max_dictionary_size - FIRST_CODE
+        next_code = self.first_code
+        code_bits = self.first_code_bits
+        prev_pos = -1
+        prev_len = 0
+        result = bytearray(preamble)
+
+        while True:
+            # Đọc mã code_bits bit tiếp theo (bit thấp trước)
+            while acc_bits < code_bits:
+                if pos_in >= data_len:
+                    raise ValueError("Luồng LZW kết thúc mà không có mã EOI")
+                acc |= data[pos_in] << acc_bits
+                pos_in += 1
+                acc_bits += 8
+            k = acc & ((1 << code_bits) - 1)
+            acc >>= code_bits
+            acc_bits -= code_bits
+            if k == EOI_CODE:
+                break
+            if k == CLEAR_CODE:
+                del offsets[trained_entries:]
+                del lengths[trained_entries:]
+                next_code = self.first_code
+                code_bits = self.first_code_bits
+                prev_pos = -1
+                continue
+
+            pos = len(result)
+            if k < self.dictionary_size:
+                result.append(k)
+                length = 1
+            elif FIRST_CODE <= k < FIRST_CODE + len(offsets):
+                start = offsets[k - FIRST_CODE]
+                length = lengths[k - FIRST_CODE]
+                result += result[start:start + length]
+            elif k == FIRST_CODE + len(offsets) and prev_pos >= 0:
+                # Trường hợp đặc biệt cScSc: chuỗi trước + byte đầu của chính nó
+                length = prev_len + 1
+                result += result[prev_pos:prev_pos + prev_len]
+                result.append(result[prev_pos])
             else:
                 raise ValueError(f"Mã nén không hợp lệ: {k}")
-            
-            result.extend(entry)
-            
+
             # Cập nhật từ điển
-            dictionary[dict_size] = w + entry[:1]
-            dict_size += 1
-            
-            w = entry
-            
-        return result.decode('utf-8')
+            if prev_pos >= 0 and len(offsets) < entry_limit:
+                offsets.append(prev_pos)
+                lengths.append(prev_len + 1)
+            next_code, code_bits = self._next_code_bits(next_code, code_bits)
+
+            prev_pos = pos
+            prev_len = length
+
+        if preamble:
+            return bytes(memoryview(result)[len(preamble):])
+        return bytes(result)
 
     def calculate_average_code_length(self, text: str, total_bits: int) -> float:
         """
@@ -123,13 +438,13 @@ class LZWEncoding:
         entropy = self.calculate_entropy(text)
         print(f"Entropy: {entropy} bits/kh")
 
-        compressed_codes, total_bits = self.encode(text)
-        print(f"Mã nén (dạng số): {compressed_codes}")
-        print(f"Số lượng mã output: {len(compressed_codes)}")
+        encoded, total_bits = self.encode(text)
+        print(f"Mã nén ({len(encoded)} bytes): {encoded.hex()}")
+        print(f"Số lượng mã output: {self.code_count}")
         print(f"Tổng số bit sau nén: {total_bits} bits")
 
         l_avg = self.calculate_average_code_length(text, total_bits)
         print(f"Độ dài mã trung bình (L_avg): {l_avg:.4f} bits/kh")
 
-        decoded_text = self.decode(compressed_codes)
+        decoded_text = self.decode(encoded)
         print(f"Giải mã: \"{decoded_text}\"")
\ No newline at end of file
@@ -0,0 +1,304 @@
+"""
+Mã LZSS (họ LZ77): thay đoạn lặp lại bằng cặp (khoảng cách lùi, độ dài) trỏ vào cửa sổ trượt.
+
+Khác với LZW (từ điển chỉ lớn dần theo từng byte), LZSS tìm được đoạn lặp dài ở xa trong cửa sổ,
+ví dụ các dòng log gần giống nhau. Tìm đoạn khớp bằng chuỗi băm (hash chain) trên 3 byte đầu;
+mức nén (level) quyết định số ứng viên được thử trên mỗi chuỗi và có dùng khớp lười (lazy matching)
+hay không: gặp đoạn khớp ở vị trí i thì thử thêm vị trí i + 1, nếu dài hơn thì ghi 1 literal rồi dùng đoạn sau.
+
+Định dạng gói dữ liệu (big-endian):
+    header : magic "LS", chế độ (0 = thô, 1 = Huffman), số bit cửa sổ, số byte gốc (u64)
+    thô    : từng nhóm 8 phần tử, 1 byte cờ (bit cao trước, 1 = đoạn khớp) rồi các phần tử:
+             literal 1 byte; đoạn khớp = khoảng cách - 1 (u16) + độ dài - MIN_MATCH (u8)
+    Huffman: độ dài hai gói Huffman (u32, u32), gói literal/độ dài (ký hiệu 0..255 là literal,
+             256 + độ dài - MIN_MATCH là đoạn khớp), gói byte cao của khoảng cách, rồi byte thấp (thô)
+"""
+import struct
+
+from Encoding.buffers import byte_view
+from Encoding.huffmanEncoding import HuffmanEncoding
+from Encoding.symbolStatistics import SymbolStatistics
+
+LZSS_MAGIC = b"LS"
+MODE_RAW = 0
+MODE_HUFFMAN = 1
+_HEADER = struct.Struct(">2sBBQ")
+_SECTIONS = struct.Struct(">II")
+_MATCH = struct.Struct(">HB")
+
+MIN_MATCH = 3
+MAX_MATCH = 258
+# Bảng đầu chuỗi băm cố định 2^HASH_BITS ô (như zlib), băm nhân (Fibonacci) 3 byte đầu của đoạn
+HASH_BITS = 16
+_HASH_MULTIPLIER = 0x9E3779B1
+MAX_WINDOW_BITS = 16
+DEFAULT_WINDOW_BITS = 15
+# Mức nén -> (số ứng viên tối đa trên chuỗi băm, độ dài "đủ tốt" thì dừng tìm,
+#             khớp lười, chỉ chèn các vị trí bên trong đoạn khớp dài tối đa ngần này vào chuỗi băm)
+LEVELS = {
+    1: (4, 16, False, 8),
+    2: (8, 32, False, 16),
+    3: (16, 32, False, 32),
+    4: (16, 64, True, 64),
+    5: (32, 128, True, MAX_MATCH),
+    6: (64, 128, True, MAX_MATCH),
+    7: (128, MAX_MATCH, True, MAX_MATCH),
+    8: (256, MAX_MATCH, True, MAX_MATCH),
+    9: (1024, MAX_MATCH, True, MAX_MATCH),
+}
+DEFAULT_LEVEL = 6
+
+
+class LZSSEncoding:
+    def __init__(self, level: int = DEFAULT_LEVEL, window_bits: int = DEFAULT_WINDOW_BITS,
+                 entropy_coding: bool = True):
+        """
+        Args:
+            level: 1 (nhanh nhất) .. 9 (nén tốt nhất).
+            window_bits: cửa sổ trượt 2^window_bits byte (tối đa 2^16 vì khoảng cách ghi bằng 16 bit).
+            entropy_coding: mã hóa literal/độ dài và khoảng cách bằng Huffman thay vì ghi thô.
+        """
+        if level not in LEVELS:
+            raise ValueError(f"level phải nằm trong khoảng [{min(LEVELS)}, {max(LEVELS)}]")
+        if not 8 <= window_bits <= MAX_WINDOW_BITS:
+            raise ValueError(f"window_bits phải nằm trong khoảng [8, {MAX_WINDOW_BITS}]")
+        self.level = level
+        self.window_bits = window_bits
+        self.window_size = 1 << window_bits
+        self.entropy_coding = entropy_coding
+        self.max_chain, self.nice_length, self.lazy, self.insert_limit = LEVELS[level]
+        # Thống kê của lần mã hóa gần nhất
+        self.literal_count = 0
+        self.match_count = 0
+        self.matched_bytes = 0
+        self.payload_bits = 0
+
+    def calculate_entropy(self, text: str, statistics: SymbolStatistics = None) -> float:
+        """Entropy Shannon bậc 0 theo ký tự (để so sánh với các thuật toán khác)."""
+        if statistics is None:
+            statistics = SymbolStatistics.from_text(text)
+        return statistics.entropy
+
+    def _parse(self, data) -> tuple[list, list]:
+        """
+        Tách data thành dãy ký hiệu literal/độ dài và dãy khoảng cách (khoảng cách - 1) của các đoạn khớp.
+        """
+        n = len(data)
+        window = self.window_size
+        max_chain, nice_length, lazy, insert_limit = self.max_chain, self.nice_length, self.lazy, self.insert_limit
+        # head[h]: vị trí gần nhất có giá trị băm h; prev[i & window_mask]: vị trí trước đó cùng giá trị băm.
+        # prev là bộ đệm vòng cỡ cửa sổ (như DEFLATE): ô của một vị trí chỉ bị ghi đè bởi vị trí xa hơn
+        # đúng một cửa sổ, khi đó nó đã nằm ngoài cửa sổ nên không còn được duyệt tới.
+        # Bộ nhớ của chuỗi băm vì thế không phụ thuộc độ dài dữ liệu.
+        window_mask = window - 1
+        hash_shift = 32 - HASH_BITS
+        head = [-1] * (1 << HASH_BITS)
+        prev = [-1] * window
+        last_hashed = n - MIN_MATCH
+
+        def insert(pos: int) -> int:
+            """Thêm pos vào chuỗi băm, trả về ứng viên gần nhất trước đó."""
+            key = ((((data[pos] << 16) | (data[pos + 1] << 8) | data[pos + 2]) * _HASH_MULTIPLIER)
+                   & 0xFFFFFFFF) >> hash_shift
+            candidate = head[key]
+            prev[pos & window_mask] = candidate
+            head[key] = pos
+            return candidate
+
+        def longest_match(pos: int, candidate: int) -> tuple[int, int]:
+            limit = min(MAX_MATCH, n - pos)
+            best_length = MIN_MATCH - 1
+            best_distance = 0
+            min_pos = pos - window
+            chain = max_chain
+            while candidate >= 0 and candidate > min_pos and chain:
+                # Loại nhanh ứng viên không thể dài hơn đoạn tốt nhất hiện có
+                if data[candidate + best_length] == data[pos + best_length]:
+                    length = 0
+                    while length + 8 <= limit and data[candidate + length:candidate + length + 8] == \
+                            data[pos + length:pos + length + 8]:
+                        length += 8
+                    while length < limit and data[candidate + length] == data[pos + length]:
+                        length += 1
+                    if length > best_length:
+                        best_length, best_distance = length, pos - candidate
+                        if length >= nice_length or length == limit:
+                            break
+                candidate = prev[candidate & window_mask]
+                chain -= 1
+            return best_length, best_distance
+
+        symbols = []
+        distances = []
+        pos = 0
+        # Đoạn khớp tìm sẵn ở vị trí pos (từ bước khớp lười trước), None nếu chưa tìm
+        pending = None
+        while pos < n:
+            if pending is not None:
+                length, distance = pending
+                pending = None
+            elif pos <= last_hashed:
+                length, distance = longest_match(pos, insert(pos))
+            else:
+                length = 0
+
+            if length >= MIN_MATCH and lazy and length < nice_length and pos + 1 <= last_hashed:
+                next_length, next_distance = longest_match(pos + 1, insert(pos + 1))
+                if next_length > length:
+                    symbols.append(data[pos])
+                    pos += 1
+                    pending = (next_length, next_distance)
+                    continue
+                inserted = pos + 2
+            else:
+                inserted = pos + 1
+
+            if length < MIN_MATCH:
+                symbols.append(data[pos])
+                pos += 1
+                continue
+
+            symbols.append(256 + length - MIN_MATCH)
+            distances.append(distance - 1)
+            end = pos + length
+            if length <= insert_limit:
+                for inner in range(inserted, min(end, last_hashed + 1)):
+                    insert(inner)
+            pos = end
+        return symbols, distances
+
+    def encode(self, text: str) -> bytes:
+        """Mã hóa văn bản (theo byte UTF-8)."""
+        return self.encode_bytes(text.encode("utf-8", "surrogatepass"))
+
+    def encode_bytes(self, data) -> bytes:
+        """
+        Mã hóa dữ liệu nhị phân (bytes, bytearray, memoryview, mmap...), được đọc không sao chép.
+        Kết quả tự chứa mọi thông tin cần để giải mã.
+        """
+        data = byte_view(data)
+        symbols, distances = self._parse(data)
+        self.match_count = len(distances)
+        self.literal_count = len(symbols) - self.match_count
+        self.matched_bytes = len(data) - self.literal_count
+
+        mode = MODE_HUFFMAN if self.entropy_coding else MODE_RAW
+        header = _HEADER.pack(LZSS_MAGIC, mode, self.window_bits, len(data))
+        if mode == MODE_RAW:
+            body = self._pack_raw(symbols, distances)
+            self.payload_bits = len(body) * 8
+            return header + body
+
+        literal_coder = HuffmanEncoding()
+        literal_lengths = literal_coder.encode("".join(map(chr, symbols)))
+        distance_coder = HuffmanEncoding()
+        distance_high = distance_coder.encode_bytes(bytes(distance >> 8 for distance in distances))
+        distance_low = bytes(distance & 0xFF for distance in distances)
+        # Phần còn lại (header, độ dài các phần, bảng mã Huffman, bit đệm) là chi phí mô hình
+        self.payload_bits = literal_coder.payload_bits() + distance_coder.payload_bits() + len(distance_low) * 8
+        return (header + _SECTIONS.pack(len(literal_lengths), len(distance_high))
+                + literal_lengths + distance_high + distance_low)
+
+    @staticmethod
+    def _pack_raw(symbols: list, distances: list) -> bytes:
+        output = bytearray()
+        match_index = 0
+        for start in range(0, len(symbols), 8):
+            flag_pos = len(output)
+            output.append(0)
+            flags = 0
+            for bit, symbol in enumerate(symbols[start:start + 8]):
+                if symbol < 256:
+                    output.append(symbol)
+                else:
+                    flags |= 0x80 >> bit
+                    output += _MATCH.pack(distances[match_index], symbol - 256)
+                    match_index += 1
+            output[flag_pos] = flags
+        return bytes(output)
+
+    def decode(self, encoded_data: bytes) -> str:
+        """Giải mã gói dữ liệu do encode() tạo ra trở lại thành chuỗi ban đầu."""
+        return self.decode_bytes(encoded_data).decode("utf-8", "surrogatepass")
+
+    def decode_bytes(self, encoded_data: bytes) -> bytes:
+        """Giải mã gói dữ liệu do encode_bytes() tạo ra."""
+        magic, mode, _, length = _HEADER.unpack_from(encoded_data)
+        if magic != LZSS_MAGIC or mode not in (MODE_RAW, MODE_HUFFMAN):
+            raise ValueError("Dữ liệu không phải gói mã LZSS hợp lệ")
+        body = memoryview(encoded_data)[_HEADER.size:]
+        output = bytearray()
+        if mode == MODE_RAW:
+            self._decode_raw(body, output)
+        else:
+            self._decode_huffman(body, output)
+        if len(output) != length:
+            raise ValueError("Dữ liệu LZSS bị hỏng: số byte giải mã không khớp")
+        return bytes(output)
+
+    @staticmethod
+    def _copy_match(output: bytearray, distance: int, length: int):
+        start = len(output) - distance
+        if start < 0:
+            raise ValueError("Dữ liệu LZSS bị hỏng: khoảng cách vượt quá dữ liệu đã giải mã")
+        if distance >= length:
+            output += output[start:start + length]
+        else:
+            # Đoạn khớp chồng lên chính nó: lặp lại mẫu distance byte cuối
+            pattern = output[start:]
+            output += (pattern * (length // distance + 1))[:length]
+
+    def _decode_raw(self, body, output: bytearray):
+        pos = 0
+        size = len(body)
+        while pos < size:
+            flags = body[pos]
+            pos += 1
+            for bit in range(8):
+                if pos >= size:
+                    break
+                if flags & (0x80 >> bit):
+                    distance, extra = _MATCH.unpack_from(body, pos)
+                    pos += _MATCH.size
+                    self._copy_match(output, distance + 1, extra + MIN_MATCH)
+                else:
+                    output.append(body[pos])
+                    pos += 1
+
+    def _decode_huffman(self, body, output: bytearray):
+        literal_size, high_size = _SECTIONS.unpack_from(body)
+        offset = _SECTIONS.size
+        symbols = HuffmanEncoding().decode(body[offset:offset + literal_size])
+        offset += literal_size
+        distance_high = HuffmanEncoding().decode_bytes(body[offset:offset + high_size])
+        distance_low = body[offset + high_size:]
+        if len(distance_low) != len(distance_high):
+            raise ValueError("Dữ liệu LZSS bị hỏng: bảng khoảng cách không khớp")
+
+        match_index = 0
+        copy_match = self._copy_match
+        for ch in symbols:
+            symbol = ord(ch)
+            if symbol < 256:
+                output.append(symbol)
+                continue
+            distance = (distance_high[match_index] << 8 | distance_low[match_index]) + 1
+            match_index += 1
+            copy_match(output, distance, symbol - 256 + MIN_MATCH)
+
+    def calculate_average_code_length(self, text: str, total_bits: int) -> float:
+        """L_avg = Tổng số bit sau nén / Tổng số ký tự nguồn"""
+        if not text:
+            return 0.0
+        return total_bits / len(text)
+
+    def display(self, text: str):
+        print(f"Độ dài chuỗi: {len(text)} kí tự")
+        print(f"Entropy: {self.calculate_entropy(text)} bits/kh")
+
+        encoded = self.encode(text)
+        total_bits = len(encoded) * 8
+        print(f"Mã nén ({len(encoded)} bytes): {encoded.hex()}")
+        print(f"Số literal: {self.literal_count}, số đoạn khớp: {self.match_count} ({self.matched_bytes} byte)")
+        print(f"Độ dài mã trung bình (L_avg): {self.calculate_average_code_length(text, total_bits):.4f} bits/kh")
+        print(f"Giải mã: \"{self.decode(encoded)}\"")
@@ -0,0 +1,153 @@
+"""
+Nén song song theo khối trên nhiều tiến trình (ProcessPoolExecutor).
+
+Dữ liệu được cắt thành các khối độc lập, mỗi khối nén trên một tiến trình riêng
+nên không bị GIL giới hạn. Kết quả ghi vào một container có chỉ mục khối để giải nén
+cũng chia được cho nhiều tiến trình, hoặc chỉ giải nén riêng một khối bất kỳ.
+
+Định dạng container (header, khung có CRC32, chỉ mục, footer) được mô tả trong Encoding.container;
+nén tuần tự (Encoding.streaming) và nén song song cho ra cùng một định dạng.
+"""
+import io
+import os
+from collections import deque
+from functools import partial
+
+from Encoding.buffers import as_reader, byte_view, map_file
+from Encoding.container import ContainerReader, check_block, iter_container, iter_frames
+from Encoding.streaming import BLOCK_CODECS, codec_by_id, iter_blocks, read_container_header
+
+DEFAULT_BLOCK_SIZE = 1 << 20
+
+
+def _map_blocks(function, blocks, workers):
+    """
+    Áp dụng function lên từng khối, giữ nguyên thứ tự kết quả.
+    Chỉ giữ tối đa 2 * workers khối đang xử lý để bộ nhớ không phụ thuộc kích thước dữ liệu.
+    Sinh ra các cặp (khối đầu vào, kết quả).
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1:
+        for block in blocks:
+            yield block, function(block)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for block in blocks:
+            # memoryview (ví dụ lát cắt của file mmap) không pickle được: gửi bản sao bytes sang tiến trình con
+            task = bytes(block) if isinstance(block, memoryview) else block
+            pending.append((block, executor.submit(function, task)))
+            if len(pending) >= 2 * workers:
+                block, future = pending.popleft()
+                yield block, future.result()
+        while pending:
+            block, future = pending.popleft()
+            yield block, future.result()
+
+
+def compress_parallel_stream(reader, writer, algo: str = "huffman",
+                             block_size: int = DEFAULT_BLOCK_SIZE, workers: int = None) -> int:
+    """
+    Nén reader (file nhị phân hoặc iterator bytes) thành container có chỉ mục, ghi vào writer.
+    workers: số tiến trình (mặc định bằng số lõi CPU, 1 = nén ngay trong tiến trình hiện tại).
+    Trả về số byte đã ghi.
+    """
+    return _write_container(iter_blocks(reader, block_size), writer, algo, block_size, workers)
+
+
+def _iter_view_blocks(view: memoryview, block_size: int):
+    for start in range(0, len(view), block_size):
+        yield view[start:start + block_size]
+
+
+def compress_file(path, writer, algo: str = "huffman",
+                  block_size: int = DEFAULT_BLOCK_SIZE, workers: int = None) -> int:
+    """
+    Nén một file trên đĩa: file được mmap và cắt thành các lát memoryview nên dữ liệu
+    không bị đọc hết vào RAM cũng không bị sao chép (trừ khi phải gửi sang tiến trình khác).
+    """
+    with map_file(path) as view:
+        return _write_container(_iter_view_blocks(view, block_size), writer, algo, block_size, workers)
+
+
+def _write_container(blocks, writer, algo: str, block_size: int, workers: int) -> int:
+    if algo not in BLOCK_CODECS:
+        raise ValueError(f"Thuật toán không được hỗ trợ: {algo}")
+    algo_id, compress_block, _ = BLOCK_CODECS[algo]
+    written = 0
+    for piece in iter_container(algo_id, block_size, _map_blocks(compress_block, blocks, workers)):
+        writer.write(piece)
+        written += len(piece)
+    return written
+
+
+def compress_parallel(data, algo: str = "huffman",
+                      block_size: int = DEFAULT_BLOCK_SIZE, workers: int = None) -> bytes:
+    """Nén toàn bộ data (bytes, memoryview, mmap...) trong bộ nhớ, trả về container."""
+    output = io.BytesIO()
+    _write_container(_iter_view_blocks(byte_view(data), block_size), output, algo, block_size, workers)
+    return output.getvalue()
+
+
+def _decompress_frame(decompress_block, frame) -> bytes:
+    # Hàm cấp module (pickle được) để gửi cả khung sang tiến trình con
+    return decompress_block(frame.payload)
+
+
+def decompress_parallel_stream(reader, writer, workers: int = None) -> int:
+    """
+    Giải nén tuần tự một container (reader không cần seek được, ví dụ stdin),
+    các khối được chia cho nhiều tiến trình. Trả về số byte gốc đã ghi.
+    """
+    reader = as_reader(reader)
+    _, _, decompress_block = read_container_header(reader)
+    decompress_frame = partial(_decompress_frame, decompress_block)
+
+    written = 0
+    for block_index, (frame, block) in enumerate(_map_blocks(decompress_frame, iter_frames(reader), workers)):
+        check_block(block_index, block, frame.raw_length, frame.raw_crc)
+        writer.write(block)
+        written += len(block)
+    return written
+
+
+def decompress_parallel(data: bytes, workers: int = None) -> bytes:
+    """Giải nén container nằm trong bộ nhớ."""
+    output = io.BytesIO()
+    decompress_parallel_stream(io.BytesIO(data), output, workers)
+    return output.getvalue()
+
+
+class BlockArchive(ContainerReader):
+    """
+    Truy cập ngẫu nhiên vào container và giải nén riêng từng khối.
+    source là bytes/bytearray/memoryview hoặc file nhị phân seek được.
+    verify() (kế thừa từ ContainerReader) kiểm tra CRC32 mọi khối mà không giải mã.
+    """
+
+    def __init__(self, source):
+        super().__init__(source)
+        self.algo, _, self._decompress_block = codec_by_id(self.algo_id)
+
+    def read_payload(self, block_index: int) -> bytes:
+        return self.read_frame(block_index).payload
+
+    def read_block(self, block_index: int) -> bytes:
+        """Giải nén riêng một khối (không cần giải nén các khối khác)."""
+        frame = self.read_frame(block_index)
+        block = self._decompress_block(frame.payload)
+        check_block(block_index, block, frame.raw_length, frame.raw_crc)
+        return block
+
+    def read_all(self, workers: int = None) -> bytes:
+        frames = (self.read_frame(i) for i in range(len(self.index)))
+        decompress_frame = partial(_decompress_frame, self._decompress_block)
+        blocks = []
+        for block_index, (frame, block) in enumerate(_map_blocks(decompress_frame, frames, workers)):
+            check_block(block_index, block, frame.raw_length, frame.raw_crc)
+            blocks.append(block)
+        return b"".join(blocks)
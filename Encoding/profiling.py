@@ -0,0 +1,206 @@
+"""
+Đo hiệu năng chi tiết cho các thuật toán nén, giao diện và dòng lệnh.
+
+Profiler gom trong một lần chạy:
+    - thời gian theo từng bước: khối with phase(...) hoặc phương thức của các lớp mã hóa được bọc bằng
+      instrument()/instrument_codecs() (thời gian của một bước gồm cả các bước con bên trong nó),
+    - bộ đếm: số ký hiệu, số mã đã ghi, kích thước từ điển LZW, số lần chuẩn hóa của range coder...,
+    - bộ nhớ đỉnh theo tracemalloc (làm chương trình chậm đi nhiều lần, chỉ bật khi cần),
+    - tùy chọn cProfile: write_cprofile() ghi file .prof đọc được bằng `python -m pstats`,
+      snakeviz hoặc flameprof (vẽ flamegraph).
+report() trả về dict chỉ gồm kiểu dữ liệu cơ bản nên gửi được từ tiến trình con về giao diện.
+"""
+import cProfile
+import io
+import marshal
+import pstats
+import time
+import tracemalloc
+from contextlib import contextmanager
+from functools import wraps
+
+from Encoding.arithmeticEncoding import AdaptiveArithmeticEncoding, ArithmeticEncoding
+from Encoding.huffmanEncoding import HuffmanEncoding
+from Encoding.lzpEncoding import LZWEncoding
+from Encoding.lzssEncoding import LZSSEncoding
+from Encoding.symbolStatistics import SymbolStatistics
+
+# Lớp -> (phương thức được đo thời gian, phương thức mà sau mỗi lần gọi thì cộng dồn bộ đếm của đối tượng)
+CODEC_METHODS = {
+    SymbolStatistics: (("from_text", "from_bytes", "from_tokens"), ()),
+    HuffmanEncoding: (("build_frequency_table", "build_huffman_tree", "build_codes", "_pack_bits",
+                       "_pack_bits_numpy", "encode", "encode_bytes", "_decode_packed", "decode", "decode_bytes"),
+                      ("encode", "encode_bytes")),
+    LZWEncoding: (("encode_bytes", "decode_bytes"), ("encode_bytes",)),
+    LZSSEncoding: (("_parse", "encode_bytes", "decode_bytes"), ("encode_bytes",)),
+    ArithmeticEncoding: (("_calculate_ranges", "encode", "_decode_symbols"), ("encode",)),
+    AdaptiveArithmeticEncoding: (("encode_bytes", "decode_bytes"), ("encode_bytes",)),
+}
+DEFAULT_TOP_FUNCTIONS = 15
+
+
+def codec_counters(codec) -> dict:
+    """Bộ đếm của lần mã hóa gần nhất trên một đối tượng mã hóa."""
+    if isinstance(codec, HuffmanEncoding):
+        freq_table = codec.freq_table
+        return {
+            "symbols": sum(freq_table.values()),
+            "alphabet": len(freq_table),
+            "bits": sum(count * codec.code_lengths[symbol] for symbol, count in freq_table.items()),
+        }
+    if isinstance(codec, LZWEncoding):
+        return {"codes": codec.code_count, "dictionary_entries": codec.dictionary_entries,
+                "dictionary_resets": codec.dictionary_resets}
+    if isinstance(codec, LZSSEncoding):
+        return {"literals": codec.literal_count, "matches": codec.match_count, "matched_bytes": codec.matched_bytes}
+    if isinstance(codec, ArithmeticEncoding):
+        return {"symbols": codec.length, "alphabet": len(codec.frequencies),
+                "renormalizations": codec.renormalizations}
+    if isinstance(codec, AdaptiveArithmeticEncoding):
+        return {"symbols": codec.length, "contexts": codec.contexts, "renormalizations": codec.renormalizations}
+    return {}
+
+
+class _StatsHolder:
+    """Đối tượng tối thiểu để pstats.Stats đọc lại bảng thống kê cProfile đã gửi qua tiến trình."""
+
+    def __init__(self, stats: dict):
+        self.stats = stats
+
+    def create_stats(self):
+        pass
+
+
+class Profiler:
+    def __init__(self, trace_memory: bool = True, cprofile: bool = False):
+        """
+        Args:
+            trace_memory: đo bộ nhớ đỉnh bằng tracemalloc trong khoảng start() .. stop().
+            cprofile: chạy kèm cProfile để xem/ghi thời gian theo từng hàm.
+        """
+        self.trace_memory = trace_memory
+        self.timings = {}  # tên bước -> [tổng thời gian (s), số lần]
+        self.counters = {}
+        self.peak_memory_bytes = None
+        self._cprofile = cProfile.Profile() if cprofile else None
+        self._patches = []
+        self._owns_tracemalloc = False
+
+    def add_time(self, name: str, seconds: float):
+        timing = self.timings.setdefault(name, [0.0, 0])
+        timing[0] += seconds
+        timing[1] += 1
+
+    @contextmanager
+    def phase(self, name: str):
+        """Đo thời gian của khối with và cộng vào bước name."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - started)
+
+    def count(self, name: str, value: int = 1):
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def instrument(self, cls, timed=(), counted=()):
+        """
+        Bọc các phương thức của lớp cls (áp dụng cho mọi đối tượng, kể cả tạo sau đó) tới khi stop().
+        timed: đo thời gian mỗi lần gọi; counted: sau mỗi lần gọi cộng dồn codec_counters(đối tượng).
+        """
+        for name in dict.fromkeys((*timed, *counted)):
+            raw = cls.__dict__.get(name)
+            if raw is None:
+                continue
+            function = raw.__func__ if isinstance(raw, (classmethod, staticmethod)) else raw
+            wrapper = self._wrap(function, f"{cls.__name__}.{name}", name in timed, name in counted)
+            if isinstance(raw, (classmethod, staticmethod)):
+                wrapper = type(raw)(wrapper)
+            setattr(cls, name, wrapper)
+            self._patches.append((cls, name, raw))
+
+    def instrument_codecs(self):
+        """Bọc các bước chính của mọi thuật toán (xem CODEC_METHODS)."""
+        for cls, (timed, counted) in CODEC_METHODS.items():
+            self.instrument(cls, timed, counted)
+
+    def _wrap(self, function, label: str, timed: bool, counted: bool):
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            result = function(*args, **kwargs)
+            if timed:
+                self.add_time(label, time.perf_counter() - started)
+            if counted:
+                prefix = type(args[0]).__name__
+                for name, value in codec_counters(args[0]).items():
+                    self.count(f"{prefix}.{name}", value)
+            return result
+
+        return wrapper
+
+    def start(self):
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._owns_tracemalloc = True
+        if self._cprofile is not None:
+            self._cprofile.enable()
+        return self
+
+    def stop(self):
+        """Dừng đo và gỡ mọi phương thức đã bọc."""
+        if self._cprofile is not None:
+            self._cprofile.disable()
+        if self._owns_tracemalloc:
+            _, self.peak_memory_bytes = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            self._owns_tracemalloc = False
+        while self._patches:
+            cls, name, raw = self._patches.pop()
+            setattr(cls, name, raw)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def report(self) -> dict:
+        cprofile_stats = None
+        if self._cprofile is not None:
+            cprofile_stats = pstats.Stats(self._cprofile).stats
+        return {
+            "phases": {name: {"seconds": seconds, "calls": calls} for name, (seconds, calls) in self.timings.items()},
+            "counters": dict(self.counters),
+            "peak_memory_bytes": self.peak_memory_bytes,
+            "cprofile": cprofile_stats,
+        }
+
+
+def format_report(report: dict, top: int = DEFAULT_TOP_FUNCTIONS) -> str:
+    """Báo cáo dạng văn bản: các bước (chậm nhất trước), bộ đếm, bộ nhớ đỉnh và các hàm tốn thời gian nhất."""
+    lines = ["Thời gian theo bước:"]
+    phases = sorted(report["phases"].items(), key=lambda item: -item[1]["seconds"])
+    width = max((len(name) for name, _ in phases), default=0)
+    for name, timing in phases:
+        lines.append(f"  {name:<{width}} {timing['seconds']:10.4f} s  x{timing['calls']}")
+    if report["counters"]:
+        lines.append("Bộ đếm:")
+        for name, value in sorted(report["counters"].items()):
+            lines.append(f"  {name}: {value}")
+    if report["peak_memory_bytes"] is not None:
+        lines.append(f"Bộ nhớ đỉnh (tracemalloc): {report['peak_memory_bytes'] / 1e6:.2f} MB")
+    if report.get("cprofile"):
+        stream = io.StringIO()
+        pstats.Stats(_StatsHolder(report["cprofile"]), stream=stream).sort_stats("cumulative").print_stats(top)
+        lines.append(f"cProfile ({top} hàm có thời gian tích lũy lớn nhất):")
+        lines.append(stream.getvalue().strip("\n"))
+    return "\n".join(lines)
+
+
+def write_cprofile(report: dict, path: str):
+    """Ghi bảng thống kê cProfile ra file .prof (cùng định dạng với pstats.Stats.dump_stats)."""
+    if not report.get("cprofile"):
+        raise ValueError("Báo cáo không có dữ liệu cProfile")
+    with open(path, "wb") as f:
+        marshal.dump(report["cprofile"], f)
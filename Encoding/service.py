@@ -0,0 +1,428 @@
+"""
+Dịch vụ nén cục bộ (asyncio) để các tiến trình khác gọi các thuật toán qua Unix socket hoặc TCP localhost.
+
+Giao thức nhị phân, mọi số nguyên big-endian; một kết nối gửi được nhiều yêu cầu liên tiếp
+không cần chờ trả lời (pipelining), phản hồi có thể về không theo thứ tự và được ghép theo mã yêu cầu:
+    yêu cầu : mã yêu cầu (u32), thao tác (u8), mã thuật toán (u8, như trong header container), độ dài (u32), dữ liệu
+    phản hồi: mã yêu cầu (u32), trạng thái (u8: 0 = OK, 1 = lỗi), độ dài (u32), dữ liệu
+              (lỗi: thông báo UTF-8; stats/metrics: JSON UTF-8; compress: container ENCF)
+
+Phía máy chủ:
+    - yêu cầu nhỏ được gom thành lô (tối đa batch_max_bytes / batch_max_requests hoặc chờ batch_delay giây)
+      để một lần gửi sang tiến trình con xử lý nhiều yêu cầu, giảm chi phí pickle và chuyển tiến trình;
+    - việc tính toán chạy trên ProcessPoolExecutor giới hạn số tiến trình, vòng lặp sự kiện chỉ đọc/ghi socket;
+    - backpressure: khi đã có max_pending yêu cầu đang xử lý thì ngừng đọc socket (client bị chặn ở tầng TCP),
+      phản hồi được ghi bằng drain() nên client đọc chậm không làm phình bộ nhớ máy chủ;
+    - metrics: số yêu cầu, lỗi, byte vào/ra, thông lượng, độ trễ p50/p95/p99, kích thước lô trung bình.
+Chạy hoàn toàn cục bộ, không cần mạng ngoài; ServiceClient dùng được ngay trong cùng tiến trình để thử.
+"""
+import asyncio
+import json
+import os
+import struct
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from Encoding.parallel import DEFAULT_BLOCK_SIZE, compress_parallel, decompress_parallel
+from Encoding.streaming import BLOCK_CODECS, codec_by_id
+from Encoding.symbolStatistics import SymbolStatistics
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+OP_COMPRESS = 1
+OP_DECOMPRESS = 2
+OP_STATS = 3
+OP_METRICS = 4
+OP_NAMES = {OP_COMPRESS: "compress", OP_DECOMPRESS: "decompress", OP_STATS: "stats", OP_METRICS: "metrics"}
+
+STATUS_OK = 0
+STATUS_ERROR = 1
+
+_REQUEST = struct.Struct(">IBBI")
+_RESPONSE = struct.Struct(">IBI")
+
+MAX_REQUEST_SIZE = 64 << 20
+MAX_PENDING = 256
+BATCH_MAX_BYTES = 64 << 10
+BATCH_MAX_REQUESTS = 64
+BATCH_DELAY = 0.002
+LATENCY_WINDOW = 10_000
+
+
+def _statistics(payload: bytes) -> dict:
+    byte_stats = SymbolStatistics.from_bytes(payload)
+    result = {"bytes": len(payload), "byte_alphabet": byte_stats.alphabet_size, "byte_entropy": byte_stats.entropy}
+    try:
+        text = str(payload, "utf-8")
+    except UnicodeDecodeError:
+        return result
+    char_stats = SymbolStatistics.from_text(text)
+    result.update(characters=len(text), alphabet=char_stats.alphabet_size, entropy=char_stats.entropy)
+    return result
+
+
+def _execute(block_size: int, op: int, algo_id: int, payload: bytes) -> bytes:
+    if op == OP_COMPRESS:
+        algo, _, _ = codec_by_id(algo_id)
+        return compress_parallel(payload, algo, block_size, workers=1)
+    if op == OP_DECOMPRESS:
+        return decompress_parallel(payload, workers=1)
+    if op == OP_STATS:
+        return json.dumps(_statistics(payload)).encode("utf-8")
+    raise ValueError(f"Thao tác không được hỗ trợ: {op}")
+
+
+def _execute_batch(block_size: int, jobs: list) -> list:
+    """
+    Chạy một lô yêu cầu trong tiến trình con, trả về danh sách (trạng thái, dữ liệu) theo đúng thứ tự.
+    Lỗi của một yêu cầu (kể cả dữ liệu nén hỏng) chỉ làm hỏng phản hồi của yêu cầu đó.
+    """
+    results = []
+    for op, algo_id, payload in jobs:
+        try:
+            results.append((STATUS_OK, _execute(block_size, op, algo_id, payload)))
+        except Exception as e:
+            results.append((STATUS_ERROR, f"{type(e).__name__}: {e}".encode("utf-8")))
+    return results
+
+
+class ServiceMetrics:
+    """Số liệu của máy chủ từ lúc khởi động; snapshot() chỉ gồm kiểu cơ bản nên gửi được dạng JSON."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.requests = {name: 0 for name in OP_NAMES.values()}
+        self.errors = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.batches = 0
+        self.batched_requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+
+    def begin(self):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+    def finish(self, op: int, bytes_in: int, bytes_out: int, status: int, seconds: float):
+        self.in_flight -= 1
+        name = OP_NAMES.get(op, "unknown")
+        self.requests[name] = self.requests.get(name, 0) + 1
+        if status != STATUS_OK:
+            self.errors += 1
+        self.bytes_in += bytes_in
+        self.bytes_out += bytes_out
+        self.latencies.append(seconds)
+
+    def snapshot(self) -> dict:
+        uptime = time.perf_counter() - self.started
+        total = sum(self.requests.values())
+        latencies = sorted(self.latencies)
+
+        def percentile(q):
+            if not latencies:
+                return None
+            return latencies[int(q * (len(latencies) - 1))] * 1000
+
+        return {
+            "uptime_seconds": uptime,
+            "requests": dict(self.requests),
+            "errors": self.errors,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "requests_per_second": total / uptime if uptime else 0.0,
+            "mb_in_per_second": self.bytes_in / 1e6 / uptime if uptime else 0.0,
+            "latency_ms": {"p50": percentile(0.5), "p95": percentile(0.95), "p99": percentile(0.99),
+                           "max": percentile(1.0)},
+            "batches": self.batches,
+            "mean_batch_size": self.batched_requests / self.batches if self.batches else 0.0,
+            "in_flight": self.in_flight,
+            "max_in_flight": self.max_in_flight,
+        }
+
+
+class CompressionService:
+    def __init__(self, workers: int = None, block_size: int = DEFAULT_BLOCK_SIZE, max_pending: int = MAX_PENDING,
+                 max_request_size: int = MAX_REQUEST_SIZE, batch_max_bytes: int = BATCH_MAX_BYTES,
+                 batch_max_requests: int = BATCH_MAX_REQUESTS, batch_delay: float = BATCH_DELAY, executor=None):
+        """
+        Args:
+            workers: số tiến trình tính toán (mặc định bằng số lõi CPU).
+            max_pending: số yêu cầu tối đa đang xử lý trên toàn máy chủ; vượt quá thì ngừng đọc socket.
+            max_request_size: yêu cầu lớn hơn bị từ chối và kết nối bị đóng.
+            batch_max_bytes: yêu cầu nhỏ hơn ngưỡng này được gom lô; lô được gửi đi khi đủ số byte,
+                đủ batch_max_requests yêu cầu hoặc sau batch_delay giây.
+            executor: executor thay cho ProcessPoolExecutor (ví dụ ThreadPoolExecutor khi thử trong
+                cùng tiến trình); executor truyền vào không bị tắt khi đóng dịch vụ.
+        """
+        if max_pending <= 0 or batch_max_requests <= 0:
+            raise ValueError("max_pending và batch_max_requests phải lớn hơn 0")
+        self.block_size = block_size
+        self.max_pending = max_pending
+        self.max_request_size = max_request_size
+        self.batch_max_bytes = batch_max_bytes
+        self.batch_max_requests = batch_max_requests
+        self.batch_delay = batch_delay
+        self.metrics = ServiceMetrics()
+        self._owns_executor = executor is None
+        self._executor = executor if executor is not None else ProcessPoolExecutor(max_workers=workers or os.cpu_count())
+        self._slots = None
+        self._server = None
+        self._connections = set()
+        self._batch = []
+        self._batch_bytes = 0
+        self._flush_handle = None
+
+    # ---- Vòng đời ----
+
+    async def start(self, path: str = None, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT):
+        """Lắng nghe trên Unix socket path (nếu có) hoặc host:port (port=0: hệ điều hành tự chọn cổng trống)."""
+        self._slots = asyncio.Semaphore(self.max_pending)
+        if path is not None:
+            self._server = await asyncio.start_unix_server(self._handle_connection, path)
+        else:
+            self._server = await asyncio.start_server(self._handle_connection, host, port)
+        return self
+
+    @property
+    def address(self):
+        """Địa chỉ đang lắng nghe: đường dẫn Unix socket hoặc (host, port)."""
+        return self._server.sockets[0].getsockname()
+
+    async def serve_forever(self):
+        await self._server.serve_forever()
+
+    async def close(self):
+        """Ngừng nhận kết nối mới; các yêu cầu đang xử lý vẫn được trả lời trước khi đóng kết nối."""
+        if self._server is not None:
+            self._server.close()
+            for task in self._connections:
+                task.cancel()
+            await asyncio.gather(*self._connections, return_exceptions=True)
+            await self._server.wait_closed()
+        self._flush()
+        if self._owns_executor:
+            await asyncio.get_running_loop().run_in_executor(None, self._executor.shutdown)
+
+    async def __aenter__(self):
+        if self._server is None:
+            await self.start(port=0)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    # ---- Kết nối ----
+
+    async def _handle_connection(self, reader, writer):
+        write_lock = asyncio.Lock()
+        tasks = set()
+        connection = asyncio.current_task()
+        self._connections.add(connection)
+        try:
+            while True:
+                header = await reader.readexactly(_REQUEST.size)
+                request_id, op, algo_id, length = _REQUEST.unpack(header)
+                if length > self.max_request_size:
+                    message = f"Yêu cầu quá lớn: {length} byte (tối đa {self.max_request_size})"
+                    await self._reply(writer, write_lock, request_id, STATUS_ERROR, message.encode("utf-8"))
+                    break
+                # Backpressure: chưa có chỗ thì không đọc tiếp dữ liệu của kết nối này
+                await self._slots.acquire()
+                try:
+                    payload = await reader.readexactly(length)
+                except BaseException:
+                    self._slots.release()
+                    raise
+                self.metrics.begin()
+                task = asyncio.create_task(self._serve_request(writer, write_lock, request_id, op, algo_id, payload))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except asyncio.CancelledError:
+            # close() dừng việc đọc yêu cầu mới; các yêu cầu đã nhận vẫn được trả lời bên dưới
+            pass
+        finally:
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+            writer.close()
+            self._connections.discard(connection)
+
+    async def _serve_request(self, writer, write_lock, request_id: int, op: int, algo_id: int, payload: bytes):
+        started = time.perf_counter()
+        try:
+            status, result = await self._process(op, algo_id, payload)
+        finally:
+            self._slots.release()
+        self.metrics.finish(op, len(payload), len(result), status, time.perf_counter() - started)
+        try:
+            await self._reply(writer, write_lock, request_id, status, result)
+        except ConnectionError:
+            pass
+
+    @staticmethod
+    async def _reply(writer, write_lock, request_id: int, status: int, result: bytes):
+        async with write_lock:
+            writer.writelines((_RESPONSE.pack(request_id, status, len(result)), result))
+            await writer.drain()
+
+    async def _process(self, op: int, algo_id: int, payload: bytes) -> tuple:
+        if op == OP_METRICS:
+            return STATUS_OK, json.dumps(self.metrics.snapshot()).encode("utf-8")
+        if op not in OP_NAMES:
+            return STATUS_ERROR, f"Thao tác không được hỗ trợ: {op}".encode("utf-8")
+        if op == OP_COMPRESS:
+            try:
+                codec_by_id(algo_id)
+            except ValueError as e:
+                return STATUS_ERROR, str(e).encode("utf-8")
+        return await self._submit((op, algo_id, payload))
+
+    # ---- Gom lô và gửi sang tiến trình con ----
+
+    async def _submit(self, job: tuple) -> tuple:
+        future = asyncio.get_running_loop().create_future()
+        size = len(job[2])
+        if size >= self.batch_max_bytes:
+            self._dispatch([(job, future)])
+            return await future
+
+        self._batch.append((job, future))
+        self._batch_bytes += size
+        if len(self._batch) >= self.batch_max_requests or self._batch_bytes >= self.batch_max_bytes:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(self.batch_delay, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._batch, self._batch_bytes = self._batch, [], 0
+        if batch:
+            self._dispatch(batch)
+
+    def _dispatch(self, items: list):
+        self.metrics.batches += 1
+        self.metrics.batched_requests += len(items)
+        jobs = [job for job, _ in items]
+        pool_future = asyncio.get_running_loop().run_in_executor(
+            self._executor, _execute_batch, self.block_size, jobs)
+        pool_future.add_done_callback(partial(self._resolve, items))
+
+    @staticmethod
+    def _resolve(items: list, pool_future):
+        if pool_future.cancelled():
+            results = [(STATUS_ERROR, "Yêu cầu bị hủy".encode("utf-8"))] * len(items)
+        elif pool_future.exception() is not None:
+            # Tiến trình con chết hoặc không pickle được dữ liệu: báo lỗi cho cả lô
+            error = pool_future.exception()
+            results = [(STATUS_ERROR, f"{type(error).__name__}: {error}".encode("utf-8"))] * len(items)
+        else:
+            results = pool_future.result()
+        for (_, future), result in zip(items, results):
+            if not future.done():
+                future.set_result(result)
+
+
+class ServiceClient:
+    """
+    Client bất đồng bộ: nhiều coroutine dùng chung một kết nối, các yêu cầu được gửi nối tiếp
+    không chờ nhau và phản hồi được ghép lại theo mã yêu cầu.
+    """
+
+    def __init__(self, reader, writer):
+        self._reader = reader
+        self._writer = writer
+        self._pending = {}
+        self._next_id = 0
+        self._receiver = asyncio.create_task(self._receive())
+
+    @classmethod
+    async def connect(cls, path: str = None, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT):
+        if path is not None:
+            reader, writer = await asyncio.open_unix_connection(path)
+        else:
+            reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    async def _receive(self):
+        error = ConnectionError("Kết nối tới dịch vụ đã đóng")
+        try:
+            while True:
+                header = await self._reader.readexactly(_RESPONSE.size)
+                request_id, status, length = _RESPONSE.unpack(header)
+                payload = await self._reader.readexactly(length)
+                future = self._pending.pop(request_id, None)
+                if future is not None and not future.done():
+                    future.set_result((status, payload))
+        except (asyncio.IncompleteReadError, ConnectionError) as e:
+            if isinstance(e, ConnectionError):
+                error = e
+        finally:
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(error)
+            self._pending.clear()
+
+    async def request(self, op: int, payload=b"", algo_id: int = 0) -> bytes:
+        """Gửi một yêu cầu và chờ phản hồi; lỗi phía máy chủ được ném lại dưới dạng ValueError."""
+        if self._receiver.done():
+            raise ConnectionError("Kết nối tới dịch vụ đã đóng")
+        request_id = self._next_id
+        self._next_id = (self._next_id + 1) & 0xFFFFFFFF
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        self._writer.writelines((_REQUEST.pack(request_id, op, algo_id, len(payload)), payload))
+        await self._writer.drain()
+        status, result = await future
+        if status != STATUS_OK:
+            raise ValueError(result.decode("utf-8", "replace"))
+        return result
+
+    async def compress(self, data, algo: str = "huffman") -> bytes:
+        """Nén data thành container (giải nén được bằng decompress() hoặc `python -m Encoding decompress`)."""
+        if algo not in BLOCK_CODECS:
+            raise ValueError(f"Thuật toán không được hỗ trợ: {algo}")
+        return await self.request(OP_COMPRESS, data, BLOCK_CODECS[algo][0])
+
+    async def decompress(self, data) -> bytes:
+        return await self.request(OP_DECOMPRESS, data)
+
+    async def stats(self, data) -> dict:
+        return json.loads(await self.request(OP_STATS, data))
+
+    async def metrics(self) -> dict:
+        return json.loads(await self.request(OP_METRICS))
+
+    async def close(self):
+        self._writer.close()
+        try:
+            await self._writer.wait_closed()
+        except ConnectionError:
+            pass
+        await self._receiver
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+
+async def serve(path: str = None, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, **options):
+    """Chạy dịch vụ tới khi bị dừng (Ctrl+C); options được truyền cho CompressionService."""
+    service = CompressionService(**options)
+    await service.start(path, host, port)
+    print(f"Đang lắng nghe tại {service.address}", file=sys.stderr)
+    try:
+        await service.serve_forever()
+    finally:
+        await service.close()
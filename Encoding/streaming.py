@@ -0,0 +1,141 @@
+"""
+Nén / giải nén dạng luồng cho mọi thuật toán.
+
+Dữ liệu vào (file mở ở chế độ nhị phân hoặc iterator các khối bytes) được đọc một lần,
+cắt thành từng khối chunk_size byte; mỗi khối được nén độc lập với thống kê riêng
+của khối đó, nên bộ nhớ chỉ phụ thuộc vào chunk_size chứ không phụ thuộc kích thước file.
+
+Luồng nén dùng định dạng container trong Encoding.container (header, các khung có CRC32,
+chỉ mục và footer ghi ở cuối nên vẫn ghi được ra luồng không seek được như stdout).
+"""
+from Encoding.arithmeticEncoding import AdaptiveArithmeticEncoding, ArithmeticEncoding
+from Encoding.buffers import as_reader, read_exact
+from Encoding.container import HEADER_SIZE, check_block, iter_container, iter_frames, unpack_header
+from Encoding.huffmanEncoding import HuffmanEncoding
+from Encoding.lzpEncoding import LZWEncoding
+from Encoding.lzssEncoding import LZSSEncoding
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+
+# Mọi thuật toán mã hóa khối theo từng byte (khối bytes bất kỳ, kể cả UTF-8 bị cắt giữa chừng,
+# đều mã hóa được); khối có thể là memoryview trỏ vào file đã mmap, không bị sao chép.
+def _compress_huffman_block(block) -> bytes:
+    return HuffmanEncoding().encode_bytes(block)
+
+
+def _decompress_huffman_block(payload: bytes) -> bytes:
+    return HuffmanEncoding().decode_bytes(payload)
+
+
+def _compress_lzw_block(block) -> bytes:
+    encoded, _ = LZWEncoding().encode_bytes(block)
+    return encoded
+
+
+def _decompress_lzw_block(payload: bytes) -> bytes:
+    return LZWEncoding().decode_bytes(payload)
+
+
+def _compress_lzss_block(block) -> bytes:
+    return LZSSEncoding().encode_bytes(block)
+
+
+def _decompress_lzss_block(payload: bytes) -> bytes:
+    # Cửa sổ và chế độ mã hóa được đọc từ header của khối
+    return LZSSEncoding().decode_bytes(payload)
+
+
+def _compress_arithmetic_block(block) -> bytes:
+    arith = ArithmeticEncoding(block)
+    return arith.serialize_model() + arith.encode()
+
+
+def _decompress_arithmetic_block(payload: bytes) -> bytes:
+    arith, offset = ArithmeticEncoding.from_model(payload)
+    return arith.decode_bytes(memoryview(payload)[offset:], arith.length)
+
+
+def _compress_adaptive_block(block) -> bytes:
+    return AdaptiveArithmeticEncoding(order=1).encode_bytes(block)
+
+
+def _decompress_adaptive_block(payload: bytes) -> bytes:
+    # Bậc ngữ cảnh được đọc từ header của khối
+    return AdaptiveArithmeticEncoding().decode_bytes(payload)
+
+
+# Tên thuật toán -> (mã thuật toán trong header, hàm nén khối, hàm giải nén khối)
+BLOCK_CODECS = {
+    "huffman": (1, _compress_huffman_block, _decompress_huffman_block),
+    "lzw": (2, _compress_lzw_block, _decompress_lzw_block),
+    "arithmetic": (3, _compress_arithmetic_block, _decompress_arithmetic_block),
+    "adaptive": (4, _compress_adaptive_block, _decompress_adaptive_block),
+    "lzss": (5, _compress_lzss_block, _decompress_lzss_block),
+}
+
+
+def codec_by_id(algo_id: int):
+    """Tìm (tên, hàm nén, hàm giải nén) theo mã thuật toán ghi trong header."""
+    for name, (codec_id, compress_block, decompress_block) in BLOCK_CODECS.items():
+        if codec_id == algo_id:
+            return name, compress_block, decompress_block
+    raise ValueError(f"Mã thuật toán không được hỗ trợ: {algo_id}")
+
+
+def iter_blocks(source, chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """Sinh lần lượt các khối đúng chunk_size byte (khối cuối có thể ngắn hơn)."""
+    reader = as_reader(source)
+    while True:
+        block = read_exact(reader, chunk_size)
+        if not block:
+            return
+        yield block
+        if len(block) < chunk_size:
+            return
+
+
+def iter_compress(source, algo: str = "huffman", chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """Sinh các mảnh bytes của luồng nén (header, từng khung, chỉ mục và footer)."""
+    if algo not in BLOCK_CODECS:
+        raise ValueError(f"Thuật toán không được hỗ trợ: {algo}")
+    algo_id, compress_block, _ = BLOCK_CODECS[algo]
+    encoded_blocks = ((block, compress_block(block)) for block in iter_blocks(source, chunk_size))
+    yield from iter_container(algo_id, chunk_size, encoded_blocks)
+
+
+def read_container_header(reader):
+    """Đọc header container từ reader, trả về (tên, hàm nén, hàm giải nén) của thuật toán."""
+    algo_id, _ = unpack_header(read_exact(reader, HEADER_SIZE))
+    return codec_by_id(algo_id)
+
+
+def iter_decompress(source):
+    """Sinh lần lượt các khối dữ liệu gốc từ một luồng nén, kiểm tra CRC32 từng khối."""
+    reader = as_reader(source)
+    _, _, decompress_block = read_container_header(reader)
+    for block_index, frame in enumerate(iter_frames(reader)):
+        block = decompress_block(frame.payload)
+        check_block(block_index, block, frame.raw_length, frame.raw_crc)
+        yield block
+
+
+def compress_stream(reader, writer, algo: str = "huffman", chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """
+    Nén toàn bộ reader (file nhị phân hoặc iterator bytes) và ghi vào writer (có write).
+    Trả về số byte đã ghi.
+    """
+    written = 0
+    for piece in iter_compress(reader, algo, chunk_size):
+        writer.write(piece)
+        written += len(piece)
+    return written
+
+
+def decompress_stream(reader, writer) -> int:
+    """Giải nén luồng do compress_stream() tạo ra vào writer. Trả về số byte gốc đã ghi."""
+    written = 0
+    for block in iter_decompress(reader):
+        writer.write(block)
+        written += len(block)
+    return written
@@ -0,0 +1,110 @@
+"""
+Thống kê ký hiệu dùng chung cho mọi thuật toán và giao diện.
+
+Văn bản chỉ được đếm một lần: histogram tính bằng np.bincount trên mảng mã Unicode
+(hoặc mảng byte), sau đó entropy, xác suất và độ dài mã lý tưởng đều suy ra từ bảng đếm đó.
+Nếu không có NumPy hoặc dữ liệu quá ngắn thì dùng collections.Counter.
+"""
+import math
+from collections import Counter
+
+from Encoding.buffers import byte_view
+
+# Dưới ngưỡng này Counter nhanh hơn chi phí chuyển dữ liệu sang NumPy
+NUMPY_MIN_LENGTH = 4096
+# Bảng chữ cái có mã lớn nhất dưới ngưỡng này thì dùng bincount, ngược lại dùng np.unique
+BINCOUNT_MAX_SYMBOL = 1 << 16
+
+
+def optional_numpy():
+    """Nạp NumPy khi cần (để CLI khởi động nhanh); trả về None nếu chưa cài."""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def _histogram(np, values) -> tuple:
+    """Trả về (các giá trị xuất hiện, số lần xuất hiện) của mảng số nguyên không âm."""
+    if int(values.max()) < BINCOUNT_MAX_SYMBOL:
+        counts = np.bincount(values)
+        symbols = np.flatnonzero(counts)
+        return symbols, counts[symbols]
+    return np.unique(values, return_counts=True)
+
+
+def entropy_from_counts(counts) -> float:
+    """H = - sum(p * log2(p)) từ một dãy số lần xuất hiện."""
+    counts = [count for count in counts if count > 0]
+    total = sum(counts)
+    if total == 0:
+        return 0.0
+    return -sum(count / total * math.log2(count / total) for count in counts)
+
+
+class SymbolStatistics:
+    def __init__(self, counts: dict, total: int = None):
+        """
+        Args:
+            counts (dict): ký hiệu -> số lần xuất hiện.
+            total (int, optional): tổng số ký hiệu (mặc định = tổng counts).
+        """
+        self.counts = counts
+        self.total = sum(counts.values()) if total is None else total
+        self._entropy = None
+
+    @classmethod
+    def from_text(cls, text: str) -> "SymbolStatistics":
+        """Đếm ký tự (mã Unicode) của văn bản."""
+        np = optional_numpy() if len(text) >= NUMPY_MIN_LENGTH else None
+        if np is None:
+            return cls(Counter(text), len(text))
+        # surrogatepass: văn bản từ Tk (Windows) có thể chứa surrogate đơn lẻ, vẫn là một ký hiệu hợp lệ
+        code_points = np.frombuffer(text.encode("utf-32-le", "surrogatepass"), dtype="<u4")
+        symbols, counts = _histogram(np, code_points)
+        return cls({chr(symbol): int(count) for symbol, count in zip(symbols.tolist(), counts.tolist())},
+                   len(text))
+
+    @classmethod
+    def from_bytes(cls, data) -> "SymbolStatistics":
+        """Đếm byte của một đối tượng bytes-like (ký hiệu là số nguyên 0..255), không sao chép dữ liệu."""
+        data = byte_view(data)
+        np = optional_numpy() if len(data) >= NUMPY_MIN_LENGTH else None
+        if np is None:
+            return cls(Counter(data), len(data))
+        counts = np.bincount(np.frombuffer(data, dtype=np.uint8), minlength=256)
+        return cls({symbol: int(counts[symbol]) for symbol in np.flatnonzero(counts).tolist()}, len(data))
+
+    @classmethod
+    def from_tokens(cls, tokens: list) -> "SymbolStatistics":
+        """Đếm token (ký hiệu là chuỗi, xem Encoding.tokenizer)."""
+        return cls(Counter(tokens), len(tokens))
+
+    @property
+    def alphabet_size(self) -> int:
+        return len(self.counts)
+
+    @property
+    def entropy(self) -> float:
+        """Entropy Shannon bậc 0 (bits/ký hiệu), tính một lần rồi lưu lại."""
+        if self._entropy is None:
+            self._entropy = entropy_from_counts(self.counts.values())
+        return self._entropy
+
+    def probabilities(self) -> dict:
+        if self.total == 0:
+            return {}
+        return {symbol: count / self.total for symbol, count in self.counts.items()}
+
+    def ideal_code_lengths(self) -> dict:
+        """Độ dài mã lý tưởng -log2(p) (bit, số thực) của từng ký hiệu."""
+        return {symbol: -math.log2(p) for symbol, p in self.probabilities().items()}
+
+    def shannon_code_lengths(self) -> dict:
+        """Độ dài mã Shannon ceil(-log2(p)): luôn thỏa bất đẳng thức Kraft."""
+        return {symbol: max(1, math.ceil(length - 1e-12)) for symbol, length in self.ideal_code_lengths().items()}
+
+    def entropy_bound_bits(self) -> int:
+        """Giới hạn dưới (bit) cho mã hóa bậc 0 toàn bộ dữ liệu: ceil(H * tổng số ký hiệu)."""
+        return math.ceil(self.entropy * self.total)
@@ -0,0 +1,15 @@
+"""
+Tách văn bản thành token cho chế độ mã hóa theo từ (Huffman, Arithmetic).
+
+Mỗi token là một từ/âm tiết (chuỗi chữ-số liên tiếp), một cụm khoảng trắng hoặc một cụm dấu câu,
+nên nối các token lại luôn được đúng văn bản gốc. Tiếng Việt viết mỗi âm tiết cách nhau một dấu cách
+nên âm tiết lặp lại nhiều ("của", "và", "những"...) trở thành một ký hiệu duy nhất thay vì 3-6 ký tự.
+"""
+import re
+
+TOKEN_PATTERN = re.compile(r"\w+|\s+|[^\w\s]+")
+
+
+def tokenize(text: str) -> list:
+    """Danh sách token của text ("".join(tokenize(text)) == text)."""
+    return TOKEN_PATTERN.findall(text)
@@ -0,0 +1,88 @@
+"""
+Sinh dữ liệu thử nghiệm (corpus) có thể tái lập cho bộ benchmark.
+
+Mỗi corpus là một hàm nhận (kích thước byte, seed) và trả về văn bản str có độ dài
+UTF-8 đúng bằng kích thước yêu cầu (riêng corpus tiếng Việt có thể hụt vài byte
+để không cắt đôi một ký tự nhiều byte), hoặc bytes với dữ liệu nhị phân (corpus random).
+"""
+import os
+import random
+from collections import defaultdict
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+VIETNAMESE_SAMPLE = os.path.join(DATA_DIR, "vietnamese.txt")
+
+
+def _fit_utf8(text: str, size: int) -> str:
+    """Cắt text để độ dài UTF-8 không vượt quá size (không cắt giữa một ký tự)."""
+    return text.encode("utf-8")[:size].decode("utf-8", errors="ignore")
+
+
+def vietnamese_text(size: int, seed: int = 0) -> str:
+    """
+    Văn bản tiếng Việt sinh bằng chuỗi Markov bậc 1 trên từ, học từ file mẫu đi kèm,
+    nên có phân bố ký tự/âm tiết giống văn bản thật nhưng không lặp nguyên câu.
+    """
+    with open(VIETNAMESE_SAMPLE, encoding="utf-8") as sample:
+        sentences = [line.split() for line in sample if line.strip()]
+
+    followers = defaultdict(list)
+    for words in sentences:
+        for current, following in zip(words, words[1:]):
+            followers[current].append(following)
+    starts = [words[0] for words in sentences]
+
+    rng = random.Random(seed)
+    parts = []
+    produced = 0
+    while produced < size:
+        word = rng.choice(starts)
+        sentence = [word]
+        while word in followers and len(sentence) < 40:
+            word = rng.choice(followers[word])
+            sentence.append(word)
+        line = " ".join(sentence) + "\n"
+        parts.append(line)
+        produced += len(line.encode("utf-8"))
+    return _fit_utf8("".join(parts), size)
+
+
+def random_bytes(size: int, seed: int = 0) -> bytes:
+    """Byte ngẫu nhiên đều (không nén được), được đo qua API encode_bytes/decode_bytes của các thuật toán."""
+    return random.Random(seed).randbytes(size)
+
+
+def repetitive_logs(size: int, seed: int = 0) -> str:
+    """Log máy chủ có cấu trúc lặp lại nhiều, chỉ khác thời gian, id và vài trường số."""
+    rng = random.Random(seed)
+    levels = ["INFO", "INFO", "INFO", "DEBUG", "WARN", "ERROR"]
+    paths = ["/api/v1/users", "/api/v1/orders", "/api/v1/items", "/health", "/login"]
+    statuses = [200, 200, 200, 201, 204, 304, 404, 500]
+    parts = []
+    produced = 0
+    second = 0
+    while produced < size:
+        second += rng.randint(0, 2)
+        line = (
+            f"2026-01-01T{second // 3600 % 24:02d}:{second // 60 % 60:02d}:{second % 60:02d}Z "
+            f"{rng.choice(levels)} [worker-{rng.randint(1, 8)}] "
+            f"request_id={rng.getrandbits(32):08x} path={rng.choice(paths)} "
+            f"status={rng.choice(statuses)} latency_ms={rng.randint(1, 250)}\n"
+        )
+        parts.append(line)
+        produced += len(line)
+    return "".join(parts)[:size]
+
+
+CORPORA = {
+    "vietnamese": vietnamese_text,
+    "random": random_bytes,
+    "logs": repetitive_logs,
+}
+
+
+def format_size(size: int) -> str:
+    for unit, factor in (("G", 1 << 30), ("M", 1 << 20), ("K", 1 << 10)):
+        if size >= factor and size % factor == 0:
+            return f"{size // factor}{unit}"
+    return str(size)
@@ -0,0 +1,253 @@
+"""
+Bộ benchmark có thể tái lập cho các thuật toán nén trong Encoding/.
+
+Ví dụ:
+    python -m benchmarks
+    python -m benchmarks --corpus vietnamese,logs --sizes 1K,1M,100M --codecs huffman,lzw
+    python -m benchmarks --json results.json
+
+Với mỗi (corpus, kích thước, thuật toán) đo: tốc độ mã hóa/giải mã (MB/s theo byte UTF-8),
+bộ nhớ đỉnh (tracemalloc), số bit sau nén so với giới hạn entropy và kiểm tra giải mã đúng.
+Corpus nhị phân (bytes) đi qua API theo byte (BYTE_CODECS) và ký hiệu là byte; thuật toán
+chỉ có chế độ văn bản (mã hóa theo token) được bỏ qua với các corpus này.
+"""
+import argparse
+import json
+import math
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+from Encoding.arithmeticEncoding import AdaptiveArithmeticEncoding, ArithmeticEncoding
+from Encoding.cli import parse_size
+from Encoding.huffmanEncoding import HuffmanEncoding
+from Encoding.lzpEncoding import LZWEncoding
+from Encoding.lzssEncoding import LZSSEncoding
+from Encoding.streaming import BLOCK_CODECS
+from Encoding.symbolStatistics import SymbolStatistics
+
+from benchmarks.corpus import CORPORA, format_size
+
+DEFAULT_SIZES = "1K,64K,1M"
+DEFAULT_REPEAT = 3
+
+
+# Mỗi thuật toán: encode(text) -> bytes tự chứa đủ thông tin để decode(payload) -> text
+def _encode_huffman(text: str) -> bytes:
+    return HuffmanEncoding().encode(text)
+
+
+def _decode_huffman(payload: bytes) -> str:
+    return HuffmanEncoding().decode(payload)
+
+
+def _encode_huffman_tokens(text: str) -> bytes:
+    return HuffmanEncoding(tokenize=True).encode(text)
+
+
+def _encode_lzw(text: str) -> bytes:
+    encoded, _ = LZWEncoding().encode(text)
+    return encoded
+
+
+def _decode_lzw(payload: bytes) -> str:
+    return LZWEncoding().decode(payload)
+
+
+def _encode_lzss(text: str) -> bytes:
+    return LZSSEncoding().encode(text)
+
+
+def _encode_lzss_fast(text: str) -> bytes:
+    return LZSSEncoding(level=1).encode(text)
+
+
+def _encode_lzss_best(text: str) -> bytes:
+    return LZSSEncoding(level=9).encode(text)
+
+
+def _decode_lzss(payload: bytes) -> str:
+    return LZSSEncoding().decode(payload)
+
+
+def _encode_arithmetic(text: str) -> bytes:
+    arith = ArithmeticEncoding(text)
+    return arith.serialize_model() + arith.encode()
+
+
+def _decode_arithmetic(payload: bytes) -> str:
+    arith, offset = ArithmeticEncoding.from_model(payload)
+    return arith.decode(payload[offset:], arith.length)
+
+
+def _encode_arithmetic_tokens(text: str) -> bytes:
+    arith = ArithmeticEncoding(text, tokenize=True)
+    return arith.serialize_model() + arith.encode()
+
+
+def _encode_adaptive(text: str) -> bytes:
+    return AdaptiveArithmeticEncoding(order=1).encode(text)
+
+
+def _decode_adaptive(payload: bytes) -> str:
+    return AdaptiveArithmeticEncoding().decode(payload)
+
+
+CODECS = {
+    "huffman": (_encode_huffman, _decode_huffman),
+    "lzw": (_encode_lzw, _decode_lzw),
+    "arithmetic": (_encode_arithmetic, _decode_arithmetic),
+    "adaptive": (_encode_adaptive, _decode_adaptive),
+    "lzss": (_encode_lzss, _decode_lzss),
+    # Các mức nén của LZSS: nhanh nhất / nén tốt nhất
+    "lzss-fast": (_encode_lzss_fast, _decode_lzss),
+    "lzss-best": (_encode_lzss_best, _decode_lzss),
+    # Mã hóa theo token (từ/âm tiết); gói dữ liệu tự ghi chế độ nên dùng chung hàm giải mã
+    "huffman-tokens": (_encode_huffman_tokens, _decode_huffman),
+    "arithmetic-tokens": (_encode_arithmetic_tokens, _decode_arithmetic),
+}
+
+# Cùng các thuật toán trên dữ liệu bytes: dùng lại hàm nén/giải nén khối của container
+BYTE_CODECS = {name: (compress_block, decompress_block)
+               for name, (_, compress_block, decompress_block) in BLOCK_CODECS.items() if name in CODECS}
+BYTE_CODECS["lzss-fast"] = (LZSSEncoding(level=1).encode_bytes, BYTE_CODECS["lzss"][1])
+BYTE_CODECS["lzss-best"] = (LZSSEncoding(level=9).encode_bytes, BYTE_CODECS["lzss"][1])
+
+
+def _timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def _peak_memory(encode, decode, text: str) -> int:
+    """Bộ nhớ đỉnh (byte) của một lượt mã hóa + giải mã, đo riêng để không làm sai thời gian."""
+    tracemalloc.start()
+    try:
+        decode(encode(text))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def bench_one(codec: str, text: str, repeat: int = DEFAULT_REPEAT, measure_memory: bool = True) -> dict:
+    """
+    Đo một thuật toán trên một văn bản (str) hoặc dữ liệu nhị phân (bytes). Lượt đầu không tính giờ (nạp NumPy, bảng tra... chỉ
+    xảy ra một lần), sau đó lấy trung vị thời gian của repeat lượt.
+    """
+    binary = isinstance(text, bytes)
+    encode, decode = (BYTE_CODECS if binary else CODECS)[codec]
+    input_bytes = len(text) if binary else len(text.encode("utf-8"))
+    payload = encode(text)
+    round_trip = decode(payload) == text
+    encode_times = []
+    decode_times = []
+    for _ in range(max(repeat, 1)):
+        payload, elapsed = _timed(encode, text)
+        encode_times.append(elapsed)
+        decoded, elapsed = _timed(decode, payload)
+        decode_times.append(elapsed)
+        round_trip = round_trip and decoded == text
+    encode_time = statistics.median(encode_times)
+    decode_time = statistics.median(decode_times)
+
+    stats = SymbolStatistics.from_bytes(text) if binary else SymbolStatistics.from_text(text)
+    compressed_bits = len(payload) * 8
+    mb = input_bytes / 1e6
+    return {
+        "codec": codec,
+        "input_bytes": input_bytes,
+        "symbols": len(text),
+        "compressed_bytes": len(payload),
+        "compressed_bits": compressed_bits,
+        "bits_per_symbol": compressed_bits / len(text) if text else 0.0,
+        "entropy_bits_per_symbol": stats.entropy,
+        "entropy_bound_bits": stats.entropy_bound_bits(),
+        "ratio": input_bytes / len(payload) if payload else 0.0,
+        "encode_seconds": encode_time,
+        "decode_seconds": decode_time,
+        "encode_mb_per_s": mb / encode_time if encode_time else math.inf,
+        "decode_mb_per_s": mb / decode_time if decode_time else math.inf,
+        "peak_memory_bytes": _peak_memory(encode, decode, text) if measure_memory else None,
+        "round_trip": round_trip,
+    }
+
+
+def run(corpora, sizes, codecs, repeat: int = DEFAULT_REPEAT, seed: int = 0, measure_memory: bool = True, log=None):
+    results = []
+    for corpus in corpora:
+        for size in sizes:
+            text = CORPORA[corpus](size, seed)
+            for codec in codecs:
+                if isinstance(text, bytes) and codec not in BYTE_CODECS:
+                    continue
+                result = bench_one(codec, text, repeat, measure_memory)
+                result.update(corpus=corpus, size=format_size(size))
+                results.append(result)
+                if log:
+                    log(result)
+    return results
+
+
+def _format_row(result: dict) -> str:
+    memory = result["peak_memory_bytes"]
+    memory_text = f"{memory / 1e6:9.2f}" if memory is not None else f"{'-':>9}"
+    return (
+        f"{result['corpus']:<11}{result['size']:>6} {result['codec']:<18}"
+        f"{result['ratio']:7.3f} {result['bits_per_symbol']:8.3f} {result['entropy_bits_per_symbol']:8.3f} "
+        f"{result['encode_mb_per_s']:9.3f} {result['decode_mb_per_s']:9.3f} {memory_text} "
+        f"{'OK' if result['round_trip'] else 'FAIL'}"
+    )
+
+
+def _split(value: str) -> list:
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Benchmark các thuật toán nén")
+    parser.add_argument("--corpus", default=",".join(CORPORA), help=f"danh sách corpus ({', '.join(CORPORA)})")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="kích thước, ví dụ 1K,64K,1M,100M")
+    parser.add_argument("--codecs", default=",".join(CODECS), help=f"danh sách thuật toán ({', '.join(CODECS)})")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT,
+                        help="số lần đo (sau một lượt khởi động không tính giờ), lấy trung vị")
+    parser.add_argument("--seed", type=int, default=0, help="seed sinh dữ liệu")
+    parser.add_argument("--no-memory", action="store_true", help="bỏ qua đo bộ nhớ đỉnh (nhanh hơn)")
+    parser.add_argument("--json", metavar="PATH", help="ghi kết quả dạng JSON ('-' = stdout)")
+    args = parser.parse_args(argv)
+
+    corpora, codecs = _split(args.corpus), _split(args.codecs)
+    for name in corpora:
+        if name not in CORPORA:
+            parser.error(f"corpus không hợp lệ: {name}")
+    for name in codecs:
+        if name not in CODECS:
+            parser.error(f"thuật toán không hợp lệ: {name}")
+    sizes = [parse_size(size) for size in _split(args.sizes)]
+
+    # Khi JSON ra stdout thì bảng kết quả chuyển sang stderr
+    table = sys.stderr if args.json == "-" else sys.stdout
+    print(f"{'corpus':<11}{'size':>6} {'codec':<18}{'ratio':>7} {'bits/sym':>8} {'H0':>8} "
+          f"{'enc MB/s':>9} {'dec MB/s':>9} {'peak MB':>9} check", file=table)
+    results = run(corpora, sizes, codecs, args.repeat, args.seed, not args.no_memory,
+                  log=lambda result: print(_format_row(result), file=table, flush=True))
+
+    if args.json:
+        report = {
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "repeat": args.repeat,
+            "results": results,
+        }
+        if args.json == "-":
+            json.dump(report, sys.stdout, indent=2)
+            sys.stdout.write("\n")
+        else:
+            with open(args.json, "w", encoding="utf-8") as output:
+                json.dump(report, output, indent=2)
+
+    return 0 if all(result["round_trip"] for result in results) else 1
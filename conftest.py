@@ -0,0 +1 @@
+"""Cho phép các test trong tests/ import Encoding và benchmarks từ thư mục gốc của dự án."""
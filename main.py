@@ -1,17 +1,21 @@
-from Encoding.huffmanEncoding import HuffmanEncoding
-from Encoding.arithmeticEncoding import ArithmeticEncoding
-from Encoding.lzpEncoding import LZWEncoding
+from Encoding.analysis import ALGORITHMS, DEFAULT_MAX_CHARS, DEFAULT_TIME_BUDGET, AnalysisJob, CompareJob
+from Encoding.cache import ResultCache, content_hash
+from Encoding.profiling import Profiler, format_report, write_cprofile
 import tkinter as tk
-from tkinter import ttk, scrolledtext, messagebox
+from tkinter import ttk, scrolledtext, messagebox, filedialog
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import numpy as np
 
+# Chu kỳ hỏi tiến độ của job (ms) và số ký tự giải mã tối đa hiển thị trong ô kết quả
+POLL_INTERVAL_MS = 50
+OUTPUT_PREVIEW_CHARS = 100_000
+
 class CompressionApp:
     def __init__(self, root):
         self.root = root
         self.root.title("BTL - LÝ THUYẾT THÔNG TIN")
-        self.root.geometry("650x450")
+        self.root.geometry("940x520")
         
         # Style configuration
         style = ttk.Style()
@@ -38,13 +42,37 @@ class CompressionApp:
         rb_huffman = ttk.Radiobutton(control_frame, text="Mã Huffman", variable=self.algo_var, value="huffman")
         rb_lzp = ttk.Radiobutton(control_frame, text="Mã LZW (LZP)", variable=self.algo_var, value="lzw")
         rb_arith = ttk.Radiobutton(control_frame, text="Mã Arithmetic", variable=self.algo_var, value="arithmetic")
+        rb_lzss = ttk.Radiobutton(control_frame, text="Mã LZSS (LZ77)", variable=self.algo_var, value="lzss")
         
         rb_huffman.pack(side="left", padx=10)
         rb_lzp.pack(side="left", padx=10)
         rb_arith.pack(side="left", padx=10)
+        rb_lzss.pack(side="left", padx=10)
+
+        # Huffman/Arithmetic mã hóa theo từ (token) thay vì từng ký tự
+        self.tokens_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(control_frame, text="Theo từ", variable=self.tokens_var).pack(side="left", padx=10)
+        # Đo chi tiết (từng bước, bộ đếm, tracemalloc, cProfile) cho bảng chẩn đoán; chạy chậm hơn
+        self.profile_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(control_frame, text="Đo chi tiết", variable=self.profile_var).pack(side="left")
+
+        self.btn_cancel = ttk.Button(control_frame, text="Hủy", command=self.cancel_job, state='disabled')
+        self.btn_cancel.pack(side="right")
+
+        self.btn_compare = ttk.Button(control_frame, text="So sánh tất cả", command=self.compare_all)
+        self.btn_compare.pack(side="right")
 
-        btn_process = ttk.Button(control_frame, text="THỰC HIỆN MÃ HÓA", command=self.process_text)
-        btn_process.pack(side="right", padx=10)
+        self.btn_process = ttk.Button(control_frame, text="THỰC HIỆN MÃ HÓA", command=self.process_text)
+        self.btn_process.pack(side="right", padx=10)
+
+        # Tiến độ của job đang chạy trong tiến trình nền
+        progress_frame = ttk.Frame(root, padding=(10, 0))
+        progress_frame.pack(fill="x", padx=10)
+
+        self.progress = ttk.Progressbar(progress_frame, maximum=1.0, mode="determinate")
+        self.progress.pack(side="left", fill="x", expand=True)
+        self.lbl_status = ttk.Label(progress_frame, text="Sẵn sàng", width=28)
+        self.lbl_status.pack(side="left", padx=10)
 
         # --- 3. Khu vực hiển thị kết quả (Dashboard) ---
         result_frame = ttk.LabelFrame(root, text="Kết quả Thống kê và Kết luận", padding=(10, 10))
@@ -76,11 +104,24 @@ class CompressionApp:
 
         self.btn_visualize = ttk.Button(result_frame, text="Xem Biểu đồ", command=self.show_chart, state='disabled')
         self.btn_visualize.grid(row=2, column=3, sticky="e", padx=20, pady=15)
+
+        self.btn_diagnostics = ttk.Button(result_frame, text="Chẩn đoán", command=self.show_diagnostics)
+        self.btn_diagnostics.grid(row=3, column=3, sticky="e", padx=20)
         
         # Data storage for visualization
         self.entropy_val = 0.0
         self.avg_len_val = 0.0
         self.algo_name = ""
+        self.job = None
+        self.job_phase = ""
+        self.on_job_done = None
+        # Kết quả đã tính theo (nội dung, thuật toán): chạy lại cùng văn bản thì hiện ngay
+        self.cache = ResultCache()
+        self.time_budget = DEFAULT_TIME_BUDGET
+        self.max_chars = DEFAULT_MAX_CHARS
+        # Thời gian các bước của giao diện (hiển thị kết quả, vẽ biểu đồ) và báo cáo đo chi tiết gần nhất
+        self.ui_profiler = Profiler(trace_memory=False)
+        self.last_profile = None
         
         # --- 4. Khu vực giải mã ---
         decode_frame = ttk.LabelFrame(root, text="Kết quả giải mã", padding=(10, 5))
@@ -89,48 +130,145 @@ class CompressionApp:
         self.txt_output = scrolledtext.ScrolledText(decode_frame, height=3, state='disabled', font=("Arial", 10), background="#f0f0f0")
         self.txt_output.pack(fill="both", expand=True)
 
-    def process_text(self):
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+
+    def _read_input(self):
+        """Lấy văn bản cần xử lý; trả về None (kèm cảnh báo) nếu không hợp lệ hoặc đang có job chạy."""
+        if self.job is not None and self.job.running:
+            return None
         text = self.txt_input.get("1.0", tk.END).strip()
         if not text:
             messagebox.showwarning("Cảnh báo", "Vui lòng nhập văn bản trước khi mã hóa!")
-            return
+            return None
+        if len(text) > self.max_chars:
+            messagebox.showwarning("Cảnh báo", f"Văn bản quá dài ({len(text)} ký tự), giới hạn là {self.max_chars} ký tự.")
+            return None
+        return text
+
+    def _remember_result(self, digest: str, result: dict):
+        # Chỉ lưu kết quả giải mã đúng; văn bản giải mã khi đó chính là văn bản gốc nên không cần lưu
+        if result["verified"]:
+            key = ResultCache.make_key(digest, result["algo"], tokens=result["tokens"])
+            self.cache.put(key, dict(result, decoded_text=None, profile=None))
 
+    def _cached_result(self, digest: str, algo: str):
+        tokens = self.tokens_var.get() and algo not in ("lzw", "lzss")
+        return self.cache.get(ResultCache.make_key(digest, algo, tokens=tokens))
+
+    def process_text(self):
+        text = self._read_input()
+        if text is None:
+            return
         algo = self.algo_var.get()
-        
-        try:
-            length_orig = len(text)
-            entropy = 0.0
-            avg_len = 0.0
-            decoded_text = ""
-
-            if algo == "huffman":
-                huff = HuffmanEncoding()
-                encoded_str = huff.encode(text)
-                entropy = huff.calculate_entropy(text)
-                avg_len = huff.average_code_length()
-                total_bits_encoded = len(encoded_str)
-                decoded_text = huff.decode(encoded_str)
-
-            elif algo == "lzw":
-                lzw = LZWEncoding()
-                entropy = lzw.calculate_entropy(text)
-                codes, total_bits_encoded = lzw.encode(text)
-                avg_len = lzw.calculate_average_code_length(text, total_bits_encoded)
-                decoded_text = lzw.decode(codes)
-
-            elif algo == "arithmetic":
-                arith = ArithmeticEncoding(text)
-                entropy = arith.calculate_entropy()
-                low, high, p_s = arith.encode()
-                total_bits_encoded = arith.calculate_total_length_formula(p_s)
-                avg_len = arith.calculate_average_length(total_bits_encoded)
-                decoded_text = arith.decode(low, len(text))
+        digest = content_hash(text)
+        profile = self.profile_var.get()
+        # Khi đo chi tiết thì luôn chạy lại để có số liệu mới
+        cached = None if profile else self._cached_result(digest, algo)
+        if cached is not None:
+            self.lbl_status.config(text="Lấy từ bộ nhớ đệm")
+            self.progress.config(value=1.0)
+            self.show_result(dict(cached, decoded_text=text))
+            return
+
+        def on_done(result):
+            self._remember_result(digest, result)
+            self.show_result(result)
+
+        # Mã hóa/giải mã chạy trong tiến trình nền, giao diện chỉ hỏi tiến độ định kỳ
+        stats = self.cache.get(ResultCache.make_key(digest, "stats"))
+        self._start_job(AnalysisJob(text, algo, self.time_budget, stats, tokens=self.tokens_var.get(), profile=profile),
+                        on_done)
+
+    def compare_all(self):
+        text = self._read_input()
+        if text is None:
+            return
+        digest = content_hash(text)
+        results = {algo: self._cached_result(digest, algo) for algo in ALGORITHMS}
+        missing = [algo for algo, result in results.items() if result is None]
+        if not missing:
+            self.lbl_status.config(text="Lấy từ bộ nhớ đệm")
+            self.progress.config(value=1.0)
+            self.show_comparison(results)
+            return
+
+        # Các thuật toán còn thiếu chạy song song trên cùng thống kê ký tự; chưa có trong cache thì
+        # CompareJob đếm trong tiến trình con (không làm đứng giao diện) rồi lưu lại khi xong
+        stats_key = ResultCache.make_key(digest, "stats")
+        stats = self.cache.get(stats_key)
+        job = CompareJob(text, missing, self.time_budget, stats, self.tokens_var.get())
+
+        def on_done(new_results):
+            if stats is None:
+                self.cache.put(stats_key, job.stats)
+            for result in new_results.values():
+                self._remember_result(digest, result)
+            results.update(new_results)
+            self.show_comparison(results)
+
+        self._start_job(job, on_done)
 
+    def _start_job(self, job, on_done):
+        self.job = job.start()
+        self.on_job_done = on_done
+        self.btn_process.config(state='disabled')
+        self.btn_compare.config(state='disabled')
+        self.btn_cancel.config(state='normal')
+        self.job_phase = "Đang khởi động"
+        self.progress.config(value=0.0)
+        self.root.after(POLL_INTERVAL_MS, self._poll_job, self.job)
+
+    def _poll_job(self, job):
+        # Job cũ (đã hủy và bị thay bằng job mới) thì dừng vòng hỏi của nó
+        if job is not self.job:
+            return
+        for message in job.poll():
+            if message[0] == "progress":
+                _, self.job_phase, fraction = message
+                self.progress.config(value=fraction)
+            elif message[0] == "done":
+                self._finish_job(f"Hoàn tất trong {job.elapsed:.2f}s")
+                with self.ui_profiler.phase("Giao diện: hiển thị kết quả"):
+                    self.on_job_done(message[1])
+            else:
+                self._finish_job("Lỗi")
+                messagebox.showerror("Lỗi", f"Có lỗi xảy ra trong quá trình tính toán:\n{message[1]}")
+        if job.running:
+            self.lbl_status.config(text=f"{self.job_phase}... ({job.elapsed:.1f}s)")
+            self.root.after(POLL_INTERVAL_MS, self._poll_job, job)
+
+    def _finish_job(self, status: str):
+        self.btn_process.config(state='normal')
+        self.btn_compare.config(state='normal')
+        self.btn_cancel.config(state='disabled')
+        self.lbl_status.config(text=status)
+
+    def cancel_job(self):
+        if self.job is not None and self.job.running:
+            self.job.cancel()
+            self.progress.config(value=0.0)
+            self._finish_job("Đã hủy")
+
+    def on_close(self):
+        self.cancel_job()
+        self.root.destroy()
+
+    def show_result(self, result: dict):
+        length_orig = result["length_orig"]
+        entropy = result["entropy"]
+        avg_len = result["avg_len"]
+        total_bits_encoded = result["total_bits"]
+        decoded_text = result["decoded_text"]
+        if result.get("profile") is not None:
+            self.last_profile = result["profile"]
+
+        try:
             # Update UI
             self.lbl_len_orig.config(text=f"{length_orig} ký tự")
             self.lbl_entropy.config(text=f"{entropy:.4f} bits/kh")
             self.lbl_avg_len.config(text=f"{avg_len:.4f} bits/kh")
-            self.lbl_total_bits.config(text=f"{total_bits_encoded} bits")
+            # Tổng số bit gồm cả header/bảng mã/mô hình (phần này ghi riêng trong ngoặc)
+            self.lbl_total_bits.config(text=f"{total_bits_encoded} bits (header/mô hình: {result['overhead_bits']})")
             
             conclusion_msg = ""
             epsilon = 0.000001 # Sai số cho phép khi so sánh số thực
@@ -143,28 +281,43 @@ class CompressionApp:
                 else:
                     conclusion_msg = (f"Độ dài mã trung bình ({avg_len:.2f}) > Entropy ({entropy:.2f}).")
                     self.lbl_conclusion.config(foreground="blue")
+            elif result["tokens"]:
+                # Entropy bậc 0 tính theo ký tự; mã theo từ khai thác được sự lặp lại của cả từ nên có thể thấp hơn
+                conclusion_msg = (f"L_avg ({avg_len:.2f}) < Entropy ký tự ({entropy:.2f}) nhờ mã hóa theo từ.")
+                self.lbl_conclusion.config(foreground="green")
             else:
                 conclusion_msg = (f"L_avg ({avg_len:.2f}) < Entropy ({entropy:.2f}).")
                 self.lbl_conclusion.config(foreground="red")
             
+            if not result["verified"]:
+                conclusion_msg += " Cảnh báo: văn bản giải mã KHÔNG khớp với bản gốc!"
+                self.lbl_conclusion.config(foreground="red")
             self.lbl_conclusion.config(text=conclusion_msg)
 
             # Store for visualization
             self.entropy_val = entropy
             self.avg_len_val = avg_len
-            self.algo_name = self.algo_var.get()
+            self.algo_name = result["algo"]
             self.btn_visualize.config(state='normal')
 
             # Show decoded text
             self.txt_output.config(state='normal')
             self.txt_output.delete("1.0", tk.END)
+            # Văn bản rất dài chỉ hiển thị phần đầu để ô kết quả không làm treo giao diện
+            if len(decoded_text) > OUTPUT_PREVIEW_CHARS:
+                decoded_text = decoded_text[:OUTPUT_PREVIEW_CHARS] + f"\n... (còn {len(decoded_text) - OUTPUT_PREVIEW_CHARS} ký tự)"
             self.txt_output.insert(tk.END, decoded_text)
             self.txt_output.config(state='disabled')
 
         except Exception as e:
-            messagebox.showerror("Lỗi", f"Có lỗi xảy ra trong quá trình tính toán:\n{str(e)}")
+            messagebox.showerror("Lỗi", f"Có lỗi xảy ra khi hiển thị kết quả:\n{str(e)}")
 
     def show_chart(self):
+        # Đo thời gian dựng biểu đồ matplotlib cho bảng chẩn đoán
+        with self.ui_profiler.phase("Giao diện: show_chart (matplotlib)"):
+            self._draw_chart()
+
+    def _draw_chart(self):
         if self.entropy_val == 0 and self.avg_len_val == 0:
             return
 
@@ -190,7 +343,7 @@ class CompressionApp:
                     ha='center', va='bottom', fontsize=11, fontweight='bold')
 
         ax.set_ylabel('Bits per symbol')
-        algo_display = "Huffman" if self.algo_name == "huffman" else ("LZW" if self.algo_name == "lzw" else "Arithmetic")
+        algo_display = {"huffman": "Huffman", "lzw": "LZW", "lzss": "LZSS"}.get(self.algo_name, "Arithmetic")
         ax.set_title(f'So sánh Entropy vs Avg Code Length ({algo_display})')
         
         # Add Entropy reference line
@@ -202,6 +355,83 @@ class CompressionApp:
         canvas.draw()
         canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
 
+    def show_diagnostics(self):
+        """Bảng chẩn đoán: số liệu đo chi tiết của lần chạy gần nhất và thời gian các bước của giao diện."""
+        window = tk.Toplevel(self.root)
+        window.title("Chẩn đoán hiệu năng")
+        window.geometry("760x560")
+
+        if self.last_profile is None:
+            run_text = "Chưa có số liệu: tích \"Đo chi tiết\" rồi thực hiện mã hóa."
+        else:
+            run_text = format_report(self.last_profile)
+        ui_text = format_report(self.ui_profiler.report())
+
+        output = scrolledtext.ScrolledText(window, font=("Consolas", 9), wrap="none")
+        output.insert(tk.END, f"=== Lần chạy gần nhất ===\n{run_text}\n\n=== Giao diện ===\n{ui_text}\n")
+        output.config(state='disabled')
+        output.pack(fill="both", expand=True, padx=10, pady=5)
+
+        state = 'normal' if self.last_profile is not None and self.last_profile.get("cprofile") else 'disabled'
+        ttk.Button(window, text="Lưu cProfile (.prof)", command=self.save_cprofile, state=state).pack(anchor="e", padx=10, pady=5)
+
+    def save_cprofile(self):
+        path = filedialog.asksaveasfilename(defaultextension=".prof", filetypes=[("cProfile", "*.prof")])
+        if not path:
+            return
+        try:
+            write_cprofile(self.last_profile, path)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Lỗi", f"Không ghi được file:\n{e}")
+
+    def show_comparison(self, results: dict):
+        """Bảng + biểu đồ so sánh các thuật toán trên cùng văn bản."""
+        entropy = next(iter(results.values()))["entropy"]
+        names = {"huffman": "Huffman", "lzw": "LZW", "arithmetic": "Arithmetic", "lzss": "LZSS"}
+
+        compare_window = tk.Toplevel(self.root)
+        compare_window.title("So sánh các thuật toán")
+        compare_window.geometry("820x600")
+
+        ttk.Label(compare_window, text=f"Entropy: {entropy:.4f} bits/kh", style="Bold.TLabel").pack(anchor="w", padx=10, pady=5)
+
+        columns = ("algo", "avg_len", "total_bits", "overhead_bits", "encode", "decode", "memory", "verified")
+        headings = ("Thuật toán", "Bits/kh", "Tổng số bit", "Header/mô hình (bit)", "Mã hóa (s)", "Giải mã (s)",
+                    "Bộ nhớ đỉnh (MB)", "Giải mã đúng")
+        table = ttk.Treeview(compare_window, columns=columns, show="headings", height=len(results))
+        for column, heading in zip(columns, headings):
+            table.heading(column, text=heading)
+            table.column(column, width=95, anchor="center")
+        for algo, result in results.items():
+            memory = result["peak_memory_bytes"]
+            table.insert("", tk.END, values=(
+                names.get(algo, algo),
+                f"{result['avg_len']:.4f}",
+                result["total_bits"],
+                result["overhead_bits"],
+                f"{result['encode_seconds']:.3f}",
+                f"{result['decode_seconds']:.3f}",
+                "-" if memory is None else f"{memory / 1e6:.1f}",
+                "Có" if result["verified"] else "KHÔNG",
+            ))
+        table.pack(fill="x", padx=10)
+
+        fig, ax = plt.subplots(figsize=(6, 4))
+        bars = ax.bar([names.get(algo, algo) for algo in results], [result["avg_len"] for result in results.values()],
+                      color=['#1f77b4', '#ff7f0e', '#2ca02c', '#9467bd'][:len(results)], width=0.5)
+        for bar in bars:
+            height = bar.get_height()
+            ax.text(bar.get_x() + bar.get_width()/2., height, f'{height:.4f}',
+                    ha='center', va='bottom', fontsize=10, fontweight='bold')
+        ax.axhline(y=entropy, color='r', linestyle='--', alpha=0.5, label='Entropy Limit')
+        ax.set_ylabel('Bits per symbol')
+        ax.set_title('So sánh độ dài mã trung bình với Entropy')
+        ax.legend()
+
+        canvas = FigureCanvasTkAgg(fig, master=compare_window)
+        canvas.draw()
+        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+
 
 
 if __name__ == "__main__":
@@ -0,0 +1,19 @@
+"""analyze(): kết quả dùng cho giao diện (không cần tkinter)."""
+import pytest
+
+from Encoding.analysis import ALGORITHMS, analyze
+
+TEXT = "Phân tích nén văn bản tiếng Việt cho bảng so sánh. " * 200
+
+
+@pytest.mark.parametrize("algo", ALGORITHMS)
+def test_peak_memory_is_measured_on_every_run(algo):
+    # Lần chạy thứ hai trong cùng tiến trình vẫn phải đo được bộ nhớ đỉnh của riêng nó
+    for _ in range(2):
+        result = analyze(TEXT, algo, measure_memory=True)
+        assert result["verified"]
+        assert result["peak_memory_bytes"] > len(TEXT)
+
+
+def test_peak_memory_is_optional():
+    assert analyze(TEXT, "huffman")["peak_memory_bytes"] is None
@@ -0,0 +1,58 @@
+"""Mã hóa số học tĩnh và thích nghi: mã hóa rồi giải mã phải cho lại đúng dữ liệu gốc."""
+import random
+
+import pytest
+
+from Encoding.arithmeticEncoding import MAX_ADAPTIVE_CONTEXTS, AdaptiveArithmeticEncoding, ArithmeticEncoding
+
+VIETNAMESE = "Mã hóa số học tĩnh lưu bảng tần suất kèm dữ liệu nén: ắ ằ ẳ ẵ ặ ơ ư đ 😀"
+
+
+@pytest.mark.parametrize("order", [0, 1, 2])
+@pytest.mark.parametrize("text", [
+    "\ud83d",
+    "a\ud83db\udc00" * 3,
+    "\udc00Tiếng Việt " * 500,
+])
+def test_adaptive_round_trip_lone_surrogates(order, text):
+    assert AdaptiveArithmeticEncoding().decode(AdaptiveArithmeticEncoding(order=order).encode(text)) == text
+
+
+def test_adaptive_order2_caps_context_tables():
+    # Byte ngẫu nhiên sinh ra hơn 10 000 ngữ cảnh bậc 2 khác nhau
+    data = random.Random(0).randbytes(20_000)
+    coder = AdaptiveArithmeticEncoding(order=2)
+    encoded = coder.encode_bytes(data)
+    assert coder.contexts == MAX_ADAPTIVE_CONTEXTS
+    assert AdaptiveArithmeticEncoding().decode_bytes(encoded) == data
+
+
+@pytest.mark.parametrize("tokenize", [False, True])
+def test_model_round_trip(tokenize):
+    text = VIETNAMESE * 40
+    arith = ArithmeticEncoding(text, tokenize=tokenize)
+    payload = arith.serialize_model() + arith.encode()
+    restored, offset = ArithmeticEncoding.from_model(payload)
+    assert restored.frequencies == arith.frequencies
+    assert restored.length == arith.length
+    assert restored.decode(payload[offset:], restored.length) == text
+
+
+def test_model_round_trip_bytes():
+    data = random.Random(1).randbytes(1024)
+    arith = ArithmeticEncoding(data)
+    payload = arith.serialize_model() + arith.encode()
+    restored, offset = ArithmeticEncoding.from_model(payload)
+    assert restored.decode_bytes(payload[offset:], restored.length) == data
+
+
+def test_model_is_compact():
+    arith = ArithmeticEncoding(VIETNAMESE * 1000)
+    # Khoảng cách mã và tần suất dạng varint: vài byte mỗi ký hiệu thay vì 12 byte cố định
+    assert len(arith.serialize_model()) <= 2 + 5 * len(arith.frequencies)
+
+
+def test_truncated_model_is_rejected():
+    model = ArithmeticEncoding(VIETNAMESE).serialize_model()
+    with pytest.raises(ValueError):
+        ArithmeticEncoding.from_model(model[:-1])
@@ -0,0 +1,43 @@
+"""Bộ nhớ đệm kết quả: giới hạn trên đĩa và thư mục riêng của người dùng."""
+import os
+import sys
+
+import pytest
+
+from Encoding.cache import ResultCache
+
+
+def _cache_files(cache):
+    return [name for name in os.listdir(cache.directory) if name.endswith(".pkl")]
+
+
+def test_disk_entries_are_evicted_oldest_first(tmp_path):
+    cache = ResultCache(directory=str(tmp_path), max_disk_entries=3)
+    for i in range(5):
+        cache.put(("key", i), i)
+        path = cache._path(("key", i))
+        os.utime(path, (i, i))  # mtime tăng dần, không phụ thuộc độ phân giải đồng hồ
+    assert len(_cache_files(cache)) == 3
+
+    fresh = ResultCache(directory=str(tmp_path))
+    assert fresh.get(("key", 0)) is None
+    assert fresh.get(("key", 4)) == 4
+
+
+def test_disk_bytes_are_capped(tmp_path):
+    cache = ResultCache(directory=str(tmp_path), max_disk_bytes=4096)
+    for i in range(10):
+        cache.put(("blob", i), b"x" * 1000)
+    total = sum(os.path.getsize(os.path.join(cache.directory, name)) for name in _cache_files(cache))
+    assert total <= 4096
+
+
+@pytest.mark.skipif(not hasattr(os, "getuid"), reason="kiểm tra quyền chỉ áp dụng trên Unix")
+def test_directory_is_private_to_the_user(tmp_path):
+    cache = ResultCache(directory=str(tmp_path))
+    assert os.path.dirname(cache.directory) == str(tmp_path)
+    assert os.stat(cache.directory).st_mode & 0o077 == 0
+
+    os.chmod(cache.directory, 0o777)
+    with pytest.raises(ValueError):
+        ResultCache(directory=str(tmp_path))
@@ -0,0 +1,52 @@
+"""Kiểm tra giao diện dòng lệnh."""
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Yêu cầu của CLI: khởi động dưới 100 ms, không nạp giao diện hay các module chỉ cần cho --profile/--cache-dir/serve
+STARTUP_BUDGET_US = 100_000
+HEAVY_MODULES = ("tkinter", "matplotlib", "asyncio", "concurrent.futures.process", "cProfile", "pstats",
+                 "tracemalloc", "pickle", "tempfile", "hashlib")
+
+
+def _run_cli(*args, stdin: bytes = b""):
+    return subprocess.run([sys.executable, *args], input=stdin, capture_output=True, cwd=ROOT,
+                          env=dict(os.environ, PYTHONPATH=ROOT))
+
+
+def _import_times(stderr: bytes) -> dict:
+    """Tên module -> thời gian import tích lũy (µs) từ kết quả của python -X importtime."""
+    times = {}
+    for line in stderr.decode("utf-8", "replace").splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+@pytest.mark.parametrize("command", ["compress", "decompress"])
+def test_startup_imports_stay_within_budget(tmp_path, command):
+    source = tmp_path / "input.txt"
+    source.write_text("Xin chào thế giới\n" * 10, encoding="utf-8")
+    packed = tmp_path / "input.enc"
+    assert _run_cli("-m", "Encoding", "compress", str(source), "-o", str(packed)).returncode == 0
+
+    target = source if command == "compress" else packed
+    result = _run_cli("-X", "importtime", "-m", "Encoding", command, str(target), "-o", str(tmp_path / "out"))
+    assert result.returncode == 0, result.stderr
+    times = _import_times(result.stderr)
+    assert times["Encoding.cli"] < STARTUP_BUDGET_US
+    assert not [name for name in HEAVY_MODULES if name in times]
+
+
+@pytest.mark.parametrize("block_size", ["0", "4G", "8G"])
+def test_invalid_block_size_is_reported_without_traceback(tmp_path, block_size):
+    source = tmp_path / "input.txt"
+    source.write_text("abc", encoding="utf-8")
+    result = _run_cli("-m", "Encoding", "compress", "--block-size", block_size, str(source), "-o", str(tmp_path / "o"))
+    assert result.returncode == 2
+    assert result.stderr.decode("utf-8").startswith("Lỗi: --block-size")
@@ -0,0 +1,78 @@
+"""Mọi thuật toán: mã hóa rồi giải mã phải cho lại đúng văn bản gốc."""
+import pytest
+
+from Encoding.arithmeticEncoding import AdaptiveArithmeticEncoding, ArithmeticEncoding
+from Encoding.huffmanEncoding import HuffmanEncoding
+from Encoding.lzpEncoding import LZWEncoding
+from Encoding.lzssEncoding import LZSSEncoding
+from Encoding.symbolStatistics import NUMPY_MIN_LENGTH
+
+
+def _huffman(text):
+    return HuffmanEncoding().decode(HuffmanEncoding().encode(text))
+
+
+def _huffman_tokens(text):
+    return HuffmanEncoding().decode(HuffmanEncoding(tokenize=True).encode(text))
+
+
+def _lzw(text):
+    encoded, _ = LZWEncoding().encode(text)
+    return LZWEncoding().decode(encoded)
+
+
+def _arithmetic(text):
+    payload = ArithmeticEncoding(text)
+    payload = payload.serialize_model() + payload.encode()
+    arith, offset = ArithmeticEncoding.from_model(payload)
+    return arith.decode(payload[offset:], arith.length)
+
+
+def _adaptive(text):
+    return AdaptiveArithmeticEncoding().decode(AdaptiveArithmeticEncoding(order=1).encode(text))
+
+
+def _lzss(text):
+    return LZSSEncoding().decode(LZSSEncoding().encode(text))
+
+
+def _lzss_raw(text):
+    return LZSSEncoding().decode(LZSSEncoding(level=1, entropy_coding=False).encode(text))
+
+
+ROUND_TRIPS = {
+    "huffman": _huffman,
+    "huffman-tokens": _huffman_tokens,
+    "lzw": _lzw,
+    "arithmetic": _arithmetic,
+    "adaptive": _adaptive,
+    "lzss": _lzss,
+    "lzss-raw": _lzss_raw,
+}
+
+TEXTS = {
+    "empty": "",
+    "one-symbol": "a",
+    "one-symbol-repeated": "a" * 1000,
+    "vietnamese": "Nén dữ liệu tiếng Việt: Phở bò, bánh mì, cà phê sữa đá.",
+    "astral": "😀 𝔘𝔫𝔦𝔠𝔬𝔡𝔢 🇻🇳 " * 3,
+    "lone-surrogates": "\ud83d lẻ \udc00 và a\ud800b",
+    # Vượt ngưỡng NumPy (thống kê ký hiệu, đóng gói bit Huffman)
+    "long-vietnamese": "Tiếng Việt có dấu: ắ ằ ẳ ẵ ặ ơ ư đ. " * (NUMPY_MIN_LENGTH // 30),
+    "long-mixed": ("😀\ud83dTiếng Việt " * NUMPY_MIN_LENGTH)[:NUMPY_MIN_LENGTH + 7],
+}
+
+
+@pytest.mark.parametrize("text", TEXTS.values(), ids=TEXTS.keys())
+@pytest.mark.parametrize("codec", ROUND_TRIPS)
+def test_round_trip(codec, text):
+    assert ROUND_TRIPS[codec](text) == text
+
+
+@pytest.mark.parametrize("codec", [LZWEncoding, LZSSEncoding, AdaptiveArithmeticEncoding, HuffmanEncoding])
+def test_round_trip_bytes(codec):
+    data = bytes(range(256)) * 20 + b"\x00" * 5000
+    encoded = codec().encode_bytes(data)
+    if isinstance(encoded, tuple):  # LZW trả về (dữ liệu, số bit)
+        encoded = encoded[0]
+    assert codec().decode_bytes(encoded) == data
@@ -0,0 +1,49 @@
+"""Container ENCF: phát hiện khối hỏng bằng CRC32."""
+import pytest
+
+from Encoding.container import _FRAME_HEADER
+from Encoding.parallel import BlockArchive, compress_parallel, decompress_parallel
+from Encoding.streaming import BLOCK_CODECS
+
+DATA = "Nén song song từng khối độc lập. ".encode("utf-8") * 200
+
+
+def _corrupt(container: bytes, block_index: int) -> bytes:
+    """Lật một bit trong dữ liệu nén của khối block_index."""
+    position = BlockArchive(container).index[block_index].offset + _FRAME_HEADER.size
+    damaged = bytearray(container)
+    damaged[position] ^= 0x01
+    return bytes(damaged)
+
+
+@pytest.mark.parametrize("algo", sorted(BLOCK_CODECS))
+def test_round_trip(algo):
+    container = compress_parallel(DATA, algo, block_size=1024)
+    assert len(BlockArchive(container)) > 1
+    assert BlockArchive(container).verify() == []
+    assert decompress_parallel(container) == DATA
+
+
+@pytest.mark.parametrize("algo", sorted(BLOCK_CODECS))
+def test_corrupted_block_is_detected(algo):
+    damaged = _corrupt(compress_parallel(DATA, algo, block_size=1024), 1)
+    archive = BlockArchive(damaged)
+    assert archive.verify() == [1]
+    assert archive.read_block(0) == DATA[:1024]
+    with pytest.raises(ValueError):
+        archive.read_block(1)
+    with pytest.raises(ValueError):
+        decompress_parallel(damaged)
+
+
+def test_empty_input():
+    container = compress_parallel(b"", "huffman")
+    assert len(BlockArchive(container)) == 0
+    assert decompress_parallel(container) == b""
+
+
+def test_corrupted_header_is_rejected():
+    damaged = bytearray(compress_parallel(DATA, "huffman"))
+    damaged[6] ^= 0x01  # mã thuật toán, được bảo vệ bởi CRC32 của header
+    with pytest.raises(ValueError):
+        decompress_parallel(bytes(damaged))
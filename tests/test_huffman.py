@@ -0,0 +1,45 @@
+"""Mã Huffman: mã hóa rồi giải mã phải cho lại đúng dữ liệu gốc."""
+import pytest
+
+from Encoding.huffmanEncoding import NUMPY_PACK_MIN_LENGTH, HuffmanEncoding, package_merge_lengths
+
+LONG = NUMPY_PACK_MIN_LENGTH + 1
+
+
+@pytest.mark.parametrize("text", [
+    "a\ud83d" * 3,
+    "a\ud83d" * LONG,  # đủ dài để đi qua nhánh đóng gói bit bằng NumPy
+    "\udc00" + "Tiếng Việt " * LONG,
+])
+def test_round_trip_lone_surrogates(text):
+    assert HuffmanEncoding().decode(HuffmanEncoding().encode(text)) == text
+
+
+def _kraft_sum(lengths) -> float:
+    return sum(2.0 ** -length for length in lengths)
+
+
+@pytest.mark.parametrize("max_length", [2, 3, 5, 8, 15])
+def test_package_merge_respects_length_limit(max_length):
+    # Tần suất Fibonacci: mã Huffman không giới hạn sẽ dài tới số ký hiệu - 1 bit
+    freq_table = {chr(ord("a") + i): freq for i, freq in enumerate([1, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89, 144])}
+    freq_table = dict(list(freq_table.items())[:min(len(freq_table), 1 << max_length)])
+    lengths = package_merge_lengths(freq_table, max_length)
+    assert set(lengths) == set(freq_table)
+    assert max(lengths.values()) <= max_length
+    assert _kraft_sum(lengths.values()) <= 1
+
+
+def test_package_merge_rejects_too_many_symbols():
+    with pytest.raises(ValueError):
+        package_merge_lengths({symbol: 1 for symbol in "abcde"}, 2)
+
+
+@pytest.mark.parametrize("max_length", [5, 7, 15])
+def test_round_trip_with_length_limit(max_length):
+    text = "".join(ch * (i + 1) ** 2 for i, ch in enumerate("abcdefghijklmnop")) + "Tiếng Việt"
+    coder = HuffmanEncoding(max_code_length=max_length)
+    encoded = coder.encode(text)
+    assert max(coder.code_lengths.values()) <= max_length
+    assert _kraft_sum(coder.code_lengths.values()) <= 1
+    assert HuffmanEncoding().decode(encoded) == text
@@ -0,0 +1,34 @@
+"""Mã LZSS: chuỗi băm dạng bộ đệm vòng cỡ cửa sổ vẫn chỉ trả về đoạn khớp nằm trong cửa sổ."""
+import random
+
+import pytest
+
+from Encoding.lzssEncoding import LZSSEncoding
+
+
+def _data() -> bytes:
+    rng = random.Random(0)
+    block = rng.randbytes(300)
+    # Đoạn lặp ở khoảng cách nhỏ hơn, bằng và lớn hơn cửa sổ 256 byte
+    return block[:200] + block[:200] + rng.randbytes(56) + block + rng.randbytes(1000) + block * 3
+
+
+@pytest.mark.parametrize("level", [1, 6, 9])
+@pytest.mark.parametrize("window_bits", [8, 10, 15])
+@pytest.mark.parametrize("entropy_coding", [False, True])
+def test_round_trip_longer_than_window(level, window_bits, entropy_coding):
+    data = _data()
+    coder = LZSSEncoding(level=level, window_bits=window_bits, entropy_coding=entropy_coding)
+    symbols, distances = coder._parse(memoryview(data))
+    assert all(distance < 1 << window_bits for distance in distances)
+    assert len(distances) > 0
+    assert LZSSEncoding().decode_bytes(coder.encode_bytes(data)) == data
+
+
+def test_finds_repeats_within_window():
+    data = b"abcdefgh" * 1000
+    coder = LZSSEncoding(window_bits=8)
+    coder.encode_bytes(data)
+    # Chỉ 8 byte đầu là literal, phần còn lại là các đoạn khớp dài tối đa
+    assert coder.literal_count == 8
+    assert coder.matched_bytes == len(data) - 8
@@ -0,0 +1,79 @@
+"""Mã LZW: mã hóa rồi giải mã phải cho lại đúng dữ liệu gốc."""
+import pytest
+
+from Encoding.lzpEncoding import LZWDictionary, LZWEncoding
+
+
+def _round_trip(text: str, coder: LZWEncoding = None) -> str:
+    encoded, _ = (coder or LZWEncoding()).encode(text)
+    return LZWEncoding().decode(encoded)
+
+
+@pytest.mark.parametrize("text", [
+    "\ud83d",
+    "a\ud83db\udc00" * 3,
+    "\udc00Tiếng Việt " * 1000,
+])
+def test_round_trip_lone_surrogates(text):
+    assert _round_trip(text) == text
+
+
+SAMPLES = [f"Đơn hàng #{i} đã được giao tới Hà Nội, cảm ơn quý khách đã mua sắm." for i in range(200)]
+MESSAGE = "Đơn hàng #4242 đã được giao tới Hà Nội, cảm ơn quý khách!"
+
+
+@pytest.fixture(scope="module")
+def trained():
+    return LZWDictionary.train(SAMPLES, max_entries=1000)
+
+
+def test_train_builds_a_bounded_dictionary(trained):
+    assert 0 < len(trained) <= 1000
+    assert trained.first_free_code == len(trained) + 258
+
+
+def test_serialization_keeps_entries_and_id(trained, tmp_path):
+    restored = LZWDictionary.from_bytes(trained.to_bytes())
+    assert restored.entries == trained.entries
+    assert restored.id == trained.id
+
+    path = tmp_path / "orders.lzwd"
+    trained.save(path)
+    assert LZWDictionary.load(path).id == trained.id
+
+
+def test_from_bytes_rejects_other_data():
+    with pytest.raises(ValueError):
+        LZWDictionary.from_bytes(b"XXXX" + bytes(5))
+
+
+def test_round_trip_with_trained_dictionary(trained):
+    encoded, _ = LZWEncoding(dictionary=trained).encode(MESSAGE)
+    plain, _ = LZWEncoding().encode(MESSAGE)
+    assert len(encoded) < len(plain)
+    assert LZWEncoding(dictionary=LZWDictionary.from_bytes(trained.to_bytes())).decode(encoded) == MESSAGE
+
+
+@pytest.mark.parametrize("text", ["", "a", MESSAGE * 50])
+def test_round_trip_with_trained_dictionary_edge_cases(trained, text):
+    encoded, _ = LZWEncoding(dictionary=trained).encode(text)
+    assert LZWEncoding(dictionary=trained).decode(encoded) == text
+
+
+def test_decode_with_wrong_dictionary_fails(trained):
+    other = LZWDictionary.train(["Hôm nay trời nắng đẹp, đi chơi công viên thôi."] * 50, max_entries=1000)
+    encoded, _ = LZWEncoding(dictionary=trained).encode(MESSAGE)
+    with pytest.raises(ValueError, match="Sai từ điển"):
+        LZWEncoding(dictionary=other).decode(encoded)
+
+
+def test_decode_without_required_dictionary_fails(trained):
+    encoded, _ = LZWEncoding(dictionary=trained).encode(MESSAGE)
+    with pytest.raises(ValueError, match="cần truyền dictionary"):
+        LZWEncoding().decode(encoded)
+
+
+def test_decode_plain_stream_with_dictionary_fails(trained):
+    encoded, _ = LZWEncoding().encode(MESSAGE)
+    with pytest.raises(ValueError, match="không được nén bằng từ điển"):
+        LZWEncoding(dictionary=trained).decode(encoded)
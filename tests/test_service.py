@@ -0,0 +1,134 @@
+"""Dịch vụ nén cục bộ: chạy trong cùng tiến trình với ThreadPoolExecutor và ServiceClient."""
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from Encoding.parallel import decompress_parallel
+from Encoding.service import CompressionService, ServiceClient
+
+DATA = "Dịch vụ nén cục bộ cho tiếng Việt. ".encode("utf-8") * 100
+
+
+class GatedExecutor(ThreadPoolExecutor):
+    """Executor chỉ chạy công việc sau khi gate được mở, để giữ các yêu cầu ở trạng thái đang xử lý."""
+
+    def __init__(self):
+        super().__init__(max_workers=2)
+        self.gate = threading.Event()
+
+    def submit(self, fn, *args, **kwargs):
+        def gated():
+            self.gate.wait(timeout=10)
+            return fn(*args, **kwargs)
+        return super().submit(gated)
+
+
+def _run(coroutine_function, **options):
+    """Chạy coroutine_function(service, client) với một dịch vụ trên cổng TCP tự chọn."""
+    async def main():
+        executor = options.pop("executor", None) or ThreadPoolExecutor(max_workers=2)
+        try:
+            async with CompressionService(executor=executor, **options) as service:
+                client = await ServiceClient.connect(port=service.address[1])
+                async with client:
+                    return await coroutine_function(service, client)
+        finally:
+            executor.shutdown()
+    return asyncio.run(asyncio.wait_for(main(), timeout=30))
+
+
+async def _wait_until(condition):
+    for _ in range(500):
+        if condition():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("Điều kiện không xảy ra")
+
+
+@pytest.mark.parametrize("algo", ["huffman", "lzw", "arithmetic", "adaptive", "lzss"])
+def test_compress_decompress_round_trip(algo):
+    async def scenario(service, client):
+        packed = await client.compress(DATA, algo)
+        assert len(packed) < len(DATA)
+        assert await client.decompress(packed) == DATA
+        stats = await client.stats(DATA)
+        assert stats["bytes"] == len(DATA)
+        assert stats["characters"] == len(DATA.decode("utf-8"))
+
+    _run(scenario)
+
+
+def test_errors_are_reported_per_request():
+    async def scenario(service, client):
+        with pytest.raises(ValueError):
+            await client.decompress(b"khong phai container")
+        # Kết nối vẫn dùng được sau một yêu cầu lỗi
+        assert await client.decompress(await client.compress(DATA)) == DATA
+        assert (await client.metrics())["errors"] == 1
+
+    _run(scenario)
+
+
+def test_concurrent_small_requests_are_batched():
+    async def scenario(service, client):
+        payloads = [DATA[:100 + i] for i in range(20)]
+        packed = await asyncio.gather(*(client.compress(payload) for payload in payloads))
+        assert await asyncio.gather(*(client.decompress(item) for item in packed)) == payloads
+        metrics = await client.metrics()
+        assert metrics["requests"]["compress"] == 20
+        assert metrics["mean_batch_size"] > 1
+
+    _run(scenario, batch_delay=0.05)
+
+
+def test_backpressure_stops_reading_when_queue_is_full():
+    executor = GatedExecutor()
+
+    async def scenario(service, client):
+        requests = [asyncio.create_task(client.compress(DATA)) for _ in range(6)]
+        await _wait_until(lambda: service.metrics.in_flight == 2)
+        await asyncio.sleep(0.1)
+        # Chỉ max_pending yêu cầu được nhận; phần còn lại nằm chờ trong socket
+        assert service.metrics.in_flight == 2
+        assert not any(request.done() for request in requests)
+
+        executor.gate.set()
+        results = await asyncio.gather(*requests)
+        assert all(result == results[0] for result in results)
+        assert service.metrics.max_in_flight == 2
+
+    _run(scenario, executor=executor, max_pending=2, batch_max_requests=1)
+
+
+def test_close_answers_in_flight_requests_then_disconnects():
+    executor = GatedExecutor()
+
+    async def main():
+        service = await CompressionService(executor=executor).start(port=0)
+        client = await ServiceClient.connect(port=service.address[1])
+        request = asyncio.create_task(client.compress(DATA))
+        await _wait_until(lambda: service.metrics.in_flight == 1)
+
+        closing = asyncio.create_task(service.close())
+        await asyncio.sleep(0.05)
+        assert not closing.done()
+        executor.gate.set()
+        await closing
+
+        assert decompress_parallel(await request) == DATA
+        await _wait_until(client._receiver.done)
+        with pytest.raises(ConnectionError):
+            await client.compress(DATA)
+        await client.close()
+        assert service.metrics.in_flight == 0
+        assert not service._connections
+
+    try:
+        asyncio.run(asyncio.wait_for(main(), timeout=30))
+        # Executor truyền vào không bị dịch vụ tắt
+        assert executor.submit(lambda: 1).result() == 1
+    finally:
+        executor.gate.set()
+        executor.shutdown()
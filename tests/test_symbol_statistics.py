@@ -0,0 +1,28 @@
+"""Thống kê ký hiệu: nhánh NumPy (văn bản dài) phải cho cùng kết quả với nhánh Counter."""
+from collections import Counter
+
+import pytest
+
+from Encoding.symbolStatistics import NUMPY_MIN_LENGTH, SymbolStatistics
+
+LONG = NUMPY_MIN_LENGTH + 1
+
+
+@pytest.mark.parametrize("text", [
+    "",
+    "a",
+    "Tiếng Việt có dấu, " * 300,
+    "😀x𝔸" * LONG,
+    "a\ud83d" * LONG,  # surrogate đơn lẻ (Tk trên Windows có thể trả về)
+])
+def test_from_text_counts_every_character(text):
+    stats = SymbolStatistics.from_text(text)
+    assert stats.counts == Counter(text)
+    assert stats.total == len(text)
+
+
+def test_from_bytes_counts_every_byte():
+    data = bytes(range(256)) * 20
+    stats = SymbolStatistics.from_bytes(memoryview(data))
+    assert stats.counts == Counter(data)
+    assert stats.entropy == pytest.approx(8.0)